@@ -0,0 +1,269 @@
+import threading
+from collections import defaultdict
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+
+def parse_date(value):
+    """Return value as a datetime.date, or None if it isn't a valid date."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return None if pd.isna(value) else value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+def query_date(value):
+    """Parse a date given to a query, raising ValueError if it isn't a valid date."""
+    day = parse_date(value)
+    if day is None:
+        raise ValueError(f"Geçersiz tarih: {value} (YYYY-MM-DD olmalı)")
+    return day
+
+
+def month_key(day):
+    """Months as consecutive integers, so ranges of months are ranges of ints."""
+    return day.year * 12 + day.month - 1
+
+
+class TaskAggregates:
+    """Store listener keeping statistics and expense totals up to date.
+
+    Maintains per-status counts and cost sums, per-month task counts,
+    per-job rollups and (start month, end month) cost buckets, each updated
+    in O(1) per mutation, so statistics and date-range expense totals don't
+    need a pass over all tasks.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset(None)
+
+    # Store listener interface
+
+    def reset(self, df):
+        with self._lock:
+            self.entries = {}
+            self.status = defaultdict(lambda: {"count": 0, "actual": 0.0, "estimated": 0.0})
+            self.months = defaultdict(int)
+            self.jobs = defaultdict(lambda: {"count": 0, "done_cost": 0.0, "wait_cost": 0.0, "starts": [], "ends": []})
+            self.buckets = defaultdict(dict)
+            self.duration_sum = 0
+            self.duration_count = 0
+            if df is not None and len(df):
+                self._load(df)
+
+    def _load(self, df):
+        """Fill the (empty) aggregates from a typed frame with whole-column operations.
+
+        Gives the same result as calling _add for every row, which is too
+        slow for large tables at startup.
+        """
+        status = df["Status"].astype(str).to_numpy()
+        actual = np.where(status == "Done", df["Actual Cost"].to_numpy(dtype=float), 0.0)
+        estimated = np.where(status == "Waiting", df["Estimated Cost"].to_numpy(dtype=float), 0.0)
+        start = pd.to_datetime(df["Start Date"], errors="coerce")
+        end = pd.to_datetime(df["End Date"], errors="coerce")
+        # datetime.date objects (NaT for missing), as parse_date gives them
+        start_days = start.dt.date.to_numpy()
+        end_days = end.dt.date.to_numpy()
+        start_month = (start.dt.year * 12 + start.dt.month - 1).to_numpy()
+        end_month = (end.dt.year * 12 + end.dt.month - 1).to_numpy()
+        ids = df["ID"].to_numpy()
+        frame = pd.DataFrame({"status": status, "job": df["Job Name"].astype(str).to_numpy()})
+
+        has_start = start.notna().to_numpy()
+        has_end = end.notna().to_numpy()
+
+        for name, positions in frame.groupby("status", sort=False).indices.items():
+            self.status[name] = {"count": len(positions), "actual": float(actual[positions].sum()),
+                                 "estimated": float(estimated[positions].sum())}
+        for name, positions in frame.groupby("job", sort=False).indices.items():
+            self.jobs[name] = {
+                "count": len(positions),
+                "done_cost": float(actual[positions].sum()),
+                "wait_cost": float(estimated[positions].sum()),
+                "starts": start_days[positions[has_start[positions]]].tolist(),
+                "ends": end_days[positions[has_end[positions]]].tolist(),
+            }
+        for month, count in zip(*np.unique(start_month[has_start], return_counts=True)):
+            self.months[int(month)] = int(count)
+
+        dated = has_start & has_end
+        if not dated.any():
+            return
+        self.duration_sum = int((end[dated] - start[dated]).dt.days.sum())
+        self.duration_count = int(dated.sum())
+        self.entries = dict(zip(ids[dated].tolist(), zip(
+            start_days[dated].tolist(), end_days[dated].tolist(), actual[dated].tolist(), estimated[dated].tolist()
+        )))
+        buckets = pd.DataFrame({"start": start_month[dated], "end": end_month[dated], "id": ids[dated],
+                                "actual": actual[dated], "estimated": estimated[dated]})
+        for (first, last), group in buckets.groupby(["start", "end"], sort=False):
+            self.buckets[int(first)][int(last)] = {
+                "ids": set(group["id"].tolist()),
+                "actual": float(group["actual"].sum()),
+                "estimated": float(group["estimated"].sum()),
+            }
+
+    def inserted(self, task):
+        with self._lock:
+            self._add(task)
+
+    def updated(self, old, new):
+        with self._lock:
+            self._remove(old)
+            self._add(new)
+
+    def deleted(self, task):
+        with self._lock:
+            self._remove(task)
+
+    # Incremental bookkeeping
+
+    def _add(self, task):
+        self._apply(task, +1)
+
+    def _remove(self, task):
+        self._apply(task, -1)
+
+    def _apply(self, task, sign):
+        status = task["Status"]
+        actual = float(task["Actual Cost"] or 0) if status == "Done" else 0.0
+        estimated = float(task["Estimated Cost"] or 0) if status == "Waiting" else 0.0
+        start = parse_date(task["Start Date"])
+        end = parse_date(task["End Date"])
+
+        totals = self.status[status]
+        totals["count"] += sign
+        totals["actual"] += sign * actual
+        totals["estimated"] += sign * estimated
+        if totals["count"] == 0:
+            del self.status[status]
+
+        job = self.jobs[task["Job Name"]]
+        job["count"] += sign
+        job["done_cost"] += sign * actual
+        job["wait_cost"] += sign * estimated
+        for key, day in (("starts", start), ("ends", end)):
+            if day is not None:
+                if sign > 0:
+                    job[key].append(day)
+                else:
+                    job[key].remove(day)
+        if job["count"] == 0:
+            del self.jobs[task["Job Name"]]
+
+        if start is not None:
+            self.months[month_key(start)] += sign
+            if self.months[month_key(start)] == 0:
+                del self.months[month_key(start)]
+        if start is None or end is None:
+            return
+
+        self.duration_sum += sign * (end - start).days
+        self.duration_count += sign
+        by_end = self.buckets[month_key(start)]
+        bucket = by_end.setdefault(month_key(end), {"ids": set(), "actual": 0.0, "estimated": 0.0})
+        task_id = int(task["ID"])
+        if sign > 0:
+            bucket["ids"].add(task_id)
+            self.entries[task_id] = (start, end, actual, estimated)
+        else:
+            bucket["ids"].discard(task_id)
+            self.entries.pop(task_id, None)
+        bucket["actual"] += sign * actual
+        bucket["estimated"] += sign * estimated
+        if not bucket["ids"]:
+            del by_end[month_key(end)]
+            if not by_end:
+                del self.buckets[month_key(start)]
+
+    # Queries
+
+    def statistics(self, archived=()):
+        """Return the numbers and series shown in the statistics window.
+
+        archived holds the totals of tasks kept outside the store, as
+        seasons.summarize() records them, to be counted in as well.
+        """
+        with self._lock:
+            counts = {status: totals["count"] for status, totals in self.status.items()}
+            month_counts = dict(self.months)
+            actual = self.status["Done"]["actual"] if "Done" in self.status else 0.0
+            estimated = self.status["Waiting"]["estimated"] if "Waiting" in self.status else 0.0
+            duration_sum, duration_count = self.duration_sum, self.duration_count
+        for summary in archived:
+            for status, count in summary["statuses"].items():
+                counts[status] = counts.get(status, 0) + count
+            for month, count in summary["months"].items():
+                month_counts[int(month)] = month_counts.get(int(month), 0) + count
+            actual += summary["actual"]
+            estimated += summary["estimated"]
+            duration_sum += summary["duration_sum"]
+            duration_count += summary["duration_count"]
+        months = sorted(month_counts)
+        return {
+            "total_tasks": sum(counts.values()),
+            "done_tasks": counts.get("Done", 0),
+            "waiting_tasks": counts.get("Waiting", 0),
+            "total_actual_cost": actual,
+            "total_estimated_cost": estimated,
+            "avg_duration": duration_sum / duration_count if duration_count else float("nan"),
+            "status_counts": pd.Series(counts, dtype="int64", name="count").sort_values(ascending=False, kind="stable"),
+            "monthly_tasks": pd.Series(
+                [month_counts[m] for m in months],
+                index=pd.PeriodIndex([pd.Period(year=m // 12, month=m % 12 + 1, freq="M") for m in months], freq="M"),
+                dtype="int64",
+            ),
+        }
+
+    def job_rollups(self):
+        """Return per-job task counts, spans and Done/Waiting cost sums."""
+        with self._lock:
+            return pd.DataFrame.from_dict({
+                name: {
+                    "count": job["count"],
+                    "start": min(job["starts"], default=None),
+                    "end": max(job["ends"], default=None),
+                    "done_cost": job["done_cost"],
+                    "wait_cost": job["wait_cost"],
+                }
+                for name, job in self.jobs.items()
+            }, orient="index")
+
+    def expense_totals(self, start, end):
+        """Sum costs of tasks lying entirely within [start, end].
+
+        Returns (actual Done cost, estimated Waiting cost, task IDs). Buckets
+        strictly inside the month range are taken whole; only the tasks in
+        buckets touching the first or last month are checked one by one.
+        """
+        start, end = query_date(start), query_date(end)
+        first, last = month_key(start), month_key(end)
+        actual = estimated = 0.0
+        ids = []
+        with self._lock:
+            for start_month in range(first, last + 1):
+                for end_month, bucket in self.buckets.get(start_month, {}).items():
+                    if end_month > last:
+                        continue
+                    if first < start_month and end_month < last:
+                        actual += bucket["actual"]
+                        estimated += bucket["estimated"]
+                        ids.extend(bucket["ids"])
+                        continue
+                    for task_id in bucket["ids"]:
+                        task_start, task_end, task_actual, task_estimated = self.entries[task_id]
+                        if task_start >= start and task_end <= end:
+                            actual += task_actual
+                            estimated += task_estimated
+                            ids.append(task_id)
+        return actual, estimated, sorted(ids)
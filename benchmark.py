@@ -0,0 +1,393 @@
+"""Headless benchmark of the main GUI code paths on synthetic data.
+
+    python benchmark.py --rows 1000 10000 100000 --output results.jsonl
+    python benchmark.py --rows 100000 --compare results.jsonl
+
+Each scenario runs what the matching FarmTasksApp method does, minus the
+dialogs: the task table renders into an in-memory stand-in for the
+Treeview and figures are drawn on an offscreen Agg canvas, so no display
+is needed. Every scenario is timed --repeat times, then run once more
+under tracemalloc for its peak Python allocation (skip with --no-memory).
+
+Results are JSON lines, one per scenario and row count, on stdout or in
+--output, including the time spent in each instrumented section (see
+instrumentation.py); a readable table goes to stderr. With --compare, the table also
+shows each median relative to an earlier results file.
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from charts import build_calendar_figure, build_statistics_figure
+from core import FarmTasks
+from date_index import CONTAINED, OVERLAPPING
+from instrumentation import metrics
+from schema import format_date
+from synthetic import write_dataset
+from table_view import VirtualTable
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+DEFAULT_ROWS = [1000, 10000, 100000]
+TABLE_COLUMNS = ["ID", "Job Name", "Description", "Start Date", "End Date", "Estimated Cost", "Actual Cost", "Status"]
+
+
+class HeadlessTree:
+    """Just enough of ttk.Treeview for VirtualTable to render into."""
+
+    def __init__(self, height=30):
+        self.height = height
+        self.items = {}
+        self.tags = {}
+        self.order = []
+        self.selected = ()
+        self.focused = ""
+
+    def bind(self, sequence, func):
+        pass
+
+    def winfo_height(self):
+        return 1
+
+    def cget(self, option):
+        return self.height
+
+    def exists(self, iid):
+        return iid in self.items
+
+    def insert(self, parent, index, iid, values, tags=()):
+        self.items[iid] = values
+        self.tags[iid] = tuple(tags)
+        self.order.insert(index, iid)
+
+    def move(self, iid, parent, index):
+        self.order.remove(iid)
+        self.order.insert(index, iid)
+
+    def item(self, iid, values=None, tags=None):
+        if values is None and tags is None:
+            return {"values": self.items[iid], "tags": self.tags[iid]}
+        if values is not None:
+            self.items[iid] = values
+        if tags is not None:
+            self.tags[iid] = tuple(tags)
+
+    def delete(self, *iids):
+        for iid in iids:
+            del self.items[iid]
+            del self.tags[iid]
+            self.order.remove(iid)
+
+    def selection(self):
+        return self.selected
+
+    def selection_set(self, iids):
+        self.selected = tuple(iids) if isinstance(iids, (list, tuple)) else (iids,)
+
+    def focus(self, iid=None):
+        if iid is not None:
+            self.focused = iid
+        return self.focused
+
+
+class HeadlessScrollbar:
+    def configure(self, **options):
+        pass
+
+    def set(self, first, last):
+        self.position = (first, last)
+
+
+class Context:
+    """The data directory and open task store shared by one row count's scenarios."""
+
+    def __init__(self, data_dir, engine, rows):
+        self.data_dir = data_dir
+        self.engine = engine
+        self.rows = rows
+        self.core = FarmTasks(data_dir, engine)
+        self.core.tasks()
+        self.table = VirtualTable(HeadlessTree(), HeadlessScrollbar(), TABLE_COLUMNS,
+                                  formatters={"Start Date": format_date, "End Date": format_date})
+        self.rng = np.random.default_rng(0)
+
+    def random_range(self, days=90):
+        dates = self.core.tasks()["Start Date"]
+        first = dates.min() + pd.Timedelta(days=int(self.rng.integers(0, 365)))
+        return first.strftime("%Y-%m-%d"), (first + pd.Timedelta(days=days)).strftime("%Y-%m-%d")
+
+
+def draw(fig):
+    FigureCanvasAgg(fig).draw()
+
+
+def load_tasks(ctx):
+    # A fresh store reads everything back from disk, as on application start
+    core = FarmTasks(ctx.data_dir, ctx.engine)
+    try:
+        core.tasks()
+    finally:
+        core.close()
+
+
+def load_tasks_cached(ctx):
+    ctx.core.tasks()
+
+
+def show_tasks(ctx):
+    ctx.table.set_rows(ctx.core.tasks())
+
+
+def show_tasks_filtered(ctx):
+    ctx.table.set_rows(ctx.core.tasks("Waiting"))
+
+
+def scroll_tasks(ctx):
+    for _ in range(100):
+        ctx.table.scroll(int(ctx.rng.integers(-len(ctx.table), len(ctx.table))))
+
+
+def show_calendar(ctx):
+    # The figure cache is bypassed: this is the cost after every data change
+    version, df = ctx.core.versioned(ctx.core.tasks)
+    draw(build_calendar_figure(df))
+
+
+def show_calendar_query(ctx):
+    version, df = ctx.core.versioned(ctx.core.query, *ctx.random_range(), OVERLAPPING)
+    draw(build_calendar_figure(df))
+
+
+def show_statistics(ctx):
+    version, (stats, forecast) = ctx.core.versioned(lambda: (ctx.core.statistics(), ctx.core.forecast()))
+    draw(build_statistics_figure(stats, forecast))
+
+
+def forecast(ctx):
+    # Redone after every edit while the statistics window is open
+    ctx.core.forecast(*ctx.random_range())
+
+
+def expenses(ctx):
+    ctx.core.expenses(*ctx.random_range(), CONTAINED)
+
+
+def expenses_overlapping(ctx):
+    ctx.core.expenses(*ctx.random_range(), OVERLAPPING)
+
+
+def search(ctx):
+    # What the search bar runs while a word is being typed
+    for text in ("b", "bu", "bud", "buda", "budama"):
+        ctx.core.search(text)
+
+
+def search_filtered(ctx):
+    ctx.core.search("sulama", "Waiting", 100, 1500, *ctx.random_range(), OVERLAPPING)
+
+
+def _exporter(suffix):
+    def export_all_tasks(ctx):
+        ctx.core.export_tasks(ctx.data_dir / f"export{suffix}")
+    return export_all_tasks
+
+
+def add_task(ctx):
+    ctx.core.add({
+        "Job Name": "Budama", "Description": "", "Start Date": "2024-05-01", "End Date": "2024-05-03",
+        "Estimated Cost": 100.0, "Actual Cost": 0.0, "Status": "Waiting",
+    })
+
+
+def update_task(ctx):
+    task_id = int(ctx.rng.integers(1, ctx.rows + 1))
+    task = ctx.core.get(task_id)
+    # Same shape as the edit form produces: text dates, Done with a cost
+    task.update({
+        "Start Date": format_date(task["Start Date"]), "End Date": format_date(task["End Date"]),
+        "Actual Cost": 120.0, "Status": "Done",
+    })
+    ctx.core.update(task_id, task)
+
+
+# Scenarios that write come last so the read paths all see the generated data
+SCENARIOS = {
+    "load_tasks": load_tasks,
+    "load_tasks_cached": load_tasks_cached,
+    "show_tasks": show_tasks,
+    "show_tasks_filtered": show_tasks_filtered,
+    "scroll_tasks": scroll_tasks,
+    "show_calendar": show_calendar,
+    "show_calendar_query": show_calendar_query,
+    "show_statistics": show_statistics,
+    "forecast": forecast,
+    "expenses": expenses,
+    "expenses_overlapping": expenses_overlapping,
+    "search": search,
+    "search_filtered": search_filtered,
+    "export_xlsx": _exporter(".xlsx"),
+    "export_csv": _exporter(".csv"),
+    "export_parquet": _exporter(".parquet"),
+    "add_task": add_task,
+    "update_task": update_task,
+}
+
+
+def max_rss_mb():
+    """Peak resident size of this process so far, or None where unsupported."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def measure(fn, ctx, repeat, memory=True):
+    """Time fn(ctx) repeat times; return the result fields for one scenario."""
+    metrics.reset()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(ctx)
+        timings.append(time.perf_counter() - start)
+    result = {
+        "repeat": repeat,
+        "min_s": round(min(timings), 6),
+        "median_s": round(statistics.median(timings), 6),
+        "mean_s": round(statistics.mean(timings), 6),
+        "peak_mb": None,
+        # Mean seconds per run spent in each instrumented section
+        "sections": {
+            name: round(summary["total_s"] / repeat, 6)
+            for name, summary in metrics.snapshot()["metrics"].items()
+        },
+    }
+    if memory:
+        tracemalloc.start()
+        try:
+            fn(ctx)
+            result["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+        finally:
+            tracemalloc.stop()
+    result["max_rss_mb"] = max_rss_mb()
+    return result
+
+
+def environment():
+    """Fields that identify the code and interpreter the numbers came from."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=Path(__file__).parent,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+    }
+
+
+def load_baseline(path):
+    """Map (scenario, rows, engine) to the median of an earlier results file."""
+    baseline = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                baseline[(record["scenario"], record["rows"], record["engine"])] = record["median_s"]
+    return baseline
+
+
+def format_result(record, baseline):
+    peak = "-" if record["peak_mb"] is None else f"{record['peak_mb']:.1f}"
+    line = (f"{record['scenario']:<22}{record['rows']:>9}  {record['median_s'] * 1000:>10.1f} ms"
+            f"  {record['min_s'] * 1000:>10.1f} ms  {peak:>9} MB")
+    previous = baseline.get((record["scenario"], record["rows"], record["engine"]))
+    if previous:
+        line += f"  x{record['median_s'] / previous:.2f}"
+    return line
+
+
+def run(rows_list, engine, scenarios, repeat, memory, generator_options, emit, report):
+    env = environment()
+    for rows in rows_list:
+        with tempfile.TemporaryDirectory(prefix="farmtasks-bench-") as tmp:
+            data_dir = Path(tmp)
+            start = time.perf_counter()
+            write_dataset(data_dir, rows, engine, **generator_options)
+            report(f"{rows} görev üretildi ({time.perf_counter() - start:.1f} sn)")
+            ctx = Context(data_dir, engine, rows)
+            try:
+                for name in scenarios:
+                    try:
+                        result = measure(SCENARIOS[name], ctx, repeat, memory)
+                    except ValueError as e:
+                        # e.g. Parquet export without pyarrow
+                        report(f"{name:<22}{rows:>9}  atlandı: {e}")
+                        continue
+                    emit(dict({"scenario": name, "rows": rows, "engine": engine}, **result, **env))
+            finally:
+                ctx.core.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Görev takip performans ölçümü")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS, help="Ölçülecek görev sayıları")
+    parser.add_argument("--engine", choices=("sqlite", "excel"), default="sqlite")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", dest="memory", action="store_false", help="tracemalloc ölçümünü atla")
+    parser.add_argument("--output", type=Path, help="Sonuçları bu JSON Lines dosyasına yaz")
+    parser.add_argument("--compare", type=Path, help="Önceki bir sonuç dosyasıyla karşılaştır")
+    parser.add_argument("--jobs", type=int, default=50, help="Farklı görev adı sayısı")
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--max-span", type=int, default=30)
+    parser.add_argument("--done-ratio", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline(args.compare) if args.compare else {}
+    # Keep the --scenarios order consistent with SCENARIOS (writes last)
+    scenarios = [name for name in SCENARIOS if name in args.scenarios]
+    generator_options = dict(jobs=args.jobs, days=args.days, max_span=args.max_span,
+                             done_ratio=args.done_ratio, seed=args.seed)
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+
+    def report(text):
+        print(text, file=sys.stderr, flush=True)
+
+    def emit(record):
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        out.flush()
+        report(format_result(record, baseline))
+
+    try:
+        report(f"{'senaryo':<22}{'satır':>9}  {'medyan':>13}  {'en iyi':>13}  {'bellek':>12}")
+        run(args.rows, args.engine, scenarios, args.repeat, args.memory, generator_options, emit, report)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""Bulk import of task batches from CSV or Excel files.
+
+Files are streamed in chunks and each chunk is validated column-wise with
+the same rules as the entry form (see core.build_task). Nothing is written
+here: the caller commits the validated batch with TaskStore.add_many, which
+stores it in a single backend write. IDs in the file are ignored; imported
+tasks always get fresh ones.
+"""
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from schema import STATUSES, SchemaError, parse_costs
+from instrumentation import timed
+
+CHUNK_SIZE = 5000
+IMPORT_COLUMNS = ["Job Name", "Description", "Start Date", "End Date", "Estimated Cost", "Actual Cost", "Status"]
+REQUIRED_COLUMNS = ["Job Name", "Start Date", "End Date", "Estimated Cost"]
+# First data row in spreadsheet numbering (the header is row 1)
+FIRST_ROW = 2
+
+ImportResult = namedtuple("ImportResult", ["tasks", "errors", "rows"])
+
+
+def read_chunks(path, chunksize=CHUNK_SIZE):
+    """Yield the data rows of a CSV or xlsx file as DataFrames of raw cells.
+
+    Each chunk's index is the row's position in the file counted from the
+    first data row, blank rows included.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix == ".csv":
+        yield from pd.read_csv(path, chunksize=chunksize, dtype=str, keep_default_na=False,
+                               skip_blank_lines=False, encoding="utf-8-sig")
+    elif suffix in (".xlsx", ".xlsm"):
+        yield from _excel_chunks(path, chunksize)
+    else:
+        raise ValueError(f"Desteklenmeyen dosya türü: {suffix or path}")
+
+
+def _excel_chunks(path, chunksize):
+    # read_only mode streams the sheet instead of building the whole workbook
+    from openpyxl import load_workbook
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        header = ["" if cell is None else str(cell).strip() for cell in header]
+        width = len(header)
+        chunk, start = [], 0
+        for row in rows:
+            chunk.append(tuple(row[:width]) + (None,) * (width - len(row)))
+            if len(chunk) == chunksize:
+                yield pd.DataFrame(chunk, columns=header, index=range(start, start + len(chunk)), dtype=object)
+                chunk, start = [], start + len(chunk)
+        if chunk:
+            yield pd.DataFrame(chunk, columns=header, index=range(start, start + len(chunk)), dtype=object)
+    finally:
+        workbook.close()
+
+
+def _text(values):
+    """Return a column of cells as stripped text, empty cells becoming ''."""
+    if values.dtype != object:
+        return values.fillna("").astype(str).str.strip()
+    return values.astype(object).where(values.notna(), "").astype(str).str.strip()
+
+
+def _stripped(values):
+    """Strip text cells, leaving other cell types untouched."""
+    if values.dtype != object:
+        return values.str.strip()
+    return values.map(lambda cell: cell.strip() if isinstance(cell, str) else cell)
+
+
+@timed("validate.import_chunk")
+def validate_chunk(chunk):
+    """Validate raw rows and return (valid tasks, [(row number, message), ...]).
+
+    Valid tasks come back in the form the backends store: YYYY-MM-DD text
+    dates, float costs, and an Actual Cost of 0 for Waiting tasks.
+    """
+    missing = [col for col in REQUIRED_COLUMNS if col not in chunk.columns]
+    if missing:
+        raise SchemaError(f"Eksik sütunlar: {', '.join(missing)}")
+
+    text = {col: _text(chunk[col]) for col in IMPORT_COLUMNS if col in chunk.columns}
+    filled = pd.concat(text.values(), axis=1).ne("").any(axis=1)
+    chunk = chunk[filled]
+    text = {col: values[filled] for col, values in text.items()}
+
+    def column(name):
+        return chunk[name] if name in chunk.columns else pd.Series("", index=chunk.index, dtype=object)
+
+    def text_column(name):
+        return text[name] if name in text else column(name)
+
+    name = text_column("Job Name")
+    # Excel date cells arrive as datetimes and are accepted as they are
+    start = pd.to_datetime(_stripped(column("Start Date")), format="%Y-%m-%d", errors="coerce")
+    end = pd.to_datetime(_stripped(column("End Date")), format="%Y-%m-%d", errors="coerce")
+    estimated = parse_costs(text_column("Estimated Cost").replace("", np.nan))
+    actual = parse_costs(text_column("Actual Cost").replace("", np.nan))
+    status = text_column("Status").str.capitalize().replace("", "Waiting")
+    done = status == "Done"
+
+    # Checks in the order the entry form runs them; a row reports its first failure
+    message = pd.Series(np.select(
+        [
+            name == "",
+            start.isna() | end.isna(),
+            estimated.isna() | (estimated < 0),
+            ~status.isin(STATUSES),
+            done & (actual.isna() | (actual < 0)),
+        ],
+        [
+            "Görev adı boş olamaz!",
+            "Tarih formatı YYYY-MM-DD olmalı!",
+            "Tahmini maliyet geçerli bir sayı olmalı!",
+            f"Durum {' veya '.join(STATUSES)} olmalı!",
+            "Gerçekleşen maliyet geçerli bir sayı olmalı!",
+        ],
+        default="",
+    ), index=chunk.index)
+    invalid = message != ""
+    errors = [(int(row) + FIRST_ROW, text) for row, text in message[invalid].items()]
+
+    valid = ~invalid
+    tasks = pd.DataFrame({
+        "Job Name": name[valid],
+        "Description": text_column("Description")[valid],
+        "Start Date": start[valid].dt.strftime("%Y-%m-%d"),
+        "End Date": end[valid].dt.strftime("%Y-%m-%d"),
+        "Estimated Cost": estimated[valid],
+        "Actual Cost": actual[valid].where(done[valid], 0.0),
+        "Status": status[valid],
+    }, columns=IMPORT_COLUMNS)
+    return tasks, errors
+
+
+def read_tasks(path, chunksize=CHUNK_SIZE, progress=None):
+    """Read and validate a whole import file.
+
+    Returns ImportResult(tasks, errors, rows): the valid tasks as a frame,
+    the (row number, message) pairs of rejected rows, and the number of
+    rows read. progress, if given, is called with the running row count
+    after each chunk.
+    """
+    valid, errors, rows = [], [], 0
+    for chunk in read_chunks(path, chunksize):
+        tasks, chunk_errors = validate_chunk(chunk)
+        valid.append(tasks)
+        errors.extend(chunk_errors)
+        rows += len(tasks) + len(chunk_errors)
+        if progress is not None:
+            progress(rows)
+    tasks = pd.concat(valid, ignore_index=True) if valid else pd.DataFrame(columns=IMPORT_COLUMNS)
+    return ImportResult(tasks, errors, rows)
+
+
+def format_errors(errors, limit=20):
+    """Render per-row errors as lines, eliding all but the first limit."""
+    lines = [f"Satır {row}: {message}" for row, message in errors[:limit]]
+    if len(errors) > limit:
+        lines.append(f"... ve {len(errors) - limit} hata daha")
+    return "\n".join(lines)
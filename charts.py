@@ -0,0 +1,270 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import matplotlib.dates as mdates
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+
+from instrumentation import timed
+
+# Figures are built with the object-oriented API (no pyplot state machine)
+# so they can be created on worker threads and embedded later on the Tk thread.
+
+
+# Above this many jobs only every n-th row gets cost labels and a tick label
+LABEL_LIMIT = 60
+# Figure height stops growing past this many rows
+MAX_FULL_HEIGHT_ROWS = 200
+
+
+class FigureCache:
+    """Recently built figures keyed by (kind, data version, filter).
+
+    Storing a figure drops every entry built from an older data version,
+    so cached figures never outlive the data they show. A figure shown in
+    a window is not released while it is on screen; hide() detaches it
+    from the window's canvas when the window closes.
+    """
+
+    def __init__(self, maxsize=4):
+        self.maxsize = maxsize
+        self._figures = OrderedDict()
+        self._windows = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        """Return the figure cached for key, calling build() on a miss."""
+        with self._lock:
+            fig = self._figures.get(key)
+            if fig is not None:
+                self._figures.move_to_end(key)
+                return fig
+        fig = build()
+        with self._lock:
+            self._figures[key] = fig
+            for old in [k for k in self._figures if k[1] < key[1]]:
+                self._release(old)
+            while len(self._figures) > self.maxsize:
+                self._release(next(iter(self._figures)))
+        return fig
+
+    def _release(self, key):
+        fig = self._figures.pop(key)
+        if fig not in self._windows:
+            fig.clear()
+
+    def show(self, fig, window):
+        """Record that fig is displayed in window."""
+        with self._lock:
+            self._windows[fig] = window
+
+    def window_for(self, fig):
+        """Return the window displaying fig, or None."""
+        with self._lock:
+            return self._windows.get(fig)
+
+    def hide(self, fig):
+        """Detach fig from its closed window, freeing it unless still cached."""
+        with self._lock:
+            self._windows.pop(fig, None)
+            # Swapping in an Agg canvas drops the figure's reference to the Tk widget
+            FigureCanvasAgg(fig)
+            if fig not in self._figures.values():
+                fig.clear()
+
+    def clear(self):
+        with self._lock:
+            self._windows.clear()
+            while self._figures:
+                self._release(next(iter(self._figures)))
+
+
+@timed("chart.save")
+def save_figure(fig, file_path):
+    """Render a figure that isn't on screen to a PDF or PNG file (by extension).
+
+    The figure is drawn on an offscreen Agg canvas, so this is safe to call
+    from a worker thread and never touches Tk.
+    """
+    FigureCanvasAgg(fig)
+    fig.savefig(file_path, bbox_inches="tight")
+
+
+def _format_eur(value):
+    return f"{value:,.0f}".replace(",", ".")
+
+
+@timed("chart.calendar")
+def build_calendar_figure(df, title="Görev Zaman Çizelgesi ve Maliyet"):
+    """Build the job timeline figure with spent/expected cost bars."""
+    # Dates are already datetime64 (see schema.to_typed)
+    start_dates = df["Start Date"]
+    end_dates = df["End Date"]
+    valid = start_dates.notna() & end_dates.notna()
+
+    # One vectorized pass: per-job span and Done/Waiting cost sums
+    done = df["Status"] == "Done"
+    waiting = df["Status"] == "Waiting"
+    jobs = pd.DataFrame({
+        "Job Name": df["Job Name"],
+        "start": start_dates,
+        "end": end_dates,
+        "done_cost": df["Actual Cost"].where(done, 0).astype(float),
+        "wait_cost": df["Estimated Cost"].where(waiting, 0).astype(float),
+    })[valid].groupby("Job Name", observed=True).agg(
+        start=("start", "min"),
+        end=("end", "max"),
+        done_cost=("done_cost", "sum"),
+        wait_cost=("wait_cost", "sum"),
+    ).sort_values("start", kind="stable")
+
+    n = len(jobs)
+    rows = np.arange(n)
+    done_cost = jobs["done_cost"].to_numpy()
+    wait_cost = jobs["wait_cost"].to_numpy()
+    total_cost = done_cost + wait_cost
+    with np.errstate(divide="ignore", invalid="ignore"):
+        done_ratio = np.where(total_cost > 0, done_cost / total_cost, 0)
+        wait_ratio = np.where(total_cost > 0, wait_cost / total_cost, 0)
+
+    duration = (jobs["end"] - jobs["start"]).dt.days.to_numpy()
+    duration = np.where(duration == 0, 1, duration)
+    start = mdates.date2num(jobs["start"].to_numpy())
+    done_end = start + (duration * done_ratio).astype(int)
+    wait_end = done_end + (duration * wait_ratio).astype(int)
+
+    fig = Figure(figsize=(14, max(6, min(n, MAX_FULL_HEIGHT_ROWS) * 0.5)))
+    ax = fig.add_subplot(111)
+    ax.xaxis_date()
+
+    has_done = done_cost > 0
+    has_wait = wait_cost > 0
+    for mask, x0, x1, color in ((has_done, start, done_end, "green"), (has_wait, done_end, wait_end, "orange")):
+        segments = np.stack([
+            np.column_stack([x0[mask], rows[mask]]),
+            np.column_stack([x1[mask], rows[mask]]),
+        ], axis=1)
+        ax.add_collection(LineCollection(segments, colors=color, linewidths=4))
+    if n:
+        ax.set_xlim(start.min() - 1, wait_end.max() + 1)
+        ax.set_ylim(-1, n)
+
+    step = max(1, -(-n // LABEL_LIMIT))
+    labelled = rows % step == 0
+    for idx in np.flatnonzero(labelled & has_done):
+        ax.text(done_end[idx], idx + 0.1, f"Harcanan: {_format_eur(done_cost[idx])} EUR", fontsize=8, va="bottom")
+    for idx in np.flatnonzero(labelled & has_wait):
+        ax.text(wait_end[idx], idx + 0.1, f"Beklenen: {_format_eur(wait_cost[idx])} EUR", fontsize=8, va="bottom")
+
+    ax.set_yticks(rows[::step])
+    ax.set_yticklabels(jobs.index[::step], fontsize=9)
+    ax.set_title(title, fontsize=12, pad=10)
+    ax.grid(True, linestyle="--", linewidth=0.5)
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
+    ax.xaxis.set_major_locator(mdates.MonthLocator())
+    ax.tick_params(axis="x", labelrotation=45)
+    fig.tight_layout()
+
+    total_actual = done_cost.sum()
+    total_estimated = wait_cost.sum()
+    ax.text(
+        0.01, -0.12,
+        f"Harcanan: {total_actual:,.0f} EUR | Beklenen: {total_estimated:,.0f} EUR | Toplam: {(total_actual + total_estimated):,.0f} EUR".replace(",", "."),
+        transform=ax.transAxes,
+        fontsize=10,
+        color='black',
+        ha='left'
+    )
+    return fig
+
+
+@timed("chart.costs")
+def build_cost_figure(df, by, title):
+    """Build a bar chart of spent (Done) and expected (Waiting) cost per group.
+
+    by is a Series aligned with df giving each task's group label, e.g.
+    its month; groups are shown in sorted order.
+    """
+    done = df["Status"] == "Done"
+    waiting = df["Status"] == "Waiting"
+    costs = pd.DataFrame({
+        "group": by,
+        "done_cost": df["Actual Cost"].where(done, 0).astype(float),
+        "wait_cost": df["Estimated Cost"].where(waiting, 0).astype(float),
+    }).groupby("group", observed=True, sort=True)[["done_cost", "wait_cost"]].sum()
+
+    n = len(costs)
+    rows = np.arange(n)
+    fig = Figure(figsize=(11, max(4, min(n, MAX_FULL_HEIGHT_ROWS) * 0.35 + 1.5)))
+    ax = fig.add_subplot(111)
+    ax.barh(rows, costs["done_cost"], color="green", label="Harcanan")
+    ax.barh(rows, costs["wait_cost"], left=costs["done_cost"], color="orange", label="Beklenen")
+    step = max(1, -(-n // LABEL_LIMIT))
+    ax.set_yticks(rows[::step])
+    ax.set_yticklabels([str(label) for label in costs.index[::step]], fontsize=9)
+    ax.invert_yaxis()
+    ax.set_xlabel("EUR")
+    ax.set_title(title, fontsize=12, pad=10)
+    ax.grid(True, axis="x", linestyle="--", linewidth=0.5)
+    ax.legend(loc="lower right")
+    fig.tight_layout()
+    return fig
+
+
+@timed("chart.statistics")
+def build_statistics_figure(stats, forecast=None):
+    """Build the status pie, cost bar and monthly task count charts.
+
+    With a forecast (see forecast.py), the cost bars add the projected
+    remaining cost and a last row shows the projected cash flow.
+    """
+    rows = 3 if forecast is not None else 2
+    fig = Figure(figsize=(8, 4 * rows))
+    ax1 = fig.add_subplot(rows, 2, 1)
+    status_counts = stats["status_counts"]
+    if status_counts.sum() > 0:
+        ax1.pie(
+            status_counts,
+            labels=status_counts.index,
+            autopct='%1.1f%%',
+            colors=['green', 'orange'] if "Done" in status_counts.index and "Waiting" in status_counts.index else None
+        )
+    else:
+        # A pie of no tasks can't be drawn
+        ax1.text(0.5, 0.5, "Görev yok", ha="center", va="center", transform=ax1.transAxes)
+        ax1.set_axis_off()
+    ax1.set_title("Görev Durumu Dağılımı")
+
+    ax2 = fig.add_subplot(rows, 2, 2)
+    cost_labels = ['Gerçekleşen', 'Beklenen']
+    cost_data = [stats["total_actual_cost"], stats["total_estimated_cost"]]
+    if forecast is not None:
+        cost_labels.append('Öngörülen')
+        cost_data.append(forecast["remaining_projected"])
+    ax2.bar(cost_labels, cost_data, color=['green', 'orange', 'red'][:len(cost_data)])
+    ax2.set_title("Maliyet Karşılaştırma")
+    ax2.set_ylabel("EUR")
+
+    ax3 = fig.add_subplot(rows, 1, 2)
+    monthly_tasks = stats["monthly_tasks"]
+    ax3.plot(range(len(monthly_tasks)), monthly_tasks.values, marker='o')
+    ax3.set_xticks(range(len(monthly_tasks)))
+    ax3.set_xticklabels([str(period) for period in monthly_tasks.index], rotation=45)
+    ax3.set_title("Aylık Görev Sayısı")
+    ax3.set_ylabel("Görev Sayısı")
+
+    if forecast is not None:
+        ax4 = fig.add_subplot(rows, 1, 3)
+        flow = forecast["cash_flow"]
+        ax4.plot(flow.index, flow["planned"].cumsum(), color='orange', label='Planlanan')
+        ax4.plot(flow.index, flow["cumulative"], color='red', label='Öngörülen')
+        ax4.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
+        ax4.tick_params(axis='x', rotation=45)
+        ax4.set_title("Öngörülen Nakit Çıkışı (Kümülatif)")
+        ax4.set_ylabel("EUR")
+        ax4.legend(loc="upper left")
+    fig.tight_layout()
+    return fig
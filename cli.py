@@ -0,0 +1,387 @@
+"""Command-line interface for scripting farm tasks without the GUI.
+
+    python cli.py add --name "Elma Hasadı" --start 2025-09-01 --end 2025-09-10 --estimated 1200
+    python cli.py list --status Waiting --format csv
+    python cli.py query --start 2025-01-01 --end 2025-12-31
+    python cli.py import season_plan.csv --skip-invalid
+    python cli.py recur add --name "İlaçlama" --start 2025-04-01 --end 2025-04-02 --estimated 300 --every 14 --unit day
+    python cli.py report reports/ --season 2025
+    python cli.py forecast --by month
+    python cli.py stats
+    python cli.py serve --port 8765
+
+Heavy modules are imported only once a command actually runs.
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+FORMATS = ("table", "csv", "json")
+
+
+def print_tasks(df, fmt):
+    """Write a task frame to stdout as a table, CSV or JSON."""
+    df = df.copy()
+    for col in ("Start Date", "End Date"):
+        df[col] = df[col].dt.strftime("%Y-%m-%d")
+    if fmt == "csv":
+        df.to_csv(sys.stdout, index=False)
+    elif fmt == "json":
+        print(df.to_json(orient="records", force_ascii=False))
+    else:
+        print(df.to_string(index=False) if len(df) else "Görev bulunamadı.")
+
+
+def cmd_add(core, args):
+    from core import build_task
+    task = build_task(args.name, args.desc, args.start, args.end, args.estimated, args.actual, args.done)
+    print(core.add(task))
+
+
+def cmd_update(core, args):
+    from core import build_task
+    from schema import format_date
+    current = core.get(args.id)
+    expected_version = args.expect_version if args.expect_version is not None else current["Version"]
+    done = current["Status"] == "Done" if args.done is None else args.done
+    task = build_task(
+        args.name if args.name is not None else current["Job Name"],
+        args.desc if args.desc is not None else current["Description"],
+        args.start or format_date(current["Start Date"]),
+        args.end or format_date(current["End Date"]),
+        args.estimated if args.estimated is not None else current["Estimated Cost"],
+        args.actual if args.actual is not None else current["Actual Cost"],
+        done,
+    )
+    if args.id < 0:
+        # A recurring occurrence only becomes a stored task once it is changed
+        print(core.materialize(args.id, task))
+        return
+    core.update(args.id, task, expected_version)
+
+
+def cmd_delete(core, args):
+    core.get(args.id)
+    core.delete(args.id)
+
+
+def cmd_list(core, args):
+    archived = not args.open_only
+    print_tasks(core.listing(args.status, archived) if args.upcoming else core.tasks(args.status, archived),
+                args.format)
+
+
+def cmd_query(core, args):
+    df, total_actual, total_estimated = core.expenses(args.start, args.end, args.mode)
+    print_tasks(df, args.format)
+    if args.format == "table":
+        print(f"\nToplam Gerçekleşen Maliyet: {total_actual:,.2f} EUR")
+        print(f"Toplam Tahmini Maliyet: {total_estimated:,.2f} EUR")
+
+
+def cmd_search(core, args):
+    print_tasks(core.search(args.text, args.status, args.min_cost, args.max_cost, args.start, args.end,
+                            args.mode, args.cost_field), args.format)
+
+
+def cmd_recur_add(core, args):
+    from core import build_task
+    task = build_task(args.name, args.desc, args.start, args.end, args.estimated, args.actual, False)
+    print(core.add_recurring(task, args.every, args.unit, args.until, args.count))
+
+
+def cmd_recur_list(core, args):
+    rules = core.recurring()
+    if args.format == "json":
+        print(json.dumps([rule.to_json() for rule in rules], ensure_ascii=False))
+    elif not rules:
+        print("Tekrarlayan görev yok.")
+    for rule in rules if args.format == "table" else []:
+        print(f"{rule.rule_id:>4}  {rule.job_name}  {rule.start.isoformat()} (+{rule.duration} gün)  "
+              f"{rule.describe()}  {rule.estimated_cost:,.2f} EUR")
+
+
+def cmd_recur_delete(core, args):
+    core.delete_recurring(args.id)
+
+
+def cmd_recur_occurrences(core, args):
+    print_tasks(core.occurrences(args.start, args.end, args.mode), args.format)
+
+
+def cmd_season_list(core, args):
+    seasons = core.seasons()
+    if args.format == "json":
+        print(json.dumps(seasons, default=str, ensure_ascii=False))
+        return
+    if not seasons:
+        print("Görev bulunamadı.")
+    for season in seasons:
+        state = "arşivlendi" if season["archived"] else "kapandı" if season["closed"] else "açık"
+        print(f"{season['label']:>8}  {season['first']} - {season['last']}  {season['tasks']:>7} görev  "
+              f"{season['waiting']:>6} bekleyen  {state}")
+
+
+def cmd_season_freeze(core, args):
+    print(core.freeze_season(args.season))
+
+
+def cmd_import(core, args):
+    from bulk_import import format_errors
+    ids, errors = core.import_file(args.path, skip_invalid=args.skip_invalid)
+    if errors:
+        print(format_errors(errors, limit=args.max_errors), file=sys.stderr)
+    if errors and not args.skip_invalid:
+        print(f"Hata: {len(errors)} satır geçersiz, hiçbir görev içe aktarılmadı.", file=sys.stderr)
+        return 1
+    print(f"{len(ids)} görev içe aktarıldı.")
+
+
+def cmd_export(core, args):
+    def progress(rows, total):
+        print(f"\r{rows}/{total} görev yazıldı", end="", file=sys.stderr, flush=True)
+
+    core.export_tasks(args.path, progress=progress if sys.stderr.isatty() else None)
+    if sys.stderr.isatty():
+        print(file=sys.stderr)
+    print(args.path)
+
+
+def cmd_report(core, args):
+    from reports import build_reports
+
+    def progress(count, total):
+        print(f"\r{count}/{total} rapor yazıldı", end="", file=sys.stderr, flush=True)
+
+    counts = build_reports(core.all_tasks(), args.out_dir, seasons=args.season, workers=args.workers,
+                           force=args.force, progress=progress if sys.stderr.isatty() else None,
+                           start_month=core.archive.start_month)
+    if sys.stderr.isatty() and counts["written"]:
+        print(file=sys.stderr)
+    print(f"{counts['written']} rapor yazıldı, {counts['skipped']} rapor değişmediği için atlandı"
+          + (f", {counts['removed']} eski rapor silindi." if counts["removed"] else "."))
+
+
+def cmd_forecast(core, args):
+    from forecast import LABELS
+    forecast = core.forecast(args.start, args.end)
+    table = {"job": forecast["by_job"], "month": forecast["by_month"], "cash": forecast["cash_flow"]}[args.by]
+    table = table.rename(columns=LABELS)
+    if args.by == "cash":
+        table.index = table.index.strftime("%Y-%m-%d")
+    table.index = table.index.astype(str)
+    if args.format == "csv":
+        table.to_csv(sys.stdout)
+    elif args.format == "json":
+        print(table.to_json(orient="index", force_ascii=False))
+    else:
+        print(f"Gerçekleşen / Tahmini Maliyet Oranı: {forecast['ratio']:.2f}")
+        print(f"Öngörülen Kalan Maliyet: {forecast['remaining_projected']:.2f}")
+        print(f"Öngörülen Harcama ({forecast['first']} - {forecast['last']}): {forecast['window_projected']:.2f}")
+        print(table.round(2).to_string() if len(table) else "Görev bulunamadı.")
+
+
+def cmd_stats(core, args):
+    stats = core.statistics()
+    forecast = core.forecast()
+    summary = {
+        "Toplam Görev Sayısı": stats["total_tasks"],
+        "Tamamlanan Görev Sayısı": stats["done_tasks"],
+        "Bekleyen Görev Sayısı": stats["waiting_tasks"],
+        "Toplam Gerçekleşen Maliyet": round(float(stats["total_actual_cost"]), 2),
+        "Toplam Beklenen Maliyet": round(float(stats["total_estimated_cost"]), 2),
+        "Ortalama Görev Süresi": round(float(stats["avg_duration"]), 1) if stats["total_tasks"] else None,
+        "Gerçekleşen / Tahmini Maliyet Oranı": round(forecast["ratio"], 3),
+        "Öngörülen Kalan Maliyet": round(forecast["remaining_projected"], 2),
+        "Aylık Görev Sayısı": {str(month): int(count) for month, count in stats["monthly_tasks"].items()},
+    }
+    if args.format == "json":
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+        return
+    for key, value in summary.items():
+        if isinstance(value, dict):
+            print(f"{key}:")
+            for month, count in value.items():
+                print(f"  {month}: {count}")
+        else:
+            print(f"{key}: {value}")
+
+
+def cmd_serve(core, args):
+    import asyncio
+    from server import serve
+
+    def on_ready(server):
+        host, port = server.sockets[0].getsockname()[:2]
+        print(f"Görev API'si http://{host}:{port}/ adresinde çalışıyor (durdurmak için Ctrl+C)", file=sys.stderr)
+
+    try:
+        asyncio.run(serve(core, args.host, args.port, on_ready=on_ready))
+    except KeyboardInterrupt:
+        pass
+
+
+def add_task_fields(parser, required):
+    parser.add_argument("--name", required=required, help="Görev adı")
+    parser.add_argument("--desc", default=None if not required else "", help="Açıklama")
+    parser.add_argument("--start", required=required, help="Başlangıç tarihi (YYYY-MM-DD)")
+    parser.add_argument("--end", required=required, help="Bitiş tarihi (YYYY-MM-DD)")
+    parser.add_argument("--estimated", required=required, help="Tahmini maliyet (EUR)")
+    parser.add_argument("--actual", default=None if not required else "0", help="Gerçekleşen maliyet (EUR)")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Çiftlik Görev Takip komut satırı aracı")
+    parser.add_argument("--data-dir", type=Path, default=None, help="Veri klasörü (varsayılan: ~/FarmTasks)")
+    parser.add_argument("--engine", default=os.environ.get("FARMTASKS_ENGINE", "sqlite"),
+                        choices=("sqlite", "excel"), help="Depolama motoru")
+    parser.add_argument("--metrics", type=Path, help="Komutun süre ölçümlerini bu JSON dosyasına yaz")
+    parser.add_argument("--profile", type=Path, help="Komutu cProfile ile çalıştırıp sonucu bu dosyaya yaz")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="Görev ekle")
+    add_task_fields(add, required=True)
+    add.add_argument("--done", action="store_true", help="Görev tamamlandı")
+    add.set_defaults(func=cmd_add)
+
+    update = commands.add_parser("update", help="Görev güncelle")
+    update.add_argument("id", type=int)
+    add_task_fields(update, required=False)
+    status = update.add_mutually_exclusive_group()
+    status.add_argument("--done", dest="done", action="store_true", default=None, help="Tamamlandı olarak işaretle")
+    status.add_argument("--waiting", dest="done", action="store_false", help="Bekliyor olarak işaretle")
+    update.add_argument("--expect-version", type=int, default=None,
+                        help="Yalnızca görev hâlâ bu sürümdeyse güncelle (varsayılan: okunan sürüm)")
+    update.set_defaults(func=cmd_update)
+
+    delete = commands.add_parser("delete", help="Görev sil")
+    delete.add_argument("id", type=int)
+    delete.set_defaults(func=cmd_delete)
+
+    list_ = commands.add_parser("list", help="Görevleri listele")
+    list_.add_argument("--status", choices=("Done", "Waiting"))
+    list_.add_argument("--upcoming", action="store_true",
+                       help="Tekrarlayan görevlerin önümüzdeki günlerdeki tekrarlarını da göster")
+    list_.add_argument("--open-only", action="store_true", help="Arşivlenmiş sezonların görevlerini gösterme")
+    list_.add_argument("--format", choices=FORMATS, default="table")
+    list_.set_defaults(func=cmd_list)
+
+    recur = commands.add_parser("recur", help="Tekrarlayan görevler")
+    recur_commands = recur.add_subparsers(dest="recur_command", required=True)
+    recur_add = recur_commands.add_parser("add", help="Tekrarlayan görev ekle (tarihler ilk tekrarındır)")
+    add_task_fields(recur_add, required=True)
+    recur_add.add_argument("--every", type=int, default=1, help="Kaç birimde bir tekrarlanacağı")
+    recur_add.add_argument("--unit", choices=("day", "week", "month"), default="week")
+    recur_add.add_argument("--until", help="Son tekrarın en geç başlangıç tarihi (YYYY-MM-DD)")
+    recur_add.add_argument("--count", type=int, help="Toplam tekrar sayısı")
+    recur_add.set_defaults(func=cmd_recur_add)
+    recur_list = recur_commands.add_parser("list", help="Tekrar kurallarını listele")
+    recur_list.add_argument("--format", choices=("table", "json"), default="table")
+    recur_list.set_defaults(func=cmd_recur_list)
+    recur_delete = recur_commands.add_parser("delete", help="Tekrar kuralını durdur (kaydedilmiş tekrarlar kalır)")
+    recur_delete.add_argument("id", type=int)
+    recur_delete.set_defaults(func=cmd_recur_delete)
+    recur_occurrences = recur_commands.add_parser("occurrences", help="Tarih aralığındaki bekleyen tekrarlar")
+    recur_occurrences.add_argument("--start", required=True, help="Başlangıç tarihi (YYYY-MM-DD)")
+    recur_occurrences.add_argument("--end", required=True, help="Bitiş tarihi (YYYY-MM-DD)")
+    recur_occurrences.add_argument("--mode", choices=("contained", "overlapping"), default="overlapping")
+    recur_occurrences.add_argument("--format", choices=FORMATS, default="table")
+    recur_occurrences.set_defaults(func=cmd_recur_occurrences)
+
+    season = commands.add_parser("season", help="Sezonlar ve kapanmış sezonların arşivlenmesi")
+    season_commands = season.add_subparsers(dest="season_command", required=True)
+    season_list = season_commands.add_parser("list", help="Sezonları listele")
+    season_list.add_argument("--format", choices=("table", "json"), default="table")
+    season_list.set_defaults(func=cmd_season_list)
+    season_freeze = season_commands.add_parser("freeze", help="Kapanmış bir sezonu salt okunur arşive taşı")
+    season_freeze.add_argument("season", type=int, help="Sezonun başladığı yıl, örn. 2023")
+    season_freeze.set_defaults(func=cmd_season_freeze)
+
+    query = commands.add_parser("query", help="Tarih aralığındaki görevler ve harcamalar")
+    query.add_argument("--start", required=True, help="Başlangıç tarihi (YYYY-MM-DD)")
+    query.add_argument("--end", required=True, help="Bitiş tarihi (YYYY-MM-DD)")
+    query.add_argument("--mode", choices=("contained", "overlapping"), default="contained")
+    query.add_argument("--format", choices=FORMATS, default="table")
+    query.set_defaults(func=cmd_query)
+
+    search = commands.add_parser("search", help="Görev adı ve açıklamada ara, alanlara göre süz")
+    search.add_argument("text", nargs="?", default="", help="Aranacak kelimeler (kelime başları eşleşir)")
+    search.add_argument("--status", choices=("Done", "Waiting"))
+    search.add_argument("--min-cost", type=float)
+    search.add_argument("--max-cost", type=float)
+    search.add_argument("--cost-field", choices=("Estimated Cost", "Actual Cost"), default="Estimated Cost")
+    search.add_argument("--start", help="Başlangıç tarihi (YYYY-MM-DD)")
+    search.add_argument("--end", help="Bitiş tarihi (YYYY-MM-DD)")
+    search.add_argument("--mode", choices=("contained", "overlapping"), default="overlapping")
+    search.add_argument("--format", choices=FORMATS, default="table")
+    search.set_defaults(func=cmd_search)
+
+    import_ = commands.add_parser("import", help="CSV veya Excel dosyasından toplu görev aktar")
+    import_.add_argument("path", type=Path)
+    import_.add_argument("--skip-invalid", action="store_true", help="Geçersiz satırları atlayıp kalanları aktar")
+    import_.add_argument("--max-errors", type=int, default=20, help="Gösterilecek en fazla hata sayısı")
+    import_.set_defaults(func=cmd_import)
+
+    export = commands.add_parser("export", help="Tüm görevleri Excel, CSV veya Parquet dosyasına aktar")
+    export.add_argument("path", type=Path)
+    export.set_defaults(func=cmd_export)
+
+    report = commands.add_parser("report", help="İş ve ay bazında PDF raporları ile özet tabloları oluştur")
+    report.add_argument("out_dir", help="Raporların yazılacağı klasör")
+    report.add_argument("--season", type=int, action="append", help="Yalnızca bu sezon (tekrarlanabilir)")
+    report.add_argument("--workers", type=int, help="Paralel işlem sayısı (varsayılan: işlemci sayısı)")
+    report.add_argument("--force", action="store_true", help="Değişmemiş raporları da yeniden oluştur")
+    report.set_defaults(func=cmd_report)
+
+    serve = commands.add_parser("serve", help="Yerel HTTP API sunucusunu başlat")
+    serve.add_argument("--host", default="127.0.0.1", help="Dinlenecek adres (varsayılan: yalnızca bu bilgisayar)")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.set_defaults(func=cmd_serve)
+
+    forecast = commands.add_parser("forecast", help="Maliyet sapması, aşım oranları ve öngörülen nakit akışı")
+    forecast.add_argument("--by", choices=("job", "month", "cash"), default="job",
+                          help="İş, ay veya günlük nakit akışı tablosu")
+    forecast.add_argument("--start", help="Nakit akışı başlangıcı (varsayılan: bugün)")
+    forecast.add_argument("--end", help="Nakit akışı sonu (varsayılan: 90 gün sonrası)")
+    forecast.add_argument("--format", choices=FORMATS, default="table")
+    forecast.set_defaults(func=cmd_forecast)
+
+    stats = commands.add_parser("stats", help="İstatistikleri göster")
+    stats.add_argument("--format", choices=("table", "json"), default="table")
+    stats.set_defaults(func=cmd_stats)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    # Deferred so that --help and argument errors don't pay for pandas
+    from core import FarmTasks, DEFAULT_DATA_DIR, ConflictError, LockTimeout
+    from instrumentation import metrics
+    metrics.set_profiling(args.profile is not None)
+    try:
+        core = FarmTasks(args.data_dir or DEFAULT_DATA_DIR, args.engine)
+    except Exception as e:
+        print(f"Hata: Görev veritabanı açılamadı: {e}", file=sys.stderr)
+        return 1
+    try:
+        with metrics.timed(f"cli.{args.command}"):
+            status = args.func(core, args)
+    except KeyError:
+        print(f"Hata: Görev bulunamadı: {getattr(args, 'id', '')}", file=sys.stderr)
+        return 1
+    except (ValueError, ConflictError, LockTimeout) as e:
+        print(f"Hata: {e}", file=sys.stderr)
+        return 1
+    finally:
+        core.close()
+        if args.metrics:
+            metrics.dump(args.metrics)
+        if args.profile:
+            metrics.save_profile(args.profile)
+    return status or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
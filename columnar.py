@@ -0,0 +1,116 @@
+"""Binary columnar copy of a table, read back through a memory map.
+
+Used to avoid parsing farm_tasks.xlsx again while the workbook hasn't
+changed. The file holds a JSON header followed by one raw array per
+column, each aligned to ALIGNMENT bytes:
+
+    MAGIC | header length (uint64) | header JSON | padding | column arrays
+
+Numeric and datetime columns are stored as they are in memory and come
+back as read-only views of the map: reading them costs no parsing and
+no copy, and their pages are read from disk (or shared from the page
+cache) as they are used. Text columns are dictionary-encoded: the
+distinct values go in the header and the column holds int32 codes into
+them, -1 standing for a missing value; decoding them builds new arrays.
+
+The header carries a key (e.g. the source file's mtime and size); a file
+whose key doesn't match is ignored, so a stale copy is never used.
+"""
+import json
+import os
+import struct
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+MAGIC = b"FTCOLS1\n"
+ALIGNMENT = 64
+
+
+def _aligned(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _encode(series):
+    """Return (array, distinct text values or None), or None if the column can't be stored."""
+    values = series.to_numpy()
+    if values.dtype.kind in "biufM":
+        return np.ascontiguousarray(values), None
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    uniques = list(uniques)
+    if not all(isinstance(value, str) for value in uniques):
+        return None
+    return codes.astype("int32"), uniques
+
+
+def write_columns(path, df, key, meta=None):
+    """Write df (and optional meta values) to path, tagged with key.
+
+    Returns False without writing when a column holds values other than
+    numbers, datetimes and text.
+    """
+    path = Path(path)
+    arrays, columns, offset = [], [], 0
+    for name in df.columns:
+        encoded = _encode(df[name])
+        if encoded is None:
+            return False
+        array, values = encoded
+        columns.append({"name": str(name), "dtype": array.dtype.str, "offset": offset,
+                        "values": values, "pandas_dtype": str(df[name].dtype)})
+        arrays.append(array)
+        offset = _aligned(offset + array.nbytes)
+    header = json.dumps({"key": key, "rows": len(df), "meta": meta or {}, "columns": columns},
+                        ensure_ascii=False).encode("utf-8")
+    data_start = _aligned(len(MAGIC) + 8 + len(header))
+
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(MAGIC + struct.pack("<Q", len(header)) + header)
+        for column, array in zip(columns, arrays):
+            f.seek(data_start + column["offset"])
+            f.write(array.tobytes())
+        # Pad the end too, so every column lies wholly inside the file
+        f.truncate(data_start + offset)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return True
+
+
+def _read_header(path):
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Sütunlu dosya biçimi tanınmadı: {path}")
+        length, = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(length).decode("utf-8"))
+    return header, _aligned(len(MAGIC) + 8 + length)
+
+
+def read_columns(path, key):
+    """Return (df, meta) from path if it was written with key, else None.
+
+    A missing or unreadable file counts as out of date too.
+    """
+    try:
+        header, data_start = _read_header(path)
+        # Compared as JSON, where tuples become lists
+        if header["key"] != json.loads(json.dumps(key)):
+            return None
+        rows = header["rows"]
+        buffer = np.memmap(path, dtype=np.uint8, mode="r")
+        data = {}
+        for column in header["columns"]:
+            array = np.frombuffer(buffer, dtype=np.dtype(column["dtype"]), count=rows,
+                                  offset=data_start + column["offset"])
+            if column["values"] is None:
+                data[column["name"]] = array
+            else:
+                # Decoding is a take from the few distinct values, not a parse
+                values = np.array(column["values"] + [None], dtype=object)
+                data[column["name"]] = pd.Series(values[array], dtype=column["pandas_dtype"])
+        # Without copy=False pandas would copy every array out of the map
+        return pd.DataFrame(data, copy=False), header["meta"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
@@ -0,0 +1,424 @@
+"""GUI-free task API shared by the Tk application and the command line.
+
+Only pandas is imported eagerly; openpyxl (and pyarrow for Parquet) are
+loaded when a file is actually read or written, and matplotlib is never
+imported from here.
+"""
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+from storage import open_storage, ConflictError, FIELD_COLUMNS, TASK_COLUMNS
+from locking import LockTimeout
+from bulk_import import read_tasks
+from export import export_tasks
+from forecast import build_forecast, export_sheets
+from task_store import TaskStore
+from aggregates import TaskAggregates
+from date_index import DateIndex, CONTAINED, OVERLAPPING
+from search_index import SearchIndex, COST_FIELDS
+from recurrence import RecurrenceStore
+from seasons import SeasonArchive, FrozenSeasonError, season_of, season_bounds, season_label, task_seasons
+from search_index import text_mask
+from schema import to_typed, append_rows
+from aggregates import parse_date, query_date
+from instrumentation import timed
+
+DEFAULT_DATA_DIR = Path.home() / "FarmTasks"
+# Days ahead for which occurrences of recurring tasks are listed with the tasks
+UPCOMING_DAYS = 90
+
+
+class TaskValidationError(ValueError):
+    """Raised when task input is rejected; the message is user-facing."""
+
+
+def validate_date(date_str):
+    """Validate date format (YYYY-MM-DD)."""
+    try:
+        datetime.strptime(date_str, '%Y-%m-%d')
+        return True
+    except (ValueError, TypeError):
+        return False
+
+
+def validate_cost(cost_str):
+    """Validate cost input (numeric and non-negative)."""
+    try:
+        return float(cost_str) >= 0
+    except (ValueError, TypeError):
+        return False
+
+
+@timed("validate.task")
+def build_task(name, desc, start_date, end_date, estimated_cost, actual_cost, done):
+    """Validate raw input fields and return a task dict ready to store."""
+    name = (name or "").strip()
+    if not name:
+        raise TaskValidationError("Görev adı boş olamaz!")
+    if not (validate_date(start_date) and validate_date(end_date)):
+        raise TaskValidationError("Tarih formatı YYYY-MM-DD olmalı!")
+    if not validate_cost(estimated_cost):
+        raise TaskValidationError("Tahmini maliyet geçerli bir sayı olmalı!")
+    if done and not validate_cost(actual_cost):
+        raise TaskValidationError("Gerçekleşen maliyet geçerli bir sayı olmalı!")
+    return {
+        "Job Name": name,
+        "Description": (desc or "").strip(),
+        "Start Date": start_date,
+        "End Date": end_date,
+        "Estimated Cost": float(estimated_cost),
+        "Actual Cost": float(actual_cost) if done else 0.0,
+        "Status": "Done" if done else "Waiting",
+    }
+
+
+class FarmTasks:
+    """Task store plus the indexes and aggregates kept in sync with it."""
+
+    def __init__(self, data_dir=DEFAULT_DATA_DIR, engine="sqlite"):
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.storage = open_storage(self.data_dir, engine)
+        self.store = TaskStore(self.storage)
+        self.aggregates = TaskAggregates()
+        self.date_index = DateIndex()
+        self.search_index = SearchIndex()
+        self.store.subscribe(self.aggregates)
+        self.store.subscribe(self.date_index)
+        self.store.subscribe(self.search_index)
+        self.recurrences = RecurrenceStore(self.data_dir / "recurrences.json")
+        self.archive = SeasonArchive(self.data_dir / "seasons.json")
+        self._merged = None
+        self._archived_ids = frozenset()
+        self._complete_freezes()
+
+    def tasks(self, status=None, archived=True):
+        """Return all tasks, optionally only those with the given status.
+
+        Tasks of archived seasons are included (read-only) unless archived
+        is False.
+        """
+        df = self.all_tasks() if archived else self.store.tasks()
+        if status:
+            df = df[df["Status"] == status]
+        return df
+
+    def all_tasks(self):
+        """Return the tasks in the store together with those of archived seasons."""
+        archived = self.archive.select()
+        if archived is None:
+            self._archived_ids = frozenset()
+            return self.store.tasks()
+        version, df = self.store.read(lambda df: df)
+        key = (version, self.archive.version)
+        # Merging and sorting is done once per data version, not on every listing
+        if self._merged is None or self._merged[0] != key:
+            self._merged = key, self._with_archived(df, archived)
+            self._archived_ids = frozenset(archived["ID"].tolist())
+        return self._merged[1]
+
+    def is_archived(self, task_id):
+        """Whether a task listed by tasks() belongs to an archived season; no file access."""
+        return task_id in self._archived_ids
+
+    def get(self, task_id):
+        if task_id < 0:
+            return self._typed([self.recurrences.get(task_id)]).iloc[0].to_dict()
+        try:
+            return self.store.get(task_id)
+        except KeyError:
+            return self.archive.get(task_id)
+
+    def _check_season(self, tasks):
+        """Refuse tasks starting in an archived season."""
+        frozen = {entry["season"] for entry in self.archive.list()}
+        if not frozen:
+            return
+        for task in tasks:
+            day = parse_date(task["Start Date"])
+            if day is not None and season_of(day, self.archive.start_month) in frozen:
+                raise FrozenSeasonError(
+                    f"{season_label(season_of(day, self.archive.start_month), self.archive.start_month)} "
+                    "sezonu arşivlendi; bu sezona görev eklenemez."
+                )
+
+    def _check_not_archived(self, task_id):
+        if task_id > 0 and self.archive.contains(task_id):
+            raise FrozenSeasonError(f"Görev {task_id} arşivlenmiş bir sezona ait; değiştirilemez veya silinemez.")
+
+    def add(self, task):
+        self._check_season([task])
+        return self.store.add(task)
+
+    def add_many(self, tasks):
+        """Add validated tasks in a single write and return their IDs."""
+        tasks = list(tasks)
+        self._check_season(tasks)
+        return self.store.add_many(tasks)
+
+    def import_file(self, file_path, skip_invalid=False, progress=None):
+        """Import a CSV/xlsx batch; return (new IDs, [(row, message), ...]).
+
+        Unless skip_invalid is set, nothing is imported when any row fails
+        validation.
+        """
+        result = read_tasks(file_path, progress=progress)
+        if result.errors and not skip_invalid:
+            return [], result.errors
+        return self.add_many(result.tasks.to_dict("records")), result.errors
+
+    def update(self, task_id, task, expected_version=None):
+        """Update a task, refusing with ConflictError if it changed since expected_version."""
+        self._check_not_archived(task_id)
+        self._check_season([task])
+        return self.store.update(task_id, task, expected_version)
+
+    def delete(self, task_id):
+        """Delete a task, or drop a single occurrence of a recurring task (negative ID)."""
+        if task_id < 0:
+            self.recurrences.resolve(task_id)
+        else:
+            self._check_not_archived(task_id)
+            self.store.delete(task_id)
+
+    def versioned(self, fn, *args):
+        """Call fn(*args) with writes blocked and return (data version, result)."""
+        # Read before fn runs, so that a version never claims changes the result lacks
+        others = self.recurrences.current_version() + self.archive.current_version()
+        version, result = self.store.read(lambda df: fn(*args))
+        # All only ever grow, so the sum changes whenever any does
+        return version + others, result
+
+    def add_recurring(self, task, every, unit, until=None, count=None):
+        """Store task (from build_task) as the first occurrence of a recurring rule; return the rule ID."""
+        start, end = date.fromisoformat(task["Start Date"]), date.fromisoformat(task["End Date"])
+        if end < start:
+            raise TaskValidationError("Bitiş tarihi başlangıç tarihinden önce olamaz!")
+        if until is not None and not validate_date(until):
+            raise TaskValidationError("Tarih formatı YYYY-MM-DD olmalı!")
+        return self.recurrences.add({
+            "job_name": task["Job Name"],
+            "description": task["Description"],
+            "start": start,
+            "duration": (end - start).days,
+            "estimated_cost": task["Estimated Cost"],
+            "every": every,
+            "unit": unit,
+            "until": date.fromisoformat(until) if until else None,
+            "count": count,
+        })
+
+    def recurring(self):
+        """Return the recurring task rules."""
+        return self.recurrences.list()
+
+    def delete_recurring(self, rule_id):
+        """Stop a recurring task; occurrences already turned into tasks stay."""
+        self.recurrences.delete(rule_id)
+
+    def materialize(self, task_id, task):
+        """Turn a pending occurrence into a real task with the given fields; return its ID."""
+        # Store lock first, as on every other path that reaches the rules
+        return self.store.read(lambda df: self.recurrences.resolve(task_id, lambda: self.store.add(task)))[1]
+
+    @staticmethod
+    def _typed(tasks):
+        df = to_typed(pd.DataFrame(tasks, columns=TASK_COLUMNS))
+        df.index = pd.Index(df["ID"].to_numpy())
+        return df
+
+    def occurrences(self, start, end, mode=OVERLAPPING):
+        """Return the pending occurrences of recurring tasks within (or overlapping) a date range."""
+        first, last = query_date(start), query_date(end)
+        df = self._typed(self.recurrences.occurrences(first, last))
+        if mode == CONTAINED:
+            df = df[(df["Start Date"] >= pd.Timestamp(first)) & (df["End Date"] <= pd.Timestamp(last))]
+        return df
+
+    @staticmethod
+    def _with_archived(df, archived):
+        if archived is None or not len(archived):
+            return df
+        # Callers rely on ID order, and archived IDs may interleave with stored ones
+        return append_rows(archived, df).sort_index(kind="stable")
+
+    def _with_occurrences(self, df, start, end, mode=OVERLAPPING):
+        occurrences = self.occurrences(start, end, mode)
+        # Negative IDs go first, which keeps the frame in ID order
+        return append_rows(occurrences, df) if len(occurrences) else df
+
+    def listing(self, status=None, archived=True):
+        """Tasks for the task table: those of tasks() plus recurring occurrences of the next UPCOMING_DAYS."""
+        df = self.tasks(status, archived)
+        if status == "Done":
+            return df
+        today = date.today()
+        return self._with_occurrences(df, today, today + timedelta(days=UPCOMING_DAYS))
+
+    def calendar_tasks(self, archived=True):
+        """Tasks for the full calendar: occurrences are expanded over the tasks' span and the next UPCOMING_DAYS."""
+        df = self.tasks(archived=archived)
+        first = last = date.today()
+        if df["Start Date"].notna().any():
+            first = min(first, df["Start Date"].min().date())
+        if df["End Date"].notna().any():
+            last = max(last, df["End Date"].max().date())
+        return self._with_occurrences(df, first, max(last, date.today() + timedelta(days=UPCOMING_DAYS)))
+
+    def query(self, start, end, mode=CONTAINED, occurrences=True):
+        """Return the tasks within (or overlapping) a date range, archived and recurring ones included."""
+        df = self.store.tasks()
+        df = self._with_archived(df.loc[self.date_index.query(mode, start, end)], self.archive.select(start, end, mode))
+        return self._with_occurrences(df, start, end, mode) if occurrences else df
+
+    def search(self, text="", status=None, min_cost=None, max_cost=None, start=None, end=None,
+               mode=CONTAINED, cost_field=COST_FIELDS[0], occurrences=False):
+        """Return the tasks matching all given criteria, in ID order.
+
+        text matches word prefixes in Job Name and Description, ignoring
+        case and Turkish letters; costs are compared on cost_field, and
+        either date bound may be left open. With occurrences, matching
+        recurring occurrences are included too, from today on if start is
+        open and for UPCOMING_DAYS if end is.
+        """
+        def matching(df):
+            candidates = None
+            if start is not None or end is not None:
+                candidates = self.date_index.query(mode, start or "0001-01-01", end or "9999-12-31")
+            if candidates is None and not (text or "").strip() and not status and min_cost is None and max_cost is None:
+                return df
+            ids = self.search_index.search(text, status, min_cost, max_cost, cost_field, candidates)
+            return df.loc[ids]
+
+        df = self.store.read(matching)[1]
+        archived = self.archive.select(start, end, mode, min_cost, max_cost, cost_field)
+        if archived is not None and len(archived):
+            mask = text_mask(archived, text)
+            if status:
+                mask &= (archived["Status"] == status).to_numpy()
+            df = self._with_archived(df, archived[mask])
+        if occurrences and status != "Done":
+            first = query_date(start) if start is not None else date.today()
+            last = query_date(end) if end is not None else first + timedelta(days=UPCOMING_DAYS)
+            pending = self.occurrences(first, last, mode)
+            mask = text_mask(pending, text)
+            if min_cost is not None:
+                mask &= (pending[cost_field] >= min_cost).to_numpy()
+            if max_cost is not None:
+                mask &= (pending[cost_field] <= max_cost).to_numpy()
+            if mask.any():
+                df = append_rows(pending[mask], df)
+        return df
+
+    def expenses(self, start, end, mode=CONTAINED):
+        """Return (tasks, actual Done cost, estimated Waiting cost) for a date range."""
+        filtered = self.store.tasks().loc[self.date_index.query(mode, start, end)]
+        if mode == CONTAINED:
+            total_actual, total_estimated, _ = self.aggregates.expense_totals(start, end)
+        else:
+            total_actual = filtered.loc[filtered["Status"] == "Done", "Actual Cost"].sum()
+            total_estimated = filtered.loc[filtered["Status"] == "Waiting", "Estimated Cost"].sum()
+        archived = self.archive.select(start, end, mode)
+        if archived is not None and len(archived):
+            total_actual += archived.loc[archived["Status"] == "Done", "Actual Cost"].sum()
+            total_estimated += archived.loc[archived["Status"] == "Waiting", "Estimated Cost"].sum()
+            filtered = self._with_archived(filtered, archived)
+        # Pending occurrences are all Waiting
+        occurrences = self.occurrences(start, end, mode)
+        if len(occurrences):
+            total_estimated += occurrences["Estimated Cost"].sum()
+            filtered = append_rows(occurrences, filtered)
+        return filtered, total_actual, total_estimated
+
+    def statistics(self):
+        """Return summary numbers and series for all tasks, archived seasons included."""
+        self.store.tasks()
+        # Archived seasons count through their manifest totals; no partition is read
+        return self.aggregates.statistics(self.archive.list())
+
+    def forecast(self, start=None, end=None, df=None):
+        """Return cost variance, overrun ratios and the projected cash flow (see forecast.py).
+
+        Ratios come from all tasks (or df), archived seasons included. The
+        cash flow covers [start, end], by default today and the next
+        UPCOMING_DAYS, and includes the recurring occurrences in it.
+        """
+        first = query_date(start) if start else date.today()
+        last = query_date(end) if end else first + timedelta(days=UPCOMING_DAYS)
+        if last < first:
+            raise TaskValidationError("Bitiş tarihi başlangıç tarihinden önce olamaz!")
+        df = self.all_tasks() if df is None else df
+        return build_forecast(df, self.occurrences(first, last), first, last)
+
+    def export_tasks(self, file_path, df=None, progress=None):
+        """Export tasks to xlsx (with "Özet" and forecast sheets), CSV or Parquet."""
+        df = self.all_tasks() if df is None else df
+        sheets = None
+        if Path(file_path).suffix.lower() == ".xlsx":
+            sheets = export_sheets(self.forecast(df=df))
+        # Version is bookkeeping for concurrent edits, not part of the report
+        export_tasks(df[["ID"] + FIELD_COLUMNS], file_path, progress=progress, sheets=sheets)
+        return file_path
+
+    def seasons(self):
+        """Return one dict per season with tasks: its bounds, task counts and whether it is archived."""
+        start_month = self.archive.start_month
+        seasons = {}
+        for entry in self.archive.list():
+            seasons[entry["season"]] = {"tasks": entry["rows"], "waiting": entry["statuses"].get("Waiting", 0),
+                                        "archived": True}
+        df = self.store.tasks()
+        values = pd.Series(task_seasons(df, start_month), index=df.index).dropna().astype("int64")
+        waiting = values[df.loc[values.index, "Status"] == "Waiting"].value_counts()
+        for season, count in values.value_counts().items():
+            seasons[int(season)] = {"tasks": int(count), "waiting": int(waiting.get(season, 0)), "archived": False}
+        today = date.today()
+        result = []
+        for season in sorted(seasons):
+            first, last = season_bounds(season, start_month)
+            result.append(dict(seasons[season], season=season, label=season_label(season, start_month),
+                               first=first, last=last, closed=last < today))
+        return result
+
+    def freeze_season(self, season):
+        """Move a closed season's tasks into a read-only archive partition; return their number.
+
+        Only seasons that are over and have no Waiting tasks can be
+        archived. Archived tasks stay in statistics, date-range queries,
+        search and exports, but can no longer be changed.
+        """
+        start_month = self.archive.start_month
+        label = season_label(season, start_month)
+        if self.archive.frozen(season):
+            raise FrozenSeasonError(f"{label} sezonu zaten arşivlenmiş.")
+        if season_bounds(season, start_month)[1] >= date.today():
+            raise FrozenSeasonError(f"{label} sezonu henüz bitmedi; yalnızca kapanmış sezonlar arşivlenebilir.")
+
+        def freeze(df):
+            # Store lock, then the backend's: no other process can add to the season meanwhile
+            with self.storage.locked():
+                df = self.store.tasks()
+                rows = df[task_seasons(df, start_month) == season]
+                if not len(rows):
+                    raise FrozenSeasonError(f"{label} sezonunda görev yok.")
+                waiting = int((rows["Status"] == "Waiting").sum())
+                if waiting:
+                    raise FrozenSeasonError(
+                        f"{label} sezonunda {waiting} bekleyen görev var; önce tamamlayın veya silin.")
+                self.archive.freeze(season, rows)
+                self.store.delete_many(rows["ID"].tolist())
+                self.archive.complete(season)
+                return len(rows)
+        return self.store.read(freeze)[1]
+
+    def _complete_freezes(self):
+        """Finish archiving a season interrupted after its partition was written."""
+        for entry in self.archive.list():
+            if not entry["complete"]:
+                self.store.delete_many(self.archive.archived_ids(entry["season"]))
+                self.archive.complete(entry["season"])
+
+    def close(self):
+        self.storage.close()
@@ -0,0 +1,182 @@
+import threading
+from bisect import bisect_left, bisect_right, insort
+
+import numpy as np
+import pandas as pd
+
+from aggregates import parse_date, query_date
+
+CONTAINED = "contained"
+OVERLAPPING = "overlapping"
+
+
+# Sorted runs are split once they grow past twice this length
+RUN_SIZE = 512
+
+
+class SortedRuns:
+    """Sorted (start, ID) pairs kept in runs of about RUN_SIZE.
+
+    An insert or delete shifts one run instead of the whole sequence, and
+    a range is found by bisecting the runs' last items, then one run.
+    """
+
+    def __init__(self, items=()):
+        items = list(items)
+        self.runs = [items[i:i + RUN_SIZE] for i in range(0, len(items), RUN_SIZE)]
+        self.maxes = [run[-1] for run in self.runs]
+
+    def __len__(self):
+        return sum(map(len, self.runs))
+
+    def add(self, item):
+        if not self.runs:
+            self.runs, self.maxes = [[item]], [item]
+            return
+        pos = min(bisect_left(self.maxes, item), len(self.runs) - 1)
+        run = self.runs[pos]
+        insort(run, item)
+        self.maxes[pos] = run[-1]
+        if len(run) > 2 * RUN_SIZE:
+            self.runs[pos:pos + 1] = [run[:RUN_SIZE], run[RUN_SIZE:]]
+            self.maxes[pos:pos + 1] = [run[RUN_SIZE - 1], run[-1]]
+
+    def remove(self, item):
+        pos = bisect_left(self.maxes, item)
+        run = self.runs[pos]
+        del run[bisect_left(run, item)]
+        if run:
+            self.maxes[pos] = run[-1]
+        else:
+            del self.runs[pos]
+            del self.maxes[pos]
+
+    def starting_between(self, first, last):
+        """Yield the pairs whose start lies in [first, last], in order."""
+        low = (first, -1)
+        pos = bisect_left(self.maxes, low)
+        index = bisect_left(self.runs[pos], low) if pos < len(self.runs) else 0
+        while pos < len(self.runs):
+            run = self.runs[pos]
+            for i in range(index, len(run)):
+                if run[i][0] > last:
+                    return
+                yield run[i]
+            pos, index = pos + 1, 0
+
+
+def span_class(span):
+    """Class of a span in days: 0 for single-day tasks, else its bit length (1, 2-3, 4-7, ...)."""
+    return max(0, span).bit_length()
+
+
+class DateIndex:
+    """Store listener indexing task date ranges for fast range queries.
+
+    Tasks are grouped by span class (see span_class) and kept sorted by
+    start date within each class. A task of class c lasts under 2**c days,
+    so every task of that class overlapping [a, b] starts within
+    [a - 2**c + 1, b]; a query bisects each class and scans that slice.
+    The only tasks scanned without matching are those that ended less
+    than 2**c days before a, so a few season-long tasks add a class of
+    their own instead of widening the scan for all the short ones. With
+    c classes (12 cover spans up to ten years), a query costs
+    O(c log n + k) plus those near misses.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset(None)
+
+    def reset(self, df):
+        with self._lock:
+            self.by_class = {}
+            self.ranges = {}
+            if df is not None and len(df):
+                self._load(df)
+
+    def _load(self, df):
+        """Index a whole frame at once; same result as _add for every row."""
+        start = pd.to_datetime(df["Start Date"], errors="coerce")
+        end = pd.to_datetime(df["End Date"], errors="coerce")
+        dated = (start.notna() & end.notna()).to_numpy()
+        ids = df["ID"].to_numpy()[dated]
+        # Day ordinals as date.toordinal() gives them
+        epoch = pd.Timestamp("1970-01-01").toordinal()
+        starts = start[dated].to_numpy().astype("datetime64[D]").astype("int64") + epoch
+        ends = end[dated].to_numpy().astype("datetime64[D]").astype("int64") + epoch
+        # frexp's exponent of a positive integer is its bit length
+        classes = np.frexp(np.maximum(0, ends - starts).astype(float))[1]
+        order = np.lexsort((ids, starts))
+        for span in np.unique(classes).tolist():
+            rows = order[classes[order] == span]
+            self.by_class[span] = SortedRuns(zip(starts[rows].tolist(), ids[rows].tolist()))
+        self.ranges = dict(zip(ids.tolist(), zip(starts.tolist(), ends.tolist())))
+
+    def inserted(self, task):
+        with self._lock:
+            self._add(task)
+
+    def updated(self, old, new):
+        with self._lock:
+            self._remove(old)
+            self._add(new)
+
+    def deleted(self, task):
+        with self._lock:
+            self._remove(task)
+
+    def _add(self, task):
+        start = parse_date(task["Start Date"])
+        end = parse_date(task["End Date"])
+        if start is None or end is None:
+            return
+        task_id = int(task["ID"])
+        start, end = start.toordinal(), end.toordinal()
+        self.by_class.setdefault(span_class(end - start), SortedRuns()).add((start, task_id))
+        self.ranges[task_id] = (start, end)
+
+    def _remove(self, task):
+        task_id = int(task["ID"])
+        if task_id not in self.ranges:
+            return
+        start, end = self.ranges.pop(task_id)
+        span = span_class(end - start)
+        self.by_class[span].remove((start, task_id))
+        if not self.by_class[span].runs:
+            del self.by_class[span]
+
+    def contained(self, start, end):
+        """IDs of tasks starting on/after start and ending on/before end."""
+        start, end = query_date(start).toordinal(), query_date(end).toordinal()
+        with self._lock:
+            return sorted(
+                task_id
+                for span, runs in self.by_class.items()
+                # Tasks of this class last at least 2**(span - 1) days
+                for _, task_id in runs.starting_between(start, end - (1 << span >> 1))
+                if self.ranges[task_id][1] <= end
+            )
+
+    def overlapping(self, start, end):
+        """IDs of tasks that are active on at least one day of [start, end]."""
+        start, end = query_date(start).toordinal(), query_date(end).toordinal()
+        with self._lock:
+            return sorted(
+                task_id
+                for span, runs in self.by_class.items()
+                for _, task_id in runs.starting_between(start - (1 << span) + 1, end)
+                if self.ranges[task_id][1] >= start
+            )
+
+    def active_on(self, day):
+        """IDs of tasks whose date range includes day."""
+        return self.overlapping(day, day)
+
+    def query(self, mode, start, end):
+        """Run a contained or overlapping query by name."""
+        if mode == CONTAINED:
+            return self.contained(start, end)
+        if mode == OVERLAPPING:
+            return self.overlapping(start, end)
+        raise ValueError(f"Bilinmeyen sorgu türü: {mode}")
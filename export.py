@@ -0,0 +1,145 @@
+"""Chunked task export to xlsx, CSV or Parquet.
+
+Tasks are converted and written CHUNK_SIZE rows at a time, so the writer
+never holds more than one slice of cells: xlsx goes through openpyxl's
+write-only mode, which streams each sheet to disk as rows are appended.
+The "Özet" totals are accumulated from the same slices. Output is written
+to a temporary file that replaces the target only once the export is
+complete.
+"""
+import os
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from storage import fsync_file
+from instrumentation import timed
+
+CHUNK_SIZE = 5000
+FORMATS = (".xlsx", ".csv", ".parquet")
+
+
+class ExportSummary:
+    """Totals for the "Özet" sheet, accumulated chunk by chunk."""
+
+    def __init__(self):
+        self.total = 0
+        self.done = 0
+        self.waiting = 0
+        self.actual = 0.0
+        self.estimated = 0.0
+
+    def add(self, chunk):
+        done = chunk["Status"] == "Done"
+        waiting = chunk["Status"] == "Waiting"
+        self.total += len(chunk)
+        self.done += int(done.sum())
+        self.waiting += int(waiting.sum())
+        self.actual += float(chunk.loc[done, "Actual Cost"].sum())
+        self.estimated += float(chunk.loc[waiting, "Estimated Cost"].sum())
+
+    def as_dict(self):
+        return {
+            "Toplam Görev Sayısı": self.total,
+            "Tamamlanan Görev Sayısı": self.done,
+            "Bekleyen Görev Sayısı": self.waiting,
+            "Toplam Gerçekleşen Maliyet": self.actual,
+            "Toplam Beklenen Maliyet": self.estimated,
+            "Rapor Tarihi": datetime.now().strftime("%Y-%m-%d"),
+        }
+
+
+def iter_chunks(df, chunksize=CHUNK_SIZE):
+    """Yield consecutive row slices of df."""
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start:start + chunksize]
+
+
+def cell_rows(chunk):
+    """Convert a typed chunk to tuples of plain Python cell values."""
+    columns = []
+    for col in chunk.columns:
+        values = chunk[col]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            # date objects get openpyxl's yyyy-mm-dd number format
+            values = values.dt.date
+        values = values.astype(object)
+        columns.append(values.where(values.notna(), None))
+    return zip(*columns)
+
+
+def _write_xlsx(path, df, summary, chunksize, progress, sheets):
+    from openpyxl import Workbook
+    workbook = Workbook(write_only=True)
+    tasks_sheet = workbook.create_sheet("Tüm Görevler")
+    summary_sheet = workbook.create_sheet("Özet")
+    tasks_sheet.append(list(df.columns))
+    for chunk in iter_chunks(df, chunksize):
+        summary.add(chunk)
+        for row in cell_rows(chunk):
+            tasks_sheet.append(row)
+        progress(summary.total)
+    totals = summary.as_dict()
+    summary_sheet.append(list(totals))
+    summary_sheet.append(list(totals.values()))
+    for name, table in sheets.items():
+        sheet = workbook.create_sheet(name)
+        sheet.append(list(table.columns))
+        for row in cell_rows(table):
+            sheet.append(row)
+    workbook.save(path)
+
+
+def _write_csv(path, df, summary, chunksize, progress, sheets):
+    # utf-8-sig so that Excel shows the Turkish characters correctly
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        for i, chunk in enumerate(iter_chunks(df, chunksize)):
+            summary.add(chunk)
+            chunk.to_csv(f, header=i == 0, index=False, date_format="%Y-%m-%d")
+            progress(summary.total)
+        if not len(df):
+            df.to_csv(f, index=False)
+
+
+def _write_parquet(path, df, summary, chunksize, progress, sheets):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Parquet dışa aktarımı için pyarrow paketi gerekli.") from None
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in iter_chunks(df, chunksize):
+            summary.add(chunk)
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            progress(summary.total)
+
+
+WRITERS = {".xlsx": _write_xlsx, ".csv": _write_csv, ".parquet": _write_parquet}
+
+
+@timed("export")
+def export_tasks(df, file_path, chunksize=CHUNK_SIZE, progress=None, sheets=None):
+    """Write df to file_path in the format given by its extension.
+
+    progress, if given, is called as progress(rows written, total rows)
+    after each chunk. sheets maps further sheet names to small frames
+    written after "Özet". Returns the "Özet" totals as a dict; only the
+    xlsx format stores them, and the further sheets, in the file.
+    """
+    path = Path(file_path)
+    writer = WRITERS.get(path.suffix.lower())
+    if writer is None:
+        raise ValueError(f"Desteklenmeyen dosya türü: {path.suffix} ({', '.join(FORMATS)} kullanın)")
+    summary = ExportSummary()
+    report = (lambda rows: progress(rows, len(df))) if progress is not None else (lambda rows: None)
+    tmp = path.with_name(f"{path.stem}.tmp{path.suffix}")
+    try:
+        writer(tmp, df, summary, chunksize, report, sheets or {})
+        fsync_file(tmp)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return summary.as_dict()
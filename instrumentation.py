@@ -0,0 +1,223 @@
+"""In-process timing of user actions and hot paths.
+
+Code paths are wrapped in metrics.timed(name), as a context manager or a
+decorator; names are dotted, e.g. "load.backend" or "action.add_task".
+Each name keeps a rolling window of its latest samples, from which
+percentiles and a latency histogram are computed on demand, so memory
+stays bounded however long the application runs.
+
+With profiling switched on, an outermost timed block also runs under
+cProfile and the results are merged into one pstats.Stats. Only one
+block is profiled at a time (Python 3.12+ allows a single active
+profiler per process); blocks starting meanwhile on other threads, or
+while another profiling tool is active, are only timed.
+"""
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+
+# Samples kept per name
+WINDOW = 1000
+# Upper bounds (ms) of the histogram buckets; the last bucket is open-ended
+BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+class LatencyWindow:
+    """The latest WINDOW samples of one name plus lifetime count and total."""
+
+    def __init__(self, size=WINDOW):
+        self.samples = deque(maxlen=size)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+
+    def summary(self):
+        """Return counts, percentiles (ms) and bucket counts for the window."""
+        values = sorted(self.samples)
+        ms = [value * 1000 for value in values]
+        buckets = [0] * (len(BUCKETS_MS) + 1)
+        bound = 0
+        for value in ms:
+            while bound < len(BUCKETS_MS) and value > BUCKETS_MS[bound]:
+                bound += 1
+            buckets[bound] += 1
+        return {
+            "count": self.count,
+            "window": len(values),
+            "mean_ms": round(sum(ms) / len(ms), 3) if ms else 0.0,
+            "p50_ms": round(percentile(ms, 0.50), 3),
+            "p95_ms": round(percentile(ms, 0.95), 3),
+            "p99_ms": round(percentile(ms, 0.99), 3),
+            "max_ms": round(ms[-1], 3) if ms else 0.0,
+            "total_s": round(self.total, 6),
+            "histogram": dict(zip([f"<={bound}" for bound in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}"], buckets)),
+        }
+
+
+class Metrics:
+    """Thread-safe registry of latency windows with an optional profiler."""
+
+    def __init__(self, window=WINDOW):
+        self.window = window
+        self.started = datetime.now()
+        self.profiling = False
+        self._windows = {}
+        self._stats = None
+        self._profiler_busy = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def record(self, name, seconds):
+        with self._lock:
+            if name not in self._windows:
+                self._windows[name] = LatencyWindow(self.window)
+            self._windows[name].add(seconds)
+
+    def _start_profiler(self):
+        """Return an enabled profiler, or None if another one is already running."""
+        with self._lock:
+            if self._profiler_busy:
+                return None
+            self._profiler_busy = True
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiling tool (a debugger, an outside cProfile run) is active
+            with self._lock:
+                self._profiler_busy = False
+            return None
+        return profiler
+
+    @contextmanager
+    def _measure(self, name):
+        depth = getattr(self._local, "depth", 0)
+        profiler = None
+        if self.profiling and depth == 0:
+            profiler = self._start_profiler()
+        self._local.depth = depth + 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            self.record(name, time.perf_counter() - start)
+            self._local.depth = depth
+            if profiler is not None:
+                self._merge(profiler)
+
+    def timed(self, name):
+        """Time a block or, used as a decorator, every call of a function."""
+        return _Timed(self, name)
+
+    def _merge(self, profiler):
+        with self._lock:
+            self._profiler_busy = False
+            if self._stats is None:
+                self._stats = pstats.Stats(profiler)
+            else:
+                self._stats.add(profiler)
+
+    def set_profiling(self, enabled):
+        """Switch cProfile capture on or off; captured stats are kept until reset()."""
+        self.profiling = enabled
+
+    def profile_report(self, limit=30, sort="cumulative"):
+        """Return the top captured functions as text, or "" if nothing was profiled."""
+        with self._lock:
+            if self._stats is None:
+                return ""
+            out = io.StringIO()
+            self._stats.stream = out
+            self._stats.sort_stats(sort).print_stats(limit)
+            return out.getvalue()
+
+    def save_profile(self, file_path):
+        """Write the captured stats in pstats format (for snakeviz, pstats, ...)."""
+        with self._lock:
+            if self._stats is None:
+                raise ValueError("Kaydedilecek profil verisi yok; önce profil kaydını başlatın.")
+            self._stats.dump_stats(file_path)
+
+    def snapshot(self):
+        """Return the summaries of all names, sorted by name."""
+        with self._lock:
+            windows = dict(self._windows)
+            summaries = {name: window.summary() for name, window in sorted(windows.items())}
+        return {
+            "started": self.started.isoformat(timespec="seconds"),
+            "captured": datetime.now().isoformat(timespec="seconds"),
+            "pid": os.getpid(),
+            "profiling": self.profiling,
+            "metrics": summaries,
+        }
+
+    def dump(self, file_path):
+        """Write snapshot() as JSON, replacing the file only once it is complete."""
+        path = Path(file_path)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+
+    def reset(self):
+        """Forget all samples and captured profile data."""
+        with self._lock:
+            self._windows = {}
+            self._stats = None
+            self.started = datetime.now()
+
+
+class _Timed:
+    """Returned by Metrics.timed(): a reusable context manager and decorator."""
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+        self._active = threading.local()
+
+    def __enter__(self):
+        # A stack per thread, so one timed() object can be re-entered
+        if not hasattr(self._active, "stack"):
+            self._active.stack = []
+        context = self.metrics._measure(self.name)
+        context.__enter__()
+        self._active.stack.append(context)
+
+    def __exit__(self, *exc):
+        return self._active.stack.pop().__exit__(*exc)
+
+    def __call__(self, fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with self.metrics._measure(self.name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+
+# Shared by the whole process; FARMTASKS_PROFILE=1 starts with cProfile capture on
+metrics = Metrics()
+metrics.set_profiling(os.environ.get("FARMTASKS_PROFILE") == "1")
+timed = metrics.timed
@@ -0,0 +1,130 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, CancelledError
+
+from instrumentation import metrics
+
+
+class Job:
+    """A unit of background work whose callbacks run on the Tk thread."""
+
+    def __init__(self, on_done, on_error, busy_text, progress_text=None, action=None, cancellable=True):
+        self.future = None
+        self.action = action
+        self.cancellable = cancellable
+        self.started = time.perf_counter()
+        self.on_done = on_done
+        self.on_error = on_error
+        self.busy_text = busy_text
+        self.progress_text = progress_text
+        self.cancelled = False
+
+    def report(self, *values):
+        """Progress callback for the worker; stops the work once the job is cancelled."""
+        if self.cancelled:
+            raise CancelledError()
+        self.busy_text = self.progress_text.format(*values)
+
+    def cancel(self):
+        """Cancel the job; if it already started, its result is discarded."""
+        self.cancelled = True
+        self.future.cancel()
+
+
+class JobRunner:
+    """Runs blocking work on a thread pool and polls for results with root.after.
+
+    Only the worker function runs off the main thread; on_done/on_error are
+    always called from the Tk mainloop, so they may touch widgets freely.
+    Jobs submitted with an action name are timed from submit() until their
+    result reaches the Tk thread and recorded as "action.<name>"; the worker
+    part alone is recorded as "job.<name>". Callbacks are left out because
+    they usually end in a modal message box.
+    """
+
+    def __init__(self, root, status_label, max_workers=2, poll_ms=50):
+        self.root = root
+        self.status_label = status_label
+        self.poll_ms = poll_ms
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="farm-job")
+        self.jobs = []
+        self._polling = False
+        self._idle_text = None
+
+    def submit(self, fn, *args, on_done=None, on_error=None, busy_text="İşlem sürüyor...",
+               progress_text=None, action=None, cancellable=True, **kwargs):
+        """Run fn(*args, **kwargs) in the pool and return its Job.
+
+        With progress_text, fn also gets a progress=job.report keyword; the
+        values it reports are formatted into progress_text and shown as the
+        busy text. Jobs that write to the store pass cancellable=False:
+        cancel_all() leaves them alone, so their on_done still updates the
+        view. Without on_error, errors are shown in the status label.
+        """
+        if not self.jobs:
+            self._idle_text = self.status_label.cget("text")
+        job = Job(on_done, on_error, busy_text, progress_text, action, cancellable)
+        if progress_text is not None:
+            kwargs["progress"] = job.report
+        if action:
+            fn = metrics.timed(f"job.{action}")(fn)
+        job.future = self.executor.submit(fn, *args, **kwargs)
+        self.jobs.append(job)
+        self._show_busy()
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_ms, self._poll)
+        return job
+
+    def busy(self):
+        return any(not job.cancelled for job in self.jobs)
+
+    def cancel_all(self):
+        """Cancel every pending read or render job; writes run to completion."""
+        cancelled = [job for job in self.jobs if job.cancellable and not job.cancelled]
+        for job in cancelled:
+            job.cancel()
+        if cancelled:
+            self.status_label.configure(text="İşlem iptal edildi.")
+
+    def _show_busy(self):
+        active = [job for job in self.jobs if not job.cancelled]
+        if active:
+            self.status_label.configure(text=f"⏳ {active[-1].busy_text}")
+            self.root.configure(cursor="watch")
+        else:
+            self.root.configure(cursor="")
+
+    def _poll(self):
+        finished = [job for job in self.jobs if job.future.done()]
+        for job in finished:
+            self.jobs.remove(job)
+        if not self.jobs:
+            self.root.configure(cursor="")
+            if self.status_label.cget("text").startswith("⏳"):
+                self.status_label.configure(text=self._idle_text or "Hazır")
+
+        for job in finished:
+            if job.cancelled:
+                continue
+            if job.action:
+                metrics.record(f"action.{job.action}", time.perf_counter() - job.started)
+            error = job.future.exception()
+            if error is not None:
+                if job.on_error:
+                    job.on_error(error)
+                else:
+                    self.status_label.configure(text=f"Hata: {error}")
+            elif job.on_done:
+                job.on_done(job.future.result())
+
+        if self.jobs:
+            self._show_busy()
+            self.root.after(self.poll_ms, self._poll)
+        else:
+            self._polling = False
+
+    def shutdown(self):
+        """Cancel queued work and stop the pool without waiting."""
+        for job in self.jobs:
+            job.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
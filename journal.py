@@ -0,0 +1,301 @@
+import json
+import os
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from locking import FileLock
+from storage import StorageBackend, TASK_COLUMNS, FIELD_COLUMNS, ConflictError, next_task_id, with_versions
+
+# Journal size (bytes) after which it is folded into the snapshot
+COMPACT_THRESHOLD = 1024 * 1024
+
+
+class JournaledBackend(StorageBackend):
+    """Puts an append-only JSON Lines journal in front of a snapshot backend.
+
+    Every mutation is a single fsynced line in the journal; the snapshot
+    (usually the Excel workbook) is only rewritten by a background
+    compaction once the journal grows past compact_threshold. Each record
+    carries a sequence number and the snapshot remembers the last one it
+    contains, so replaying after a crash at any point is safe.
+
+    Several processes may share the files. Reads and writes hold an
+    advisory file lock and first apply whatever other processes appended
+    since (reloading everything once another process has compacted), so
+    sequence numbers and IDs stay unique. A second lock file lets only one
+    process compact at a time.
+    """
+
+    def __init__(self, snapshot, journal_path, compact_threshold=COMPACT_THRESHOLD):
+        self.snapshot = snapshot
+        self.path = Path(journal_path)
+        self.rotated_path = self.path.with_name(self.path.name + ".1")
+        self.compact_threshold = compact_threshold
+        # The snapshot's tasks as loaded (indexed by ID), plus the tasks the
+        # journal changed since as an overlay of dicts, and the snapshot
+        # tasks it deleted. Only replayed records cost Python objects.
+        self.base = pd.DataFrame(columns=TASK_COLUMNS)
+        self.tasks = {}
+        self.deleted = set()
+        self.seq = 0
+        self.next_id = 1
+        self.lock = FileLock(self.path.with_name(self.path.name + ".lock"))
+        # Not reentrant: it is taken on the writing thread and released by the compactor
+        self._compaction_lock = FileLock(self.path.with_name(self.path.name + ".compact.lock"), reentrant=False)
+        # (inode, bytes consumed) of the live journal, None if it didn't exist
+        self._position = None
+        self._snapshot_signature = None
+        self._compactor = None
+        self._lock = threading.RLock()
+
+    def files(self):
+        return self.snapshot.files() + [self.path, self.rotated_path]
+
+    def locked(self):
+        return self.lock
+
+    def setup(self):
+        with self.lock, self._lock:
+            self.snapshot.setup()
+            self._reload()
+            self._maybe_compact()
+
+    def _reload(self):
+        """Rebuild the tasks from the snapshot plus the rotated and live journals."""
+        while True:
+            signature = self.snapshot.signature()
+            df = with_versions(self.snapshot.load())
+            self._set_base(df)
+            self.seq = int(self.snapshot.get_meta("journal_seq", 0))
+            self.next_id = next_task_id(df, self.snapshot.get_meta("next_id"))
+            self._replay(self.rotated_path)
+            self._position = self._replay(self.path)
+            # Another process may have finished a compaction while we read
+            if self.snapshot.signature() == signature:
+                self._snapshot_signature = signature
+                return
+
+    def _set_base(self, df):
+        self.base = df.set_axis(pd.Index(df["ID"].to_numpy(), dtype="int64"), axis=0)
+        self.tasks = {}
+        self.deleted = set()
+
+    def _has(self, task_id):
+        return task_id in self.tasks or (task_id not in self.deleted and task_id in self.base.index)
+
+    def _version(self, task_id):
+        """Version of an existing task, 0 for tasks written before versioning."""
+        if task_id in self.tasks:
+            return int(self.tasks[task_id].get("Version", 0))
+        return int(self.base.at[task_id, "Version"])
+
+    def _delete(self, task_id):
+        self.tasks.pop(task_id, None)
+        if task_id in self.base.index:
+            self.deleted.add(task_id)
+
+    def _catch_up(self):
+        """Apply the records other processes appended since we last looked."""
+        if self.snapshot.signature() != self._snapshot_signature:
+            self._reload()
+            return
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            if self._position is not None:
+                self._reload()
+            return
+        if self._position is None:
+            self._position = self._replay(self.path)
+        elif stat.st_ino != self._position[0]:
+            # Rotated by another process
+            self._reload()
+        elif stat.st_size != self._position[1]:
+            self._position = self._replay(self.path, self._position[1])
+
+    def _replay(self, path, offset=0):
+        """Apply the records of a journal file that we lack.
+
+        Returns (inode, end of the last complete record), or None when the
+        file doesn't exist. Only called with the file lock held, so a torn
+        record can only be left by a crash and is cut off.
+        """
+        if not path.exists():
+            return None
+        good_bytes = offset
+        with open(path, "rb") as f:
+            inode = os.fstat(f.fileno()).st_ino
+            f.seek(offset)
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b"\n"):
+                    break
+                good_bytes += len(line)
+                if record["seq"] > self.seq:
+                    self._apply(record)
+                    self.seq = record["seq"]
+        if good_bytes < path.stat().st_size:
+            # Drop a record torn by a crash mid-append
+            with open(path, "rb+") as f:
+                f.truncate(good_bytes)
+        return inode, good_bytes
+
+    def _apply(self, record):
+        op = record["op"]
+        if op == "insert":
+            self.tasks[record["id"]] = dict({"Version": 1}, **record["task"], ID=record["id"])
+            self.next_id = max(self.next_id, record["id"] + 1)
+        elif op == "insert_batch":
+            # One record for the whole batch: it is either replayed entirely or not at all
+            for offset, task in enumerate(record["tasks"]):
+                self.tasks[record["id"] + offset] = dict({"Version": 1}, **task, ID=record["id"] + offset)
+            self.next_id = max(self.next_id, record["id"] + len(record["tasks"]))
+        elif op == "update":
+            # Records written before versioning carry no Version
+            previous = self._version(record["id"]) if self._has(record["id"]) else 0
+            self.tasks[record["id"]] = dict({"Version": previous + 1}, **record["task"], ID=record["id"])
+        elif op == "delete":
+            self._delete(record["id"])
+        elif op == "delete_batch":
+            for task_id in record["ids"]:
+                self._delete(task_id)
+
+    def _append(self, record):
+        with self._lock:
+            record["seq"] = self.seq + 1
+            with open(self.path, "ab") as f:
+                f.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+                self._position = (os.fstat(f.fileno()).st_ino, f.tell())
+            self._apply(record)
+            self.seq = record["seq"]
+            self._maybe_compact()
+
+    def _frame(self):
+        """The snapshot tasks the journal didn't touch, followed by the overlay."""
+        base = self.base
+        if self.tasks or self.deleted:
+            base = base[~base.index.isin(self.deleted.union(self.tasks))]
+        base = base.reset_index(drop=True)
+        if not self.tasks:
+            return base
+        overlay = pd.DataFrame(list(self.tasks.values()), columns=TASK_COLUMNS)
+        return pd.concat([base, overlay], ignore_index=True) if len(base) else overlay
+
+    def load(self):
+        with self.lock, self._lock:
+            self._catch_up()
+            return self._frame()
+
+    def insert(self, task):
+        return self.insert_batch([task])[0]
+
+    def insert_batch(self, tasks):
+        with self.lock, self._lock:
+            self._catch_up()
+            first_id = self.next_id
+            self._append({
+                "op": "insert_batch", "id": first_id,
+                "tasks": [{col: task[col] for col in FIELD_COLUMNS} for task in tasks],
+            })
+            return list(range(first_id, first_id + len(tasks)))
+
+    def update(self, task_id, task, expected_version=None):
+        with self.lock, self._lock:
+            self._catch_up()
+            if not self._has(task_id):
+                raise KeyError(f"Görev bulunamadı: {task_id}")
+            version = self._version(task_id)
+            if expected_version is not None and version != expected_version:
+                raise ConflictError(task_id, expected_version, version)
+            fields = {col: task[col] for col in FIELD_COLUMNS}
+            self._append({"op": "update", "id": task_id, "task": dict(fields, Version=version + 1)})
+            return version + 1
+
+    def delete(self, task_id):
+        with self.lock, self._lock:
+            self._catch_up()
+            if self._has(task_id):
+                self._append({"op": "delete", "id": task_id})
+
+    def delete_many(self, task_ids):
+        with self.lock, self._lock:
+            self._catch_up()
+            task_ids = [int(task_id) for task_id in task_ids if self._has(int(task_id))]
+            if task_ids:
+                self._append({"op": "delete_batch", "ids": task_ids})
+
+    def replace_all(self, df, meta=None):
+        # The compaction thread takes self._lock to finish, so wait for it first;
+        # holding self.lock keeps another one from starting meanwhile
+        with self.lock:
+            self.wait_for_compaction()
+        with self.lock, self._lock:
+            self._compaction_lock.acquire()
+            try:
+                df = with_versions(df[[col for col in TASK_COLUMNS if col in df.columns]].copy())
+                self._set_base(df)
+                self.next_id = next_task_id(df, self.next_id)
+                self._rotate()
+                self._compact(df, self.seq, dict(meta or {}))
+            finally:
+                self._compaction_lock.release()
+
+    def _maybe_compact(self):
+        if self._compactor is not None and self._compactor.is_alive():
+            return
+        leftover = self.rotated_path.exists()
+        if not leftover and (not self.path.exists() or self.path.stat().st_size < self.compact_threshold):
+            return
+        if not self._compaction_lock.try_acquire():
+            return
+        if self.rotated_path.exists():
+            # Left behind by a compaction that never finished; we hold all of
+            # its records in memory, so writing the snapshot completes it
+            pass
+        elif self.path.exists() and self.path.stat().st_size >= self.compact_threshold:
+            self._rotate()
+        else:
+            # Another process compacted while we checked
+            self._compaction_lock.release()
+            return
+        self._compactor = threading.Thread(
+            target=self._compact_in_background, args=(self._frame(), self.seq),
+            name="journal-compaction", daemon=True
+        )
+        self._compactor.start()
+
+    def _rotate(self):
+        """Move the live journal aside; the next append starts a new one."""
+        if self.path.exists():
+            os.replace(self.path, self.rotated_path)
+        self._position = None
+
+    def _compact(self, df, seq, meta=None):
+        """Write df as the new snapshot and drop the rotated journal."""
+        meta = dict(meta or {}, journal_seq=seq, next_id=self.next_id)
+        self.snapshot.replace_all(df, meta)
+        # Runs on the compaction thread too; _catch_up reads the signature under this lock
+        with self._lock:
+            # Our tasks already include everything in the new snapshot
+            self._snapshot_signature = self.snapshot.signature()
+            self.rotated_path.unlink(missing_ok=True)
+
+    def _compact_in_background(self, df, seq):
+        try:
+            self._compact(df, seq)
+        finally:
+            self._compaction_lock.release()
+
+    def wait_for_compaction(self):
+        if self._compactor is not None:
+            self._compactor.join()
+
+    def close(self):
+        self.wait_for_compaction()
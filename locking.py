@@ -0,0 +1,92 @@
+"""Advisory inter-process file locks (fcntl on POSIX, msvcrt on Windows)."""
+import os
+import threading
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+# Seconds a writer waits for another process before giving up
+LOCK_TIMEOUT = 10.0
+
+
+class LockTimeout(TimeoutError):
+    """Raised when another process holds a lock for longer than the timeout."""
+
+
+class FileLock:
+    """Exclusive advisory lock on a lock file, shared by all processes using it.
+
+    Reentrant within a process by default, so nested write paths can each
+    take the lock. A non-reentrant lock may be released by a thread other
+    than the one that acquired it, for handing it to a background worker.
+    """
+
+    def __init__(self, path, timeout=LOCK_TIMEOUT, reentrant=True, poll_interval=0.05):
+        self.path = Path(path)
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._thread_lock = threading.RLock() if reentrant else threading.Lock()
+        self._depth = 0
+        self._fd = None
+
+    def acquire(self, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        if not self._thread_lock.acquire(timeout=timeout):
+            raise LockTimeout(f"Görev dosyası kilitli, daha sonra tekrar deneyin: {self.path}")
+        if self._depth == 0:
+            try:
+                self._fd = self._lock_file(timeout)
+            except BaseException:
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+
+    def try_acquire(self):
+        """Acquire without waiting; return whether the lock was taken."""
+        try:
+            self.acquire(timeout=0)
+        except LockTimeout:
+            return False
+        return True
+
+    def _lock_file(self, timeout):
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                return fd
+            except OSError:
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    raise LockTimeout(f"Görev dosyası başka bir kullanıcı tarafından kilitli: {self.path}") from None
+                time.sleep(self.poll_interval)
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0:
+            fd, self._fd = self._fd, None
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                else:
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+            finally:
+                os.close(fd)
+        self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
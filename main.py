@@ -5,15 +5,24 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from tkcalendar import Calendar
 from datetime import datetime
-import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import matplotlib.dates as mdates
-from matplotlib.figure import Figure
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 from ttkbootstrap.tooltip import ToolTip
 import re
-
+from core import FarmTasks, TaskValidationError, ConflictError, build_task, validate_date, validate_cost
+from bulk_import import read_tasks, format_errors
+from table_view import VirtualTable
+from jobs import JobRunner
+from charts import FigureCache, build_calendar_figure, build_statistics_figure, save_figure
+from forecast import top_overruns
+from date_index import CONTAINED, OVERLAPPING
+from schema import format_date
+from instrumentation import metrics, timed
+
+# Pause in typing (ms) after which the search bar runs its query
+SEARCH_DELAY_MS = 250
+RECURRENCE_UNITS = {"Tekrar yok": None, "Günlük": "day", "Haftalık": "week", "Aylık": "month"}
 class FarmTaskTracker:
     """A class to manage farm task tracking with a GUI interface."""
     
@@ -22,87 +31,95 @@ class FarmTaskTracker:
         self.data_dir = Path.home() / "FarmTasks"
         self.data_dir.mkdir(exist_ok=True)
         self.excel_file = self.data_dir / "farm_tasks.xlsx"
+        self.core = None
         self.selected_task_id = None
+        self.selected_version = None
+        self._loading_task_id = None
+        self.current_filter = None
+        self.current_search = None
+        self._search_after = None
+        self._search_generation = 0
         self.root = None
+        self.jobs = None
+        self.figures = FigureCache()
         self.setup_excel_file()
         self.setup_gui()
 
     def setup_excel_file(self):
-        """Create the Excel file if it doesn't exist."""
+        """Open the task database, importing the legacy Excel file on first run."""
         try:
-            if not self.excel_file.exists():
-                df = pd.DataFrame(columns=[
-                    "ID", "Job Name", "Description", "Start Date", "End Date",
-                    "Estimated Cost", "Actual Cost", "Status"
-                ])
-                df.to_excel(self.excel_file, index=False)
+            # FARMTASKS_ENGINE=excel keeps the workbook as a journaled snapshot
+            self.core = FarmTasks(self.data_dir, os.environ.get("FARMTASKS_ENGINE", "sqlite"))
         except Exception as e:
-            messagebox.showerror("Hata", f"Excel dosyası oluşturulamadı: {e}")
+            messagebox.showerror("Hata", f"Görev veritabanı açılamadı: {e}")
 
     def load_tasks(self):
-        """Load tasks from the Excel file."""
+        """Load tasks from the task database."""
         try:
-            return pd.read_excel(self.excel_file)
+            return self.core.tasks()
         except Exception as e:
-            messagebox.showerror("Hata", f"Excel dosyası yüklenemedi: {e}")
+            messagebox.showerror("Hata", f"Görevler yüklenemedi: {e}")
             return pd.DataFrame()
 
-    def validate_date(self, date_str):
-        """Validate date format (YYYY-MM-DD)."""
-        try:
-            datetime.strptime(date_str, '%Y-%m-%d')
-            return True
-        except ValueError:
-            return False
-
-    def validate_cost(self, cost_str):
-        """Validate cost input (numeric and non-negative)."""
-        try:
-            return float(cost_str) >= 0
-        except (ValueError, TypeError):
-            return False
-
     def add_task(self):
         """Add a new task to the Excel file."""
         try:
-            name = self.entry_name.get().strip()
-            desc = self.entry_desc.get().strip()
-            start_date = self.entry_start.get().strip()
-            end_date = self.entry_end.get().strip()
-            estimated_cost = self.entry_estimated.get().strip()
-            actual_cost = self.entry_actual.get().strip()
-            status = "Done" if self.check_status.get() else "Waiting"
-
-            # Input validation
-            if not name:
-                messagebox.showerror("Hata", "Görev adı boş olamaz!")
-                return
-            if not (self.validate_date(start_date) and self.validate_date(end_date)):
-                messagebox.showerror("Hata", "Tarih formatı YYYY-MM-DD olmalı!")
-                return
-            if not self.validate_cost(estimated_cost):
-                messagebox.showerror("Hata", "Tahmini maliyet geçerli bir sayı olmalı!")
-                return
-            if status == "Done" and not self.validate_cost(actual_cost):
-                messagebox.showerror("Hata", "Gerçekleşen maliyet geçerli bir sayı olmalı!")
-                return
+            task = build_task(
+                self.entry_name.get(),
+                self.entry_desc.get(),
+                self.entry_start.get().strip(),
+                self.entry_end.get().strip(),
+                self.entry_estimated.get().strip(),
+                self.entry_actual.get().strip(),
+                self.check_status.get()
+            )
 
-            estimated_cost = float(estimated_cost)
-            actual_cost = float(actual_cost) if status == "Done" else 0
+            unit = RECURRENCE_UNITS[self.recur_unit.get()]
+            if unit is not None:
+                self.add_recurring_task(task, unit)
+                return
 
-            df = self.load_tasks()
-            new_id = len(df) + 1
-            new_task = pd.DataFrame([[new_id, name, desc, start_date, end_date,
-                                    estimated_cost, actual_cost, status]], columns=df.columns)
-            df = pd.concat([df, new_task], ignore_index=True)
-            df.to_excel(self.excel_file, index=False)
-            messagebox.showinfo("Başarılı", "Görev başarıyla eklendi!")
-            self.clear_entries()
-            self.show_tasks()
-            self.status_label.configure(text="Görev eklendi.")
+            def on_saved(new_id):
+                messagebox.showinfo("Başarılı", "Görev başarıyla eklendi!")
+                self.clear_entries()
+                self.refresh_row(new_id)
+                self.status_label.configure(text="Görev eklendi.")
+
+            self.jobs.submit(
+                self.core.add, task,
+                on_done=on_saved,
+                on_error=lambda e: messagebox.showerror("Hata", f"Bir hata oluştu: {e}"),
+                busy_text="Görev kaydediliyor...",
+                action="add_task",
+                cancellable=False
+            )
+        except TaskValidationError as e:
+            messagebox.showerror("Hata", str(e))
         except Exception as e:
             messagebox.showerror("Hata", f"Bir hata oluştu: {e}")
 
+    def add_recurring_task(self, task, unit):
+        """Save task as the first occurrence of a recurring rule set in the form."""
+        every = self.recur_every.get().strip()
+        if not every.isdigit() or int(every) < 1:
+            raise TaskValidationError("Tekrar aralığı pozitif bir tam sayı olmalı!")
+        until = self.entry_recur_until.get().strip() or None
+
+        def on_saved(rule_id):
+            messagebox.showinfo("Başarılı", "Tekrarlayan görev eklendi!")
+            self.clear_entries()
+            self.reload_table()
+            self.status_label.configure(text="Tekrarlayan görev eklendi.")
+
+        self.jobs.submit(
+            self.core.add_recurring, task, int(every), unit, until,
+            on_done=on_saved,
+            on_error=lambda e: messagebox.showerror("Hata", f"Bir hata oluştu: {e}"),
+            busy_text="Tekrarlayan görev kaydediliyor...",
+            action="add_recurring",
+            cancellable=False
+        )
+
     def clear_entries(self):
         """Clear all input fields."""
         self.entry_name.delete(0, tk.END)
@@ -112,6 +129,9 @@ class FarmTaskTracker:
         self.entry_estimated.delete(0, tk.END)
         self.entry_actual.delete(0, tk.END)
         self.check_status.set(0)
+        self.recur_unit.set("Tekrar yok")
+        self.recur_every.set("1")
+        self.entry_recur_until.delete(0, tk.END)
 
     def load_selected_task(self):
         """Load selected task into input fields."""
@@ -120,18 +140,43 @@ class FarmTaskTracker:
             messagebox.showwarning("Uyarı", "Lütfen düzenlemek için bir görev seçin.")
             return
 
-        values = self.table.item(selected, "values")
-        self.selected_task_id = int(values[0])
+        # Table items are keyed by task ID; the typed values are read from the store
+        task_id = int(selected[0])
+        self._loading_task_id = task_id
+
+        def on_loaded(task):
+            if self._loading_task_id != task_id:
+                # Another task was picked meanwhile
+                return
+            self._loading_task_id = None
+            self.fill_entries(task)
+
+        self.jobs.submit(
+            self.core.get, task_id,
+            on_done=on_loaded,
+            on_error=lambda e: messagebox.showerror("Hata", f"Görev yüklenemedi: {e}"),
+            busy_text="Görev yükleniyor...",
+            action="load_task"
+        )
+
+    def fill_entries(self, task):
+        """Put a task read by load_selected_task into the input fields."""
+        self.selected_task_id = int(task["ID"])
+        # Remembered so that saving refuses to overwrite someone else's edit
+        self.selected_version = int(task["Version"])
 
         self.clear_entries()
-        self.entry_name.insert(0, values[1])
-        self.entry_desc.insert(0, values[2])
-        self.entry_start.insert(0, values[3])
-        self.entry_end.insert(0, values[4])
-        self.entry_estimated.insert(0, values[5])
-        self.entry_actual.insert(0, values[6])
-        self.check_status.set(1 if values[7] == "Done" else 0)
-        self.status_label.configure(text="Görev düzenlenmek için yüklendi.")
+        self.entry_name.insert(0, task["Job Name"])
+        self.entry_desc.insert(0, task["Description"])
+        self.entry_start.insert(0, format_date(task["Start Date"]))
+        self.entry_end.insert(0, format_date(task["End Date"]))
+        self.entry_estimated.insert(0, task["Estimated Cost"])
+        self.entry_actual.insert(0, task["Actual Cost"])
+        self.check_status.set(1 if task["Status"] == "Done" else 0)
+        if self.selected_task_id < 0:
+            self.status_label.configure(text="Tekrarlayan görevin bu tekrarı yüklendi; kaydedilince ayrı bir görev olur.")
+        else:
+            self.status_label.configure(text="Görev düzenlenmek için yüklendi.")
 
     def update_task(self):
         """Update the selected task."""
@@ -139,47 +184,75 @@ class FarmTaskTracker:
             messagebox.showerror("Hata", "Güncelleme için görev seçilmedi.")
             return
         try:
-            df = self.load_tasks()
-            idx = df[df["ID"] == self.selected_task_id].index[0]
-
-            name = self.entry_name.get().strip()
-            desc = self.entry_desc.get().strip()
-            start_date = self.entry_start.get().strip()
-            end_date = self.entry_end.get().strip()
-            estimated_cost = self.entry_estimated.get().strip()
-            actual_cost = self.entry_actual.get().strip()
-            status = "Done" if self.check_status.get() else "Waiting"
-
-            # Input validation
-            if not name:
-                messagebox.showerror("Hata", "Görev adı boş olamaz!")
-                return
-            if not (self.validate_date(start_date) and self.validate_date(end_date)):
-                messagebox.showerror("Hata", "Tarih formatı YYYY-MM-DD olmalı!")
-                return
-            if not self.validate_cost(estimated_cost):
-                messagebox.showerror("Hata", "Tahmini maliyet geçerli bir sayı olmalı!")
-                return
-            if status == "Done" and not self.validate_cost(actual_cost):
-                messagebox.showerror("Hata", "Gerçekleşen maliyet geçerli bir sayı olmalı!")
+            task = build_task(
+                self.entry_name.get(),
+                self.entry_desc.get(),
+                self.entry_start.get().strip(),
+                self.entry_end.get().strip(),
+                self.entry_estimated.get().strip(),
+                self.entry_actual.get().strip(),
+                self.check_status.get()
+            )
+            task["ID"] = self.selected_task_id
+            if self.selected_task_id < 0:
+                self.materialize_occurrence(task)
                 return
 
-            df.at[idx, "Job Name"] = name
-            df.at[idx, "Description"] = desc
-            df.at[idx, "Start Date"] = start_date
-            df.at[idx, "End Date"] = end_date
-            df.at[idx, "Estimated Cost"] = float(estimated_cost)
-            df.at[idx, "Actual Cost"] = float(actual_cost) if status == "Done" else 0
-            df.at[idx, "Status"] = status
+            def on_saved(_):
+                messagebox.showinfo("Başarılı", "Görev başarıyla güncellendi.")
+                self.selected_task_id = None
+                self.selected_version = None
+                self.clear_entries()
+                self.refresh_row(task["ID"])
+                self.status_label.configure(text="Görev güncellendi.")
+
+            def on_error(e):
+                if isinstance(e, ConflictError):
+                    # Show the other user's version; saving again overwrites it knowingly
+                    self.refresh_row(e.task_id)
+                    self.selected_version = e.current
+                    messagebox.showwarning(
+                        "Çakışma",
+                        f"{e}\nTablodaki güncel hali kontrol edin; tekrar kaydederseniz sizin değişiklikleriniz geçerli olur."
+                    )
+                    self.status_label.configure(text="Güncelleme çakışması.")
+                else:
+                    messagebox.showerror("Hata", f"Güncelleme başarısız: {e}")
+
+            self.jobs.submit(
+                self.core.update, self.selected_task_id, task, self.selected_version,
+                on_done=on_saved,
+                on_error=on_error,
+                busy_text="Görev güncelleniyor...",
+                action="update_task",
+                cancellable=False
+            )
+        except TaskValidationError as e:
+            messagebox.showerror("Hata", str(e))
+        except Exception as e:
+            messagebox.showerror("Hata", f"Güncelleme başarısız: {e}")
+
+    def materialize_occurrence(self, task):
+        """Save an edited occurrence of a recurring task as a task of its own."""
+        occurrence_id = self.selected_task_id
 
-            df.to_excel(self.excel_file, index=False)
+        def on_saved(new_id):
             messagebox.showinfo("Başarılı", "Görev başarıyla güncellendi.")
             self.selected_task_id = None
+            self.selected_version = None
             self.clear_entries()
-            self.show_tasks()
+            self.table_view.delete_row(occurrence_id)
+            self.refresh_row(new_id)
             self.status_label.configure(text="Görev güncellendi.")
-        except Exception as e:
-            messagebox.showerror("Hata", f"Güncelleme başarısız: {e}")
+
+        self.jobs.submit(
+            self.core.materialize, occurrence_id, task,
+            on_done=on_saved,
+            on_error=lambda e: messagebox.showerror("Hata", f"Güncelleme başarısız: {e}"),
+            busy_text="Görev kaydediliyor...",
+            action="materialize",
+            cancellable=False
+        )
 
     def delete_task(self):
         """Delete the selected task."""
@@ -193,128 +266,254 @@ class FarmTaskTracker:
             if not result:
                 return
 
-            df = self.load_tasks()
             selected_id = int(self.table.item(selected_item, "values")[0])
-            df = df[df["ID"] != selected_id]
-            df["ID"] = range(1, len(df) + 1)
-            df.to_excel(self.excel_file, index=False)
-            messagebox.showinfo("Başarılı", "Görev başarıyla silindi!")
-            self.clear_entries()
-            self.show_tasks()
-            self.status_label.configure(text="Görev silindi.")
+
+            def on_deleted(_):
+                messagebox.showinfo("Başarılı", "Görev başarıyla silindi!")
+                self.clear_entries()
+                self.table_view.delete_row(selected_id)
+                self.status_label.configure(text="Görev silindi.")
+
+            self.jobs.submit(
+                self.core.delete, selected_id,
+                on_done=on_deleted,
+                on_error=lambda e: messagebox.showerror("Hata", f"Bir hata oluştu: {e}"),
+                busy_text="Görev siliniyor...",
+                action="delete_task",
+                cancellable=False
+            )
         except Exception as e:
             messagebox.showerror("Hata", f"Bir hata oluştu: {e}")
 
     def show_tasks(self, filter_status=None):
         """Display tasks in the table, optionally filtered by status."""
-        try:
-            df = self.load_tasks()
-            if filter_status:
-                df = df[df["Status"] == filter_status]
-            self.table.delete(*self.table.get_children())
-            for _, row in df.iterrows():
-                self.table.insert("", "end", values=row.tolist())
+        def on_loaded(df):
+            self.current_filter = filter_status
+            self.current_search = None
+            self.table_view.set_rows(df)
             self.status_label.configure(text=f"{len(df)} görev görüntülendi.")
-        except Exception as e:
-            messagebox.showerror("Hata", f"Görevler yüklenemedi: {e}")
 
-    def show_calendar(self, filtered_df=None, save_as_pdf=False):
-        """Display a calendar view of tasks."""
+        # Results of a search still running would overwrite this listing
+        self._search_generation += 1
+        self.jobs.submit(
+            self.core.listing, filter_status,
+            on_done=on_loaded,
+            on_error=lambda e: messagebox.showerror("Hata", f"Görevler yüklenemedi: {e}"),
+            busy_text="Görevler yükleniyor...",
+            action="show_tasks"
+        )
+
+    def setup_search_bar(self, frame):
+        """Build the search entry and filters; the table follows the input after a short pause."""
+        self.search_text = tk.StringVar()
+        self.search_status = tk.StringVar(value="Tümü")
+        self.search_min_cost = tk.StringVar()
+        self.search_max_cost = tk.StringVar()
+        self.search_start = tk.StringVar()
+        self.search_end = tk.StringVar()
+
+        ttk.Label(frame, text="Ara:").pack(side="left", padx=(5, 2))
+        search_entry = ttk.Entry(frame, textvariable=self.search_text, width=30)
+        search_entry.pack(side="left", padx=(0, 10))
+        ToolTip(search_entry, "Görev adı veya açıklamadaki kelimeler (örn: budama parsel)")
+        ttk.Label(frame, text="Durum:").pack(side="left", padx=(0, 2))
+        ttk.Combobox(frame, textvariable=self.search_status, values=["Tümü", "Done", "Waiting"], state="readonly", width=9).pack(side="left", padx=(0, 10))
+        ttk.Label(frame, text="Tahmini Maliyet:").pack(side="left", padx=(0, 2))
+        ttk.Entry(frame, textvariable=self.search_min_cost, width=8).pack(side="left")
+        ttk.Label(frame, text="-").pack(side="left", padx=2)
+        ttk.Entry(frame, textvariable=self.search_max_cost, width=8).pack(side="left", padx=(0, 10))
+        ttk.Label(frame, text="Tarih:").pack(side="left", padx=(0, 2))
+        start_entry = ttk.Entry(frame, textvariable=self.search_start, width=11)
+        start_entry.pack(side="left")
+        ttk.Label(frame, text="-").pack(side="left", padx=2)
+        end_entry = ttk.Entry(frame, textvariable=self.search_end, width=11)
+        end_entry.pack(side="left", padx=(0, 10))
+        ToolTip(start_entry, "Bu tarihten sonra da süren görevler (YYYY-MM-DD)")
+        ToolTip(end_entry, "Bu tarihten önce başlayan görevler (YYYY-MM-DD)")
+        ttk.Button(frame, text="Sıfırla", command=self.clear_search, style="secondary.TButton").pack(side="left")
+
+        for var in (self.search_text, self.search_status, self.search_min_cost, self.search_max_cost, self.search_start, self.search_end):
+            var.trace_add("write", lambda *_: self.schedule_search())
+
+    def schedule_search(self):
+        """Run the search once typing has paused for SEARCH_DELAY_MS."""
+        if self._search_after is not None:
+            self.root.after_cancel(self._search_after)
+        self._search_after = self.root.after(SEARCH_DELAY_MS, self.run_search)
+
+    def search_criteria(self):
+        """Return the search bar input as FarmTasks.search keywords, or None if it is empty."""
+        criteria = {}
+        text = self.search_text.get().strip()
+        if text:
+            criteria["text"] = text
+        if self.search_status.get() != "Tümü":
+            criteria["status"] = self.search_status.get()
+        for key, var in (("min_cost", self.search_min_cost), ("max_cost", self.search_max_cost)):
+            value = var.get().strip()
+            if value:
+                if not validate_cost(value):
+                    raise TaskValidationError("Maliyet geçerli bir sayı olmalı!")
+                criteria[key] = float(value)
+        for key, var in (("start", self.search_start), ("end", self.search_end)):
+            value = var.get().strip()
+            if value:
+                if not validate_date(value):
+                    raise TaskValidationError("Tarih formatı YYYY-MM-DD olmalı!")
+                criteria[key] = value
+        if "start" in criteria or "end" in criteria:
+            criteria["mode"] = OVERLAPPING
+        return criteria or None
+
+    def run_search(self):
+        """Show the tasks matching the search bar, or all tasks when it is empty."""
+        self._search_after = None
         try:
-            df = filtered_df if filtered_df is not None else self.load_tasks()
-            df = df.copy()
-            df["Start Date"] = pd.to_datetime(df["Start Date"], errors="coerce")
-            df["End Date"] = pd.to_datetime(df["End Date"], errors="coerce")
-            df = df.dropna(subset=["Start Date", "End Date"])
-
-            grouped = df.groupby("Job Name")
-            collapsed_tasks = []
-
-            for name, group in grouped:
-                start = group["Start Date"].min()
-                end = group["End Date"].max()
-                desc = " / ".join(group["Description"].dropna().astype(str).unique())
-                collapsed_tasks.append({
-                    "Job Name": name,
-                    "Start Date": start,
-                    "End Date": end,
-                    "Descriptions": desc,
-                    "Details": group
-                })
-
-            collapsed_tasks.sort(key=lambda x: x["Start Date"])
-            fig, ax = plt.subplots(figsize=(14, max(6, len(collapsed_tasks) * 0.5)))
-
-            total_actual = 0
-            total_estimated = 0
-
-            for idx, task in enumerate(collapsed_tasks):
-                start = task["Start Date"]
-                end = task["End Date"]
-                duration = (end - start).days or 1
-
-                done_cost = task["Details"].loc[task["Details"]["Status"] == "Done", "Actual Cost"].sum()
-                wait_cost = task["Details"].loc[task["Details"]["Status"] == "Waiting", "Estimated Cost"].sum()
-                total_cost = done_cost + wait_cost
-
-                done_ratio = done_cost / total_cost if total_cost else 0
-                wait_ratio = wait_cost / total_cost if total_cost else 0
-
-                done_days = int(duration * done_ratio)
-                wait_days = int(duration * wait_ratio)
-
-                done_end = start + pd.Timedelta(days=done_days)
-                wait_end = done_end + pd.Timedelta(days=wait_days)
-
-                if done_cost > 0:
-                    ax.plot([start, done_end], [idx, idx], color="green", linewidth=4)
-                    ax.text(done_end, idx + 0.1, f"Harcanan: {done_cost:,.0f} EUR".replace(",", "."), fontsize=8, va="bottom")
-                    total_actual += done_cost
-
-                if wait_cost > 0:
-                    ax.plot([done_end, wait_end], [idx, idx], color="orange", linewidth=4)
-                    ax.text(wait_end, idx + 0.1, f"Beklenen: {wait_cost:,.0f} EUR".replace(",", "."), fontsize=8, va="bottom")
-                    total_estimated += wait_cost
-
-            ax.set_yticks(range(len(collapsed_tasks)))
-            ax.set_yticklabels([t["Job Name"] for t in collapsed_tasks], fontsize=9)
-            ax.set_title("Görev Zaman Çizelgesi ve Maliyet", fontsize=12, pad=10)
-            ax.grid(True, linestyle="--", linewidth=0.5)
-            ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d'))
-            ax.xaxis.set_major_locator(mdates.MonthLocator())
-            plt.xticks(rotation=45)
-            plt.tight_layout()
-
-            ax.text(
-                0.01, -0.12,
-                f"Harcanan: {total_actual:,.0f} EUR | Beklenen: {total_estimated:,.0f} EUR | Toplam: {(total_actual + total_estimated):,.0f} EUR".replace(",", "."),
-                transform=ax.transAxes,
-                fontsize=10,
-                color='black',
-                ha='left'
-            )
+            criteria = self.search_criteria()
+        except TaskValidationError as e:
+            # No message box while the user is still typing
+            self.status_label.configure(text=str(e))
+            return
+        if criteria is None:
+            self.show_tasks(None)
+            return
 
+        self._search_generation += 1
+        generation = self._search_generation
+
+        def on_found(df):
+            if generation != self._search_generation:
+                # A newer search or listing was started meanwhile
+                return
+            self.current_filter = None
+            self.current_search = criteria
+            self.table_view.set_rows(df)
+            self.status_label.configure(text=f"{len(df)} görev bulundu.")
+
+        self.jobs.submit(
+            self.core.search,
+            on_done=on_found,
+            on_error=lambda e: messagebox.showerror("Hata", f"Arama sırasında hata: {e}"),
+            busy_text="Aranıyor...",
+            action="search",
+            **criteria
+        )
+
+    def clear_search(self):
+        """Empty the search bar; the table goes back to all tasks."""
+        for var in (self.search_text, self.search_min_cost, self.search_max_cost, self.search_start, self.search_end):
+            var.set("")
+        self.search_status.set("Tümü")
+
+    def reload_table(self):
+        """Rebuild the table with the current listing or search."""
+        if self.current_search is not None:
+            self.run_search()
+        else:
+            self.show_tasks(self.current_filter)
+
+    def refresh_row(self, task_id):
+        """Apply a single added or updated task to the table without a rebuild."""
+        if self.current_search is not None:
+            # Whether the task still matches is up to the search
+            self.run_search()
+            return
+
+        def on_loaded(task):
+            if self.current_filter and task["Status"] != self.current_filter:
+                self.table_view.delete_row(task_id)
+            else:
+                self.table_view.update_row(task)
+
+        # Completes a write, so "İptal" must not leave the table showing the old row
+        self.jobs.submit(self.core.get, task_id, on_done=on_loaded, busy_text="Tablo güncelleniyor...",
+                         cancellable=False)
+
+    def show_calendar(self, query=None, save_as_pdf=False):
+        """Display a calendar view of tasks, optionally limited to query=(start, end, mode)."""
+        try:
+            file_path = None
             if save_as_pdf:
-                file_path = filedialog.asksaveasfilename(defaultextension=".pdf", filetypes=[("PDF files", "*.pdf")])
+                file_path = filedialog.asksaveasfilename(defaultextension=".pdf", filetypes=[("PDF files", "*.pdf"), ("PNG files", "*.png")])
+                if not file_path:
+                    return
+
+            def build():
+                if query:
+                    version, df = self.core.versioned(self.core.query, *query)
+                else:
+                    version, df = self.core.versioned(self.core.calendar_tasks)
+                fig = self.figures.get(("calendar", version, query), lambda: build_calendar_figure(df))
+                if file_path and self.figures.window_for(fig) is None:
+                    save_figure(fig, file_path)
+                    return None
+                return fig
+
+            def on_built(fig):
                 if file_path:
-                    fig.savefig(file_path, format="pdf", bbox_inches='tight')
-                    messagebox.showinfo("Başarılı", f"Takvim PDF olarak kaydedildi: {file_path}")
-                    self.status_label.configure(text="Takvim PDF olarak kaydedildi.")
-                plt.close(fig)
-            else:
-                cal_window = ttk.Toplevel(self.root)
-                cal_window.title("Takvim Görünümü")
-                cal_window.geometry("1000x600")
-                canvas = FigureCanvasTkAgg(fig, master=cal_window)
-                canvas.draw()
-                canvas.get_tk_widget().pack(fill="both", expand=True)
-                ttk.Button(cal_window, text="PDF Olarak Kaydet", command=lambda: self.show_calendar(filtered_df, save_as_pdf=True), style="primary.TButton").pack(pady=10)
+                    if fig is not None:
+                        # Already on screen: save through its own canvas on the Tk thread
+                        fig.savefig(file_path, bbox_inches='tight')
+                    messagebox.showinfo("Başarılı", f"Takvim kaydedildi: {file_path}")
+                    self.status_label.configure(text="Takvim kaydedildi.")
+                    return
+                cal_window = self.open_figure_window(fig, "Takvim Görünümü", "1000x600")
+                if cal_window is None:
+                    return
+                self.embed_figure(cal_window, fig)
+                ttk.Button(cal_window, text="PDF Olarak Kaydet", command=lambda: self.save_shown_figure(fig), style="primary.TButton").pack(pady=10)
                 self.status_label.configure(text="Takvim açıldı.")
+
+            self.jobs.submit(
+                build,
+                on_done=on_built,
+                on_error=lambda e: messagebox.showerror("Hata", f"Takvim oluşturulurken hata: {e}"),
+                busy_text="Takvim hazırlanıyor...",
+                action="export_calendar" if file_path else "show_calendar"
+            )
         except Exception as e:
             messagebox.showerror("Hata", f"Takvim oluşturulurken hata: {e}")
 
+    def open_figure_window(self, fig, title, geometry):
+        """Return a new window for fig, or None after raising the window already showing it."""
+        window = self.figures.window_for(fig)
+        if window is not None:
+            window.deiconify()
+            window.lift()
+            window.focus_force()
+            return None
+        window = ttk.Toplevel(self.root)
+        window.title(title)
+        window.geometry(geometry)
+        self.figures.show(fig, window)
+        window.protocol("WM_DELETE_WINDOW", lambda: self.close_figure_window(window, fig))
+        return window
+
+    def embed_figure(self, window, fig):
+        """Draw fig on a Tk canvas filling the rest of window."""
+        with timed("chart.embed"):
+            canvas = FigureCanvasTkAgg(fig, master=window)
+            canvas.draw()
+            canvas.get_tk_widget().pack(fill="both", expand=True)
+
+    def close_figure_window(self, window, fig):
+        """Close a chart window and release its hold on the figure."""
+        self.figures.hide(fig)
+        window.destroy()
+
+    def save_shown_figure(self, fig):
+        """Save the figure of an open chart window without rebuilding it."""
+        file_path = filedialog.asksaveasfilename(defaultextension=".pdf", filetypes=[("PDF files", "*.pdf"), ("PNG files", "*.png")])
+        if not file_path:
+            return
+        try:
+            fig.savefig(file_path, bbox_inches='tight')
+            messagebox.showinfo("Başarılı", f"Takvim kaydedildi: {file_path}")
+        except Exception as e:
+            messagebox.showerror("Hata", f"Takvim kaydedilirken hata: {e}")
+
     def export_calendar_pdf(self):
-        """Export calendar as PDF."""
+        """Export calendar as PDF (or PNG), rendered offscreen."""
         self.show_calendar(save_as_pdf=True)
 
     def open_calendar_selection(self):
@@ -332,6 +531,21 @@ class FarmTaskTracker:
             cal_end = Calendar(popup, selectmode='day', date_pattern='yyyy-mm-dd')
             cal_end.pack(pady=5)
 
+            modes = {"Tamamen aralık içinde": CONTAINED, "Aralıkla kesişen": OVERLAPPING}
+            mode_var = tk.StringVar(value="Tamamen aralık içinde")
+            ttk.Combobox(popup, textvariable=mode_var, values=list(modes), state="readonly").pack(pady=5)
+
+            def on_calculated(result, start, end, mode):
+                filtered, total_actual, total_estimated = result
+                if filtered.empty:
+                    messagebox.showinfo("Bilgi", "Belirtilen tarihler arasında görev bulunamadı.")
+                    return
+
+                result_text = f"Toplam Gerçekleşen Maliyet: {total_actual:,.2f} EUR\nToplam Tahmini Maliyet: {total_estimated:,.2f} EUR"
+                messagebox.showinfo("Harcamalar", result_text)
+                self.show_calendar(query=(start, end, mode))
+                self.status_label.configure(text="Harcama hesaplandı ve takvim gösterildi.")
+
             def calculate_and_show_calendar():
                 try:
                     start = pd.to_datetime(cal_start.get_date())
@@ -341,24 +555,14 @@ class FarmTaskTracker:
                         messagebox.showerror("Hata", "Başlangıç tarihi bitiş tarihinden sonra olamaz!")
                         return
 
-                    df = self.load_tasks()
-                    df["Start Date"] = pd.to_datetime(df["Start Date"], errors="coerce")
-                    df["End Date"] = pd.to_datetime(df["End Date"], errors="coerce")
-
-                    mask = (df["Start Date"] >= start) & (df["End Date"] <= end)
-                    filtered = df.loc[mask].copy()
-
-                    if filtered.empty:
-                        messagebox.showinfo("Bilgi", "Belirtilen tarihler arasında görev bulunamadı.")
-                        return
-
-                    total_actual = filtered.loc[filtered["Status"] == "Done", "Actual Cost"].sum()
-                    total_estimated = filtered.loc[filtered["Status"] == "Waiting", "Estimated Cost"].sum()
-
-                    result_text = f"Toplam Gerçekleşen Maliyet: {total_actual:,.2f} EUR\nToplam Tahmini Maliyet: {total_estimated:,.2f} EUR"
-                    messagebox.showinfo("Harcamalar", result_text)
-                    self.show_calendar(filtered_df=filtered)
-                    self.status_label.configure(text="Harcama hesaplandı ve takvim gösterildi.")
+                    mode = modes[mode_var.get()]
+                    self.jobs.submit(
+                        self.core.expenses, start, end, mode,
+                        on_done=lambda result: on_calculated(result, start, end, mode),
+                        on_error=lambda e: messagebox.showerror("Hata", f"Bir hata oluştu: {e}"),
+                        busy_text="Harcamalar hesaplanıyor...",
+                        action="expenses"
+                    )
                 except Exception as e:
                     messagebox.showerror("Hata", f"Bir hata oluştu: {e}")
 
@@ -367,107 +571,287 @@ class FarmTaskTracker:
             messagebox.showerror("Hata", f"Tarih seçimi penceresi açılırken hata: {e}")
 
     def export_all_tasks(self):
-        """Export all tasks to a new Excel file."""
-        try:
-            df = self.load_tasks()
+        """Export all tasks to a new Excel, CSV or Parquet file."""
+        def on_exported(file_path):
+            messagebox.showinfo("Başarılı", f"Tüm görevler dışa aktarıldı: {file_path}")
+            self.status_label.configure(text="Görevler dışa aktarıldı.")
+
+        def on_loaded(df):
             if df.empty:
                 messagebox.showinfo("Bilgi", "Aktarılacak görev bulunamadı.")
                 return
 
             file_path = filedialog.asksaveasfilename(
                 defaultextension=".xlsx",
-                filetypes=[("Excel files", "*.xlsx"), ("All files", "*.*")]
+                filetypes=[("Excel files", "*.xlsx"), ("CSV files", "*.csv"), ("Parquet files", "*.parquet"), ("All files", "*.*")]
             )
 
             if not file_path:
                 return
 
-            now = datetime.now().strftime("%Y-%m-%d")
-            writer = pd.ExcelWriter(file_path, engine='openpyxl')
+            self.jobs.submit(self.core.export_tasks, file_path, df, on_done=on_exported, on_error=on_error,
+                             busy_text="Görevler dışa aktarılıyor...", progress_text="Görevler dışa aktarılıyor... {}/{}",
+                             action="export_tasks")
 
-            df.to_excel(writer, index=False, sheet_name='Tüm Görevler')
+        def on_error(e):
+            messagebox.showerror("Hata", f"Dışa aktarma sırasında hata: {e}")
 
-            summary = pd.DataFrame({
-                'Toplam Görev Sayısı': [len(df)],
-                'Tamamlanan Görev Sayısı': [len(df[df['Status'] == 'Done'])],
-                'Bekleyen Görev Sayısı': [len(df[df['Status'] == 'Waiting'])],
-                'Toplam Gerçekleşen Maliyet': [df[df['Status'] == 'Done']['Actual Cost'].sum()],
-                'Toplam Beklenen Maliyet': [df[df['Status'] == 'Waiting']['Estimated Cost'].sum()],
-                'Rapor Tarihi': [now]
-            })
+        self.jobs.submit(self.core.all_tasks, on_done=on_loaded, on_error=on_error, busy_text="Görevler yükleniyor...")
 
-            summary.to_excel(writer, index=False, sheet_name='Özet')
-            writer.close()
-            messagebox.showinfo("Başarılı", f"Tüm görevler dışa aktarıldı: {file_path}")
-            self.status_label.configure(text="Görevler Excel'e aktarıldı.")
+    def import_tasks(self):
+        """Bulk import tasks from a CSV or Excel file."""
+        file_path = filedialog.askopenfilename(
+            filetypes=[("CSV / Excel", "*.csv *.xlsx"), ("All files", "*.*")]
+        )
+        if not file_path:
+            return
+
+        def on_imported(ids):
+            self.status_label.configure(text=f"{len(ids)} görev içe aktarıldı.")
+            self.show_tasks(self.current_filter)
+
+        def on_read(result):
+            tasks = result.tasks
+            if result.errors:
+                if tasks.empty:
+                    messagebox.showerror("Hata", f"Geçerli satır bulunamadı:\n{format_errors(result.errors)}")
+                    return
+                if not messagebox.askyesno(
+                    "Uyarı",
+                    f"{len(result.errors)} satır geçersiz:\n{format_errors(result.errors)}\n\n"
+                    f"Geçersiz satırlar atlanarak {len(tasks)} görev içe aktarılsın mı?"
+                ):
+                    return
+            elif tasks.empty:
+                messagebox.showinfo("Bilgi", "Dosyada aktarılacak görev bulunamadı.")
+                return
+            self.jobs.submit(self.core.add_many, tasks.to_dict("records"), on_done=on_imported, on_error=on_error, busy_text=f"{len(tasks)} görev kaydediliyor...",
+                             action="import_save", cancellable=False)
+
+        def on_error(e):
+            messagebox.showerror("Hata", f"İçe aktarma sırasında hata: {e}")
+
+        self.jobs.submit(read_tasks, file_path, on_done=on_read, on_error=on_error, busy_text="Dosya okunuyor ve doğrulanıyor...", progress_text="Dosya okunuyor ve doğrulanıyor... {} satır",
+                         action="import_read")
+
+    def show_recurring(self):
+        """List the recurring task rules and allow stopping them."""
+        window = ttk.Toplevel(self.root)
+        window.title("Tekrarlayan Görevler")
+        window.geometry("800x400")
+
+        columns = ("Kural", "Görev Adı", "İlk Başlangıç", "Süre (gün)", "Tekrar", "Tahmini Maliyet")
+        tree = ttk.Treeview(window, columns=columns, show="headings")
+        for col, width in zip(columns, (50, 160, 100, 80, 280, 110)):
+            tree.heading(col, text=col)
+            tree.column(col, width=width)
+        tree.pack(fill="both", expand=True, padx=10, pady=10)
+
+        def refresh():
+            tree.delete(*tree.get_children())
+            for rule in self.core.recurring():
+                tree.insert("", "end", iid=str(rule.rule_id), values=(
+                    rule.rule_id, rule.job_name, rule.start.isoformat(), rule.duration,
+                    rule.describe(), f"{rule.estimated_cost:,.2f}"
+                ))
+
+        def delete_rule():
+            selected = tree.selection()
+            if not selected:
+                messagebox.showwarning("Uyarı", "Lütfen bir kural seçin.", parent=window)
+                return
+            if not messagebox.askyesno("Onay", "Bu tekrarlayan görev durdurulsun mu? Kaydedilmiş tekrarları silinmez.", parent=window):
+                return
+            try:
+                self.core.delete_recurring(int(selected[0]))
+            except Exception as e:
+                messagebox.showerror("Hata", f"Bir hata oluştu: {e}", parent=window)
+                return
+            refresh()
+            self.reload_table()
+
+        ttk.Button(window, text="Seçili Kuralı Durdur", command=delete_rule, style="danger.TButton").pack(pady=(0, 10))
+        try:
+            refresh()
         except Exception as e:
-            messagebox.showerror("Hata", f"Dışa aktarma sırasında hata: {e}")
+            messagebox.showerror("Hata", f"Tekrarlayan görevler okunamadı: {e}", parent=window)
+
+    def show_seasons(self):
+        """List the seasons and archive closed ones."""
+        window = ttk.Toplevel(self.root)
+        window.title("Sezonlar")
+        window.geometry("700x400")
+
+        columns = ("Sezon", "Başlangıç", "Bitiş", "Görev Sayısı", "Bekleyen", "Durum")
+        tree = ttk.Treeview(window, columns=columns, show="headings")
+        for col, width in zip(columns, (80, 100, 100, 100, 80, 200)):
+            tree.heading(col, text=col)
+            tree.column(col, width=width)
+        tree.pack(fill="both", expand=True, padx=10, pady=10)
+
+        def refresh():
+            tree.delete(*tree.get_children())
+            for season in self.core.seasons():
+                if season["archived"]:
+                    state = "Arşivlendi (salt okunur)"
+                elif season["closed"]:
+                    state = "Kapandı"
+                else:
+                    state = "Açık"
+                tree.insert("", "end", iid=str(season["season"]), values=(
+                    season["label"], season["first"].isoformat(), season["last"].isoformat(),
+                    season["tasks"], season["waiting"], state
+                ))
+
+        def on_frozen(count):
+            messagebox.showinfo("Başarılı", f"{count} görev arşivlendi.", parent=window)
+            refresh()
+            self.reload_table()
+            self.status_label.configure(text="Sezon arşivlendi.")
+
+        def freeze():
+            selected = tree.selection()
+            if not selected:
+                messagebox.showwarning("Uyarı", "Lütfen bir sezon seçin.", parent=window)
+                return
+            label = tree.item(selected[0])["values"][0]
+            if not messagebox.askyesno(
+                "Onay",
+                f"{label} sezonu arşivlensin mi? Arşivlenen görevler istatistik, harcama, arama ve dışa "
+                "aktarmada görünmeye devam eder ancak artık değiştirilemez.",
+                parent=window
+            ):
+                return
+            self.jobs.submit(
+                self.core.freeze_season, int(selected[0]),
+                on_done=on_frozen,
+                on_error=lambda e: messagebox.showerror("Hata", f"Sezon arşivlenemedi: {e}", parent=window),
+                busy_text="Sezon arşivleniyor...",
+                action="freeze_season",
+                cancellable=False
+            )
+
+        ttk.Button(window, text="Seçili Sezonu Arşivle", command=freeze, style="warning.TButton").pack(pady=(0, 10))
+        try:
+            refresh()
+        except Exception as e:
+            messagebox.showerror("Hata", f"Sezonlar okunamadı: {e}", parent=window)
 
     def show_statistics(self):
         """Display task statistics."""
-        try:
-            df = self.load_tasks()
-            if df.empty:
+        def build():
+            # Archived seasons still count, even with no task left in the store
+            if self.core.tasks().empty and not self.core.archive.list():
+                return None
+            version, (stats, forecast) = self.core.versioned(lambda: (self.core.statistics(), self.core.forecast()))
+            # The cash flow starts today, so the figure is only reused on the same day
+            fig = self.figures.get(("statistics", version, forecast["first"]),
+                                   lambda: build_statistics_figure(stats, forecast))
+            return stats, forecast, fig
+
+        def on_built(result):
+            if result is None:
                 messagebox.showinfo("Bilgi", "İstatistik gösterilecek görev bulunamadı.")
                 return
+            stats, forecast, fig = result
 
-            df["Start Date"] = pd.to_datetime(df["Start Date"], errors="coerce")
-            df["End Date"] = pd.to_datetime(df["End Date"], errors="coerce")
-
-            stats_window = ttk.Toplevel(self.root)
-            stats_window.title("Görev İstatistikleri")
-            stats_window.geometry("800x600")
-
-            total_tasks = len(df)
-            done_tasks = len(df[df["Status"] == "Done"])
-            waiting_tasks = len(df[df["Status"] == "Waiting"])
-            total_actual_cost = df[df["Status"] == "Done"]["Actual Cost"].sum()
-            total_estimated_cost = df[df["Status"] == "Waiting"]["Estimated Cost"].sum()
-            df["Duration"] = (df["End Date"] - df["Start Date"]).dt.days
-            avg_duration = df["Duration"].mean()
+            stats_window = self.open_figure_window(fig, "Görev İstatistikleri", "800x750")
+            if stats_window is None:
+                return
 
             info_frame = ttk.Frame(stats_window)
             info_frame.pack(pady=10, fill="x")
-            ttk.Label(info_frame, text=f"Toplam Görev Sayısı: {total_tasks}", font=("Arial", 12)).pack(anchor="w", pady=2)
-            ttk.Label(info_frame, text=f"Tamamlanan Görev Sayısı: {done_tasks}", font=("Arial", 12)).pack(anchor="w", pady=2)
-            ttk.Label(info_frame, text=f"Bekleyen Görev Sayısı: {waiting_tasks}", font=("Arial", 12)).pack(anchor="w", pady=2)
-            ttk.Label(info_frame, text=f"Toplam Gerçekleşen Maliyet: {total_actual_cost:,.2f} EUR", font=("Arial", 12)).pack(anchor="w", pady=2)
-            ttk.Label(info_frame, text=f"Toplam Beklenen Maliyet: {total_estimated_cost:,.2f} EUR", font=("Arial", 12)).pack(anchor="w", pady=2)
-            ttk.Label(info_frame, text=f"Ortalama Görev Süresi: {avg_duration:.1f} gün", font=("Arial", 12)).pack(anchor="w", pady=2)
-
-            fig = Figure(figsize=(8, 8))
-            ax1 = fig.add_subplot(221)
-            status_counts = df["Status"].value_counts()
-            ax1.pie(
-                status_counts,
-                labels=status_counts.index,
-                autopct='%1.1f%%',
-                colors=['green', 'orange'] if "Done" in status_counts.index and "Waiting" in status_counts.index else None
-            )
-            ax1.set_title("Görev Durumu Dağılımı")
-
-            ax2 = fig.add_subplot(222)
-            cost_data = [total_actual_cost, total_estimated_cost]
-            ax2.bar(['Gerçekleşen', 'Beklenen'], cost_data, color=['green', 'orange'])
-            ax2.set_title("Maliyet Karşılaştırma")
-            ax2.set_ylabel("EUR")
-
-            ax3 = fig.add_subplot(212)
-            df['Month'] = df['Start Date'].dt.to_period('M')
-            monthly_tasks = df.groupby('Month').size()
-            ax3.plot(range(len(monthly_tasks)), monthly_tasks.values, marker='o')
-            ax3.set_xticks(range(len(monthly_tasks)))
-            ax3.set_xticklabels([str(period) for period in monthly_tasks.index], rotation=45)
-            ax3.set_title("Aylık Görev Sayısı")
-            ax3.set_ylabel("Görev Sayısı")
-            fig.tight_layout()
-
-            canvas = FigureCanvasTkAgg(fig, master=stats_window)
-            canvas.draw()
-            canvas.get_tk_widget().pack(fill="both", expand=True)
+            ttk.Label(info_frame, text=f"Toplam Görev Sayısı: {stats['total_tasks']}", font=("Arial", 12)).pack(anchor="w", pady=2)
+            ttk.Label(info_frame, text=f"Tamamlanan Görev Sayısı: {stats['done_tasks']}", font=("Arial", 12)).pack(anchor="w", pady=2)
+            ttk.Label(info_frame, text=f"Bekleyen Görev Sayısı: {stats['waiting_tasks']}", font=("Arial", 12)).pack(anchor="w", pady=2)
+            ttk.Label(info_frame, text=f"Toplam Gerçekleşen Maliyet: {stats['total_actual_cost']:,.2f} EUR", font=("Arial", 12)).pack(anchor="w", pady=2)
+            ttk.Label(info_frame, text=f"Toplam Beklenen Maliyet: {stats['total_estimated_cost']:,.2f} EUR", font=("Arial", 12)).pack(anchor="w", pady=2)
+            ttk.Label(info_frame, text=f"Ortalama Görev Süresi: {stats['avg_duration']:.1f} gün", font=("Arial", 12)).pack(anchor="w", pady=2)
+            ttk.Label(info_frame, text=f"Gerçekleşen / Tahmini Maliyet Oranı: {forecast['ratio']:.2f}", font=("Arial", 12)).pack(anchor="w", pady=2)
+            ttk.Label(info_frame, text=f"Öngörülen Kalan Maliyet: {forecast['remaining_projected']:,.2f} EUR", font=("Arial", 12)).pack(anchor="w", pady=2)
+            ttk.Label(info_frame, text=f"Öngörülen Harcama ({forecast['first']} - {forecast['last']}): {forecast['window_projected']:,.2f} EUR", font=("Arial", 12)).pack(anchor="w", pady=2)
+            overruns = top_overruns(forecast)
+            if overruns:
+                text = ", ".join(f"{name} (%{(ratio - 1) * 100:+.0f})" for name, ratio in overruns)
+                ttk.Label(info_frame, text=f"En Çok Aşan İşler: {text}", font=("Arial", 12)).pack(anchor="w", pady=2)
+
+            self.embed_figure(stats_window, fig)
             self.status_label.configure(text="İstatistikler gösterildi.")
-        except Exception as e:
-            messagebox.showerror("Hata", f"İstatistikler oluşturulurken hata: {e}")
+
+        self.jobs.submit(
+            build,
+            on_done=on_built,
+            on_error=lambda e: messagebox.showerror("Hata", f"İstatistikler oluşturulurken hata: {e}"),
+            busy_text="İstatistikler hazırlanıyor...",
+            action="show_statistics"
+        )
+
+    def show_diagnostics(self):
+        """Show latency percentiles and histograms of the timed actions, plus the profiler controls."""
+        window = ttk.Toplevel(self.root)
+        window.title("Tanılama")
+        window.geometry("1000x650")
+
+        columns = ("Ölçüm", "Sayı", "Ortalama (ms)", "p50 (ms)", "p95 (ms)", "p99 (ms)", "En Uzun (ms)", "Dağılım (ms: adet)")
+        tree = ttk.Treeview(window, columns=columns, show="headings", height=14)
+        for col, width in zip(columns, (170, 60, 90, 80, 80, 80, 90, 330)):
+            tree.heading(col, text=col)
+            tree.column(col, width=width, anchor="w" if col in ("Ölçüm", "Dağılım (ms: adet)") else "e")
+        tree.pack(fill="both", expand=True, padx=10, pady=(10, 5))
+
+        report = tk.Text(window, height=12, font=("Courier", 9), wrap="none")
+        report.pack(fill="both", expand=True, padx=10, pady=5)
+
+        profile_text = tk.StringVar()
+
+        def refresh():
+            tree.delete(*tree.get_children())
+            for name, summary in metrics.snapshot()["metrics"].items():
+                histogram = "  ".join(f"{bound}: {count}" for bound, count in summary["histogram"].items() if count)
+                tree.insert("", "end", values=(
+                    name, summary["count"], f"{summary['mean_ms']:.1f}", f"{summary['p50_ms']:.1f}",
+                    f"{summary['p95_ms']:.1f}", f"{summary['p99_ms']:.1f}", f"{summary['max_ms']:.1f}", histogram
+                ))
+            report.delete("1.0", tk.END)
+            report.insert("1.0", metrics.profile_report() or "Profil verisi yok. Profil kaydını başlatıp işlemleri tekrarlayın.")
+            profile_text.set("Profil Kaydını Durdur" if metrics.profiling else "Profil Kaydını Başlat")
+
+        def toggle_profiling():
+            metrics.set_profiling(not metrics.profiling)
+            refresh()
+
+        def save_json():
+            file_path = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON files", "*.json")])
+            if not file_path:
+                return
+            try:
+                metrics.dump(file_path)
+                messagebox.showinfo("Başarılı", f"Ölçümler kaydedildi: {file_path}")
+            except Exception as e:
+                messagebox.showerror("Hata", f"Ölçümler kaydedilemedi: {e}")
+
+        def save_profile():
+            file_path = filedialog.asksaveasfilename(defaultextension=".prof", filetypes=[("Profile files", "*.prof")])
+            if not file_path:
+                return
+            try:
+                metrics.save_profile(file_path)
+                messagebox.showinfo("Başarılı", f"Profil kaydedildi: {file_path}")
+            except Exception as e:
+                messagebox.showerror("Hata", f"Profil kaydedilemedi: {e}")
+
+        def reset():
+            metrics.reset()
+            refresh()
+
+        buttons = ttk.Frame(window)
+        buttons.pack(fill="x", padx=10, pady=(5, 10))
+        ttk.Button(buttons, text="Yenile", command=refresh, style="info.TButton").pack(side="left", padx=5)
+        ttk.Button(buttons, textvariable=profile_text, command=toggle_profiling, style="warning.TButton").pack(side="left", padx=5)
+        ttk.Button(buttons, text="JSON Olarak Kaydet", command=save_json, style="primary.TButton").pack(side="left", padx=5)
+        ttk.Button(buttons, text="Profili Kaydet", command=save_profile, style="secondary.TButton").pack(side="left", padx=5)
+        ttk.Button(buttons, text="Sıfırla", command=reset, style="danger.TButton").pack(side="left", padx=5)
+        refresh()
 
     def select_date(self, entry_widget):
         """Show a date picker and set the selected date in the entry field."""
@@ -495,6 +879,8 @@ class FarmTaskTracker:
         input_frame.pack(fill="x", padx=10, pady=5)
         button_frame = ttk.Frame(self.root)
         button_frame.pack(fill="x", padx=10, pady=5)
+        search_frame = ttk.LabelFrame(self.root, text="Ara ve Filtrele", padding=5)
+        search_frame.pack(fill="x", padx=10, pady=5)
         table_frame = ttk.Frame(self.root)
         table_frame.pack(fill="both", expand=True, padx=10, pady=5)
         status_frame = ttk.Frame(self.root)
@@ -502,7 +888,10 @@ class FarmTaskTracker:
 
         # Status bar
         self.status_label = ttk.Label(status_frame, text="Hazır", relief="sunken", anchor="w")
-        self.status_label.pack(fill="x")
+        ttk.Button(status_frame, text="İptal", command=lambda: self.jobs.cancel_all(), style="secondary.TButton").pack(side="right", padx=(5, 0))
+        self.status_label.pack(side="left", fill="x", expand=True)
+        # Disk I/O and chart building run here, off the Tk thread
+        self.jobs = JobRunner(self.root, self.status_label)
 
         # Input fields
         field_width = 40
@@ -549,6 +938,26 @@ class FarmTaskTracker:
         self.entry_actual.grid(row=0, column=4, padx=5, pady=2, sticky="w")
         ToolTip(self.entry_actual, "Gerçekleşen maliyet (tamamlandıysa, örn: 950)")
 
+        row4 = ttk.Frame(input_frame)
+        row4.pack(fill="x", padx=5, pady=5)
+        ttk.Label(row4, text="Tekrar:").grid(row=0, column=0, padx=5, pady=2, sticky="w")
+        self.recur_unit = tk.StringVar(value="Tekrar yok")
+        recur_combo = ttk.Combobox(row4, textvariable=self.recur_unit, values=list(RECURRENCE_UNITS), state="readonly", width=12)
+        recur_combo.grid(row=0, column=1, padx=5, pady=2, sticky="w")
+        ToolTip(recur_combo, "Görev düzenli tekrarlanıyorsa seçin; tarihler ilk tekrarı belirler")
+        ttk.Label(row4, text="Aralık:").grid(row=0, column=2, padx=5, pady=2, sticky="w")
+        self.recur_every = tk.StringVar(value="1")
+        recur_every = ttk.Spinbox(row4, from_=1, to=365, textvariable=self.recur_every, width=5)
+        recur_every.grid(row=0, column=3, padx=5, pady=2, sticky="w")
+        ToolTip(recur_every, "Kaç günde/haftada/ayda bir (örn: 14 günde bir ilaçlama için Günlük ve 14)")
+        ttk.Label(row4, text="Tekrar Bitişi:").grid(row=0, column=4, padx=5, pady=2, sticky="w")
+        date_frame3 = ttk.Frame(row4)
+        date_frame3.grid(row=0, column=5, padx=5, pady=2, sticky="w")
+        self.entry_recur_until = ttk.Entry(date_frame3, width=15)
+        self.entry_recur_until.pack(side="left")
+        ttk.Button(date_frame3, text="...", width=3, command=lambda: self.select_date(self.entry_recur_until), style="secondary.TButton").pack(side="left")
+        ToolTip(self.entry_recur_until, "Son tekrarın en geç başlangıç tarihi (boş: süresiz)")
+
         # Buttons
         button_width = 20
         button_row1 = ttk.Frame(button_frame)
@@ -563,6 +972,7 @@ class FarmTaskTracker:
         ttk.Button(button_row2, text="Tüm Görevler", width=button_width, command=lambda: self.show_tasks(None), style="info.TButton").pack(side="left", padx=5)
         ttk.Button(button_row2, text="Tamamlananlar", width=button_width, command=lambda: self.show_tasks("Done"), style="success.TButton").pack(side="left", padx=5)
         ttk.Button(button_row2, text="Bekleyenler", width=button_width, command=lambda: self.show_tasks("Waiting"), style="warning.TButton").pack(side="left", padx=5)
+        ttk.Button(button_row2, text="Sezonlar", width=button_width, command=self.show_seasons, style="secondary.TButton").pack(side="left", padx=5)
 
         button_row3 = ttk.Frame(button_frame)
         button_row3.pack(fill="x", padx=5, pady=2)
@@ -574,7 +984,12 @@ class FarmTaskTracker:
         button_row4 = ttk.Frame(button_frame)
         button_row4.pack(fill="x", padx=5, pady=2)
         ttk.Button(button_row4, text="Tüm Görevleri Dışa Aktar", width=button_width, command=self.export_all_tasks, style="primary.TButton").pack(side="left", padx=5)
+        ttk.Button(button_row4, text="Toplu İçe Aktar", width=button_width, command=self.import_tasks, style="info.TButton").pack(side="left", padx=5)
         ttk.Button(button_row4, text="Temizle", width=button_width, command=self.clear_entries, style="secondary.TButton").pack(side="left", padx=5)
+        ttk.Button(button_row4, text="Tekrarlayan Görevler", width=button_width, command=self.show_recurring, style="info.TButton").pack(side="left", padx=5)
+        ttk.Button(button_row4, text="Tanılama", width=button_width, command=self.show_diagnostics, style="secondary.TButton").pack(side="left", padx=5)
+
+        self.setup_search_bar(search_frame)
 
         # Table
         columns = ("ID", "Job Name", "Description", "Start Date", "End Date", "Estimated Cost", "Actual Cost", "Status")
@@ -594,16 +1009,35 @@ class FarmTaskTracker:
             self.table.column(col, width=column_widths[col])
         scrollbar_y = ttk.Scrollbar(table_frame, orient="vertical", command=self.table.yview)
         scrollbar_x = ttk.Scrollbar(table_frame, orient="horizontal", command=self.table.xview)
-        self.table.configure(yscrollcommand=scrollbar_y.set, xscrollcommand=scrollbar_x.set)
+        self.table.configure(xscrollcommand=scrollbar_x.set)
         scrollbar_y.pack(side="right", fill="y")
         scrollbar_x.pack(side="bottom", fill="x")
         self.table.pack(side="left", fill="both", expand=True)
+        # Only the rows in view are materialized; the table drives scrollbar_y itself
+        # Tasks of archived seasons are listed greyed out; changing them is refused
+        self.table.tag_configure("archived", foreground="gray")
+        self.table_view = VirtualTable(self.table, scrollbar_y, columns,
+                                       formatters={"Start Date": format_date, "End Date": format_date},
+                                       row_tags=lambda task_id: ("archived",) if self.core.is_archived(task_id) else ())
 
         # Show initial tasks
         self.show_tasks()
 
+    def on_close(self):
+        """Stop background jobs and close the window."""
+        self.jobs.shutdown()
+        self.figures.clear()
+        self.core.close()
+        try:
+            # Left next to the data so a slowness report can include it
+            metrics.dump(self.data_dir / "diagnostics.json")
+        except OSError:
+            pass
+        self.root.destroy()
+
     def run(self):
         """Start the application."""
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         self.root.mainloop()
 
 if __name__ == "__main__":
@@ -0,0 +1,269 @@
+"""Recurring task rules, expanded into occurrences only for the dates viewed.
+
+A rule stores one task template (its first occurrence) and how often it
+repeats. Occurrences are not stored as tasks: they are generated for the
+window being looked at and shown as Waiting tasks with negative IDs (see
+occurrence_id). An occurrence becomes a real task only when it is edited
+or marked Done; the rule then remembers it, like the occurrences that
+were deleted, so it isn't generated again.
+
+Rules live in a JSON file next to the task data, written atomically under
+an advisory lock so several processes can share it.
+"""
+import calendar
+import json
+import os
+from datetime import date, timedelta
+from pathlib import Path
+
+from locking import FileLock
+from storage import fsync_file
+
+UNITS = ("day", "week", "month")
+# Occurrence IDs of a rule form a block of this size below zero
+OCCURRENCE_LIMIT = 1 << 20
+
+
+def occurrence_id(rule_id, index):
+    """ID of the index-th occurrence of a rule; IDs grow with the index."""
+    return -(rule_id + 1) * OCCURRENCE_LIMIT + index
+
+
+def split_occurrence_id(task_id):
+    """Return (rule ID, occurrence index) of a negative occurrence ID."""
+    rule_id = (-task_id - 1) // OCCURRENCE_LIMIT
+    return rule_id, task_id + (rule_id + 1) * OCCURRENCE_LIMIT
+
+
+def add_months(day, months):
+    """Move day by whole months, clamping to the end of shorter months."""
+    month = day.month - 1 + months
+    year, month = day.year + month // 12, month % 12 + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+class Recurrence:
+    """One rule: a task template repeated every `every` days, weeks or months.
+
+    The series ends after `until` (the last possible start date) or after
+    `count` occurrences, whichever comes first, or never. `exceptions` maps
+    occurrence indexes to the task they became, or None if deleted.
+    """
+
+    def __init__(self, rule_id, job_name, description, start, duration, estimated_cost,
+                 every=1, unit="week", until=None, count=None, exceptions=None):
+        if unit not in UNITS:
+            raise ValueError(f"Tekrar birimi {', '.join(UNITS)} olmalı.")
+        if every < 1:
+            raise ValueError("Tekrar aralığı en az 1 olmalı.")
+        if until is not None and until < start:
+            raise ValueError("Tekrarın son tarihi başlangıç tarihinden önce olamaz!")
+        if count is not None and count < 1:
+            raise ValueError("Tekrar sayısı en az 1 olmalı.")
+        self.rule_id = rule_id
+        self.job_name = job_name
+        self.description = description
+        self.start = start
+        self.duration = duration
+        self.estimated_cost = estimated_cost
+        self.every = every
+        self.unit = unit
+        self.until = until
+        self.count = count
+        self.exceptions = dict(exceptions or {})
+
+    def occurrence_start(self, index):
+        if self.unit == "month":
+            return add_months(self.start, index * self.every)
+        return self.start + timedelta(days=index * self.every * (7 if self.unit == "week" else 1))
+
+    def last_index(self):
+        """Highest index the series can reach, leaving until aside."""
+        last = OCCURRENCE_LIMIT - 1
+        if self.count is not None:
+            last = min(last, self.count - 1)
+        return last
+
+    def indexes(self, first, last):
+        """Indexes of the occurrences active on at least one day of [first, last]."""
+        # Jump straight to the first candidate instead of walking from the start
+        earliest = first - timedelta(days=self.duration)
+        if self.unit == "month":
+            months = (earliest.year - self.start.year) * 12 + earliest.month - self.start.month
+            index = max(0, months // self.every - 1)
+        else:
+            step = self.every * (7 if self.unit == "week" else 1)
+            index = max(0, -(-(earliest - self.start).days // step))
+        while index <= self.last_index():
+            start = self.occurrence_start(index)
+            if start > last or (self.until is not None and start > self.until):
+                break
+            if start + timedelta(days=self.duration) >= first:
+                yield index
+            index += 1
+
+    def task(self, index):
+        """The occurrence as a raw task dict (text dates, like the backends store)."""
+        start = self.occurrence_start(index)
+        return {
+            "ID": occurrence_id(self.rule_id, index),
+            "Job Name": self.job_name,
+            "Description": self.description,
+            "Start Date": start.isoformat(),
+            "End Date": (start + timedelta(days=self.duration)).isoformat(),
+            "Estimated Cost": self.estimated_cost,
+            "Actual Cost": 0.0,
+            "Status": "Waiting",
+            "Version": 0,
+        }
+
+    def describe(self):
+        """Short Turkish description of the repetition, e.g. "Her 2 haftada"."""
+        if self.every == 1:
+            text = "Her " + {"day": "gün", "week": "hafta", "month": "ay"}[self.unit]
+        else:
+            text = f"Her {self.every} " + {"day": "günde", "week": "haftada", "month": "ayda"}[self.unit]
+        if self.until is not None:
+            text += f", {self.until.isoformat()} tarihine kadar"
+        if self.count is not None:
+            text += f", {self.count} kez"
+        return text
+
+    def to_json(self):
+        return {
+            "id": self.rule_id,
+            "Job Name": self.job_name,
+            "Description": self.description,
+            "Start Date": self.start.isoformat(),
+            "duration": self.duration,
+            "Estimated Cost": self.estimated_cost,
+            "every": self.every,
+            "unit": self.unit,
+            "until": self.until.isoformat() if self.until else None,
+            "count": self.count,
+            "exceptions": {str(index): task_id for index, task_id in sorted(self.exceptions.items())},
+        }
+
+    @classmethod
+    def from_json(cls, data):
+        return cls(
+            data["id"], data["Job Name"], data["Description"], date.fromisoformat(data["Start Date"]),
+            data["duration"], data["Estimated Cost"], data["every"], data["unit"],
+            date.fromisoformat(data["until"]) if data.get("until") else None, data.get("count"),
+            {int(index): task_id for index, task_id in data.get("exceptions", {}).items()},
+        )
+
+
+class RecurrenceStore:
+    """The rules of one data folder, re-read whenever another process changed the file.
+
+    version increases with every change seen, so it can key caches.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.lock = FileLock(self.path.with_name(self.path.name + ".lock"))
+        self.rules = {}
+        self.next_id = 1
+        self.version = 0
+        self._signature = None
+
+    def _file_signature(self):
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _refresh(self):
+        signature = self._file_signature()
+        if signature == self._signature:
+            return
+        data = {"next_id": 1, "rules": []}
+        if signature is not None:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        self.rules = {rule.rule_id: rule for rule in map(Recurrence.from_json, data["rules"])}
+        self.next_id = data["next_id"]
+        self._signature = signature
+        self.version += 1
+
+    def _save(self):
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"next_id": self.next_id, "rules": [rule.to_json() for rule in self.rules.values()]},
+                      f, ensure_ascii=False, indent=2)
+        fsync_file(tmp)
+        os.replace(tmp, self.path)
+        self._signature = self._file_signature()
+        self.version += 1
+
+    def current_version(self):
+        """Return version after picking up changes other processes made to the file."""
+        with self.lock:
+            self._refresh()
+            return self.version
+
+    def list(self):
+        """Return all rules ordered by ID."""
+        with self.lock:
+            self._refresh()
+            return [self.rules[rule_id] for rule_id in sorted(self.rules)]
+
+    def add(self, rule_fields):
+        """Store a new rule from Recurrence keyword arguments and return its ID."""
+        with self.lock:
+            self._refresh()
+            rule = Recurrence(self.next_id, **rule_fields)
+            self.rules[rule.rule_id] = rule
+            self.next_id += 1
+            self._save()
+            return rule.rule_id
+
+    def delete(self, rule_id):
+        """Delete a rule; tasks already made from its occurrences stay."""
+        with self.lock:
+            self._refresh()
+            if rule_id not in self.rules:
+                raise KeyError(f"Tekrar kuralı bulunamadı: {rule_id}")
+            del self.rules[rule_id]
+            self._save()
+
+    def occurrences(self, first, last):
+        """Raw task dicts of the pending occurrences active within [first, last], by ID."""
+        with self.lock:
+            self._refresh()
+            tasks = []
+            # Later rules have lower IDs, see occurrence_id
+            for rule_id in sorted(self.rules, reverse=True):
+                rule = self.rules[rule_id]
+                tasks.extend(rule.task(index) for index in rule.indexes(first, last) if index not in rule.exceptions)
+            return tasks
+
+    def get(self, task_id):
+        """The pending occurrence with this ID as a raw task dict."""
+        with self.lock:
+            self._refresh()
+            rule_id, index = split_occurrence_id(task_id)
+            rule = self.rules.get(rule_id)
+            if rule is None or index in rule.exceptions or index > rule.last_index():
+                raise KeyError(f"Görev bulunamadı: {task_id}")
+            task = rule.task(index)
+            if rule.until is not None and date.fromisoformat(task["Start Date"]) > rule.until:
+                raise KeyError(f"Görev bulunamadı: {task_id}")
+            return task
+
+    def resolve(self, task_id, make_task=None):
+        """Take a pending occurrence out of its series.
+
+        make_task, if given, is called with the lock held and returns the ID
+        of the real task that replaces the occurrence. Returns that ID, or
+        None when the occurrence is just dropped.
+        """
+        with self.lock:
+            self.get(task_id)
+            rule_id, index = split_occurrence_id(task_id)
+            new_id = make_task() if make_task is not None else None
+            self.rules[rule_id].exceptions[index] = new_id
+            self._save()
+            return new_id
@@ -0,0 +1,259 @@
+"""Headless batch reports: one PDF per job and per month, plus summary sheets.
+
+The reports of each season go in a fixed layout under the output folder:
+
+    <season>/jobs/<job>.pdf         timeline and monthly costs of one job
+    <season>/months/<YYYY-MM>.pdf   timeline and per-job costs of one month
+    <season>/summary.xlsx           per-job and per-month totals under the season title
+    reports.json                    fingerprint of each report's input
+
+A task belongs to the season and month its Start Date falls in; tasks
+without a start date are left out. Reports are rendered by a pool of
+worker processes, each drawing one figure at a time on an Agg canvas, so
+the run scales with the number of cores. A report whose input tasks are
+unchanged since the last run (same fingerprint in reports.json) and whose
+file still exists is skipped. Every file is written to a temporary name
+first, so an interrupted run never leaves a half-written report.
+"""
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+
+from charts import build_calendar_figure, build_cost_figure
+from export import cell_rows
+from instrumentation import timed
+from search_index import fold
+from seasons import SEASON_START_MONTH, season_label, task_seasons
+from storage import fsync_file
+
+MANIFEST_NAME = "reports.json"
+# Bump when the report contents change, so that every report is rebuilt
+FORMAT_VERSION = 2
+# The columns a report shows; Version alone changing doesn't rebuild it
+REPORT_COLUMNS = ["ID", "Job Name", "Description", "Start Date", "End Date",
+                  "Estimated Cost", "Actual Cost", "Status"]
+SUMMARY_COLUMNS = ["Görev Sayısı", "Tamamlanan", "Bekleyen", "Gerçekleşen Maliyet",
+                   "Beklenen Maliyet", "İlk Başlangıç", "Son Bitiş"]
+
+
+def slug(name):
+    """File-name-safe form of a job name, e.g. "İlaçlama (Parsel 3)" -> "ilaclama-parsel-3"."""
+    text = re.sub(r"[^a-z0-9]+", "-", fold(name) if isinstance(name, str) else "")
+    return text.strip("-")[:60] or "is"
+
+
+def _unique_slugs(names):
+    """Map sorted names to distinct slugs, numbering repeats in name order."""
+    used, slugs = set(), {}
+    for name in names:
+        base = candidate = slug(name)
+        number = 1
+        while candidate in used:
+            number += 1
+            candidate = f"{base}-{number}"
+        used.add(candidate)
+        slugs[name] = candidate
+    return slugs
+
+
+def fingerprint(df, kind, title):
+    """Hash of the tasks a report is built from, with its kind and title."""
+    digest = hashlib.sha256(f"{FORMAT_VERSION}|{kind}|{title}".encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df[REPORT_COLUMNS], index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _task_labels(df):
+    """One timeline row per task: "#ID description", or the start date without one."""
+    description = df["Description"].fillna("").astype(str).str.strip()
+    detail = description.where(description != "", df["Start Date"].dt.strftime("%Y-%m-%d"))
+    return "#" + df["ID"].astype("int64").astype(str) + " " + detail.str.slice(0, 40)
+
+
+def summarize_groups(df, by):
+    """Per-group task counts, costs and date span as a frame with SUMMARY_COLUMNS."""
+    done = df["Status"] == "Done"
+    waiting = df["Status"] == "Waiting"
+    groups = pd.DataFrame({
+        "group": by,
+        "done": done,
+        "waiting": waiting,
+        "actual": df["Actual Cost"].where(done, 0).astype(float),
+        "estimated": df["Estimated Cost"].where(waiting, 0).astype(float),
+        "start": df["Start Date"],
+        "end": df["End Date"],
+    }).groupby("group", sort=True).agg(
+        count=("done", "size"),
+        done=("done", "sum"),
+        waiting=("waiting", "sum"),
+        actual=("actual", "sum"),
+        estimated=("estimated", "sum"),
+        start=("start", "min"),
+        end=("end", "max"),
+    )
+    groups.columns = SUMMARY_COLUMNS
+    return groups
+
+
+def _replace(tmp, path):
+    fsync_file(tmp)
+    os.replace(tmp, path)
+
+
+def _write_pdf(path, kind, title, df):
+    from matplotlib.backends.backend_pdf import PdfPages
+    if kind == "job":
+        timeline = build_calendar_figure(df.assign(**{"Job Name": _task_labels(df)}), title)
+        costs = build_cost_figure(df, df["Start Date"].dt.strftime("%Y-%m"), f"{title} - Aylık Maliyet")
+    else:
+        timeline = build_calendar_figure(df, title)
+        costs = build_cost_figure(df, df["Job Name"], f"{title} - İş Bazında Maliyet")
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    # No creation date, so that the same tasks always give the same file
+    with PdfPages(tmp, metadata={"Title": title, "CreationDate": None}) as pdf:
+        for fig in (timeline, costs):
+            # Both figures are already laid out tight; a tight bbox would draw them twice
+            pdf.savefig(fig)
+            fig.clear()
+    _replace(tmp, path)
+
+
+def _write_summary(path, title, df):
+    from openpyxl import Workbook
+    workbook = Workbook(write_only=True)
+    sheets = (("İşler", "İş", df["Job Name"].fillna("")),
+              ("Aylar", "Ay", df["Start Date"].dt.strftime("%Y-%m")))
+    for sheet_name, header, by in sheets:
+        sheet = workbook.create_sheet(sheet_name)
+        # Title row, then a blank row above the table
+        sheet.append([title])
+        sheet.append([])
+        sheet.append([header] + SUMMARY_COLUMNS)
+        groups = summarize_groups(df, by)
+        for row in cell_rows(groups.reset_index()):
+            sheet.append(row)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    workbook.save(tmp)
+    _replace(tmp, path)
+
+
+def _render(root, report):
+    """Write one report; runs in a worker process. Returns its relative path."""
+    relpath, kind, title, df = report
+    path = Path(root) / relpath
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if kind == "summary":
+        _write_summary(path, title, df)
+    else:
+        _write_pdf(path, kind, title, df)
+    return relpath
+
+
+def plan_reports(df, seasons=None, start_month=SEASON_START_MONTH):
+    """Return the reports for the typed tasks as (relative path, kind, title, tasks), in path order.
+
+    seasons, if given, limits the reports to those seasons.
+    """
+    df = df[df["Start Date"].notna()].sort_values("ID", kind="stable")
+    season_of = pd.Series(task_seasons(df, start_month), index=df.index).astype("int64")
+    reports = []
+    for season, tasks in df.groupby(season_of, sort=True):
+        if seasons is not None and season not in seasons:
+            continue
+        label = season_label(season, start_month)
+        folder = label.replace("/", "-")
+        reports.append((f"{folder}/summary.xlsx", "summary", f"{label} Sezonu Özeti", tasks))
+        names = tasks["Job Name"].fillna("")
+        slugs = _unique_slugs(sorted(names.unique()))
+        for name, job in tasks.groupby(names, sort=True):
+            reports.append((f"{folder}/jobs/{slugs[name]}.pdf", "job", f"{name} ({label})", job))
+        months = tasks["Start Date"].dt.strftime("%Y-%m")
+        for month, tasks_of_month in tasks.groupby(months, sort=True):
+            reports.append((f"{folder}/months/{month}.pdf", "month", f"{month} Görevleri", tasks_of_month))
+    return sorted(reports, key=lambda report: report[0])
+
+
+def _load_manifest(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data.get("reports", {}) if data.get("version") == FORMAT_VERSION else {}
+
+
+def _save_manifest(path, reports):
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": FORMAT_VERSION, "reports": dict(sorted(reports.items()))},
+                  f, ensure_ascii=False, indent=2)
+    _replace(tmp, path)
+
+
+@timed("report")
+def build_reports(df, out_dir, seasons=None, workers=None, force=False, progress=None,
+                  start_month=SEASON_START_MONTH):
+    """Write the reports of the typed tasks in df under out_dir.
+
+    workers is the number of worker processes (default: one per core; 1
+    renders in this process). force rebuilds unchanged reports too.
+    progress, if given, is called as progress(reports done, reports to
+    write). Reports tracked in reports.json that no longer have tasks are
+    deleted. Returns the counts of written, skipped and removed reports.
+    """
+    root = Path(out_dir)
+    root.mkdir(parents=True, exist_ok=True)
+    manifest_path = root / MANIFEST_NAME
+    previous = _load_manifest(manifest_path)
+    planned = plan_reports(df, seasons, start_month)
+
+    done, pending = {}, []
+    for report in planned:
+        relpath, kind, title, tasks = report
+        digest = fingerprint(tasks, kind, title)
+        if not force and previous.get(relpath) == digest and (root / relpath).exists():
+            done[relpath] = digest
+        else:
+            pending.append((report, digest))
+    skipped = len(done)
+
+    # Reports of seasons outside the selection are kept as they are
+    kept = {}
+    if seasons is not None:
+        selected = {season_label(season, start_month).replace("/", "-") for season in seasons}
+        kept = {relpath: digest for relpath, digest in previous.items() if relpath.split("/")[0] not in selected}
+    removed = 0
+    for relpath in set(previous) - set(kept) - {report[0] for report in planned}:
+        try:
+            (root / relpath).unlink()
+            removed += 1
+        except FileNotFoundError:
+            pass
+
+    # Largest reports first, so that no worker is left with a big one at the end
+    pending.sort(key=lambda item: -len(item[0][3]))
+    digests = {report[0]: digest for report, digest in pending}
+    workers = min(workers or os.cpu_count() or 1, max(len(pending), 1))
+    try:
+        if workers == 1:
+            for count, (report, digest) in enumerate(pending, 1):
+                done[_render(root, report)] = digest
+                if progress is not None:
+                    progress(count, len(pending))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_render, str(root), report) for report, _ in pending]
+                for count, future in enumerate(as_completed(futures), 1):
+                    relpath = future.result()
+                    done[relpath] = digests[relpath]
+                    if progress is not None:
+                        progress(count, len(pending))
+    finally:
+        # Whatever was written stays recorded, even if a report failed
+        _save_manifest(manifest_path, dict(kept, **done))
+    return {"written": len(done) - skipped, "skipped": skipped, "removed": removed}
@@ -0,0 +1,91 @@
+import pandas as pd
+
+from storage import TASK_COLUMNS, with_versions
+
+STATUSES = ["Done", "Waiting"]
+CATEGORICAL_COLUMNS = ["Job Name", "Status"]
+DATE_COLUMNS = ["Start Date", "End Date"]
+COST_COLUMNS = ["Estimated Cost", "Actual Cost"]
+
+
+class SchemaError(ValueError):
+    """Raised when task data doesn't fit the task schema."""
+
+
+def parse_dates(values):
+    """Parse a column of dates to datetime64, invalid entries becoming NaT."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    return pd.to_datetime(values, errors="coerce", format="ISO8601")
+
+
+def parse_costs(values):
+    """Parse a column of costs to float64, invalid entries becoming NaN."""
+    if values.dtype == "float64":
+        return values
+    return pd.to_numeric(values, errors="coerce").astype("float64")
+
+
+def to_typed(df):
+    """Validate raw task rows and convert them to compact typed columns.
+
+    Dates become datetime64, costs float64, and Job Name / Status become
+    categoricals, so consumers never have to parse strings again.
+    """
+    df = with_versions(df)
+    missing = [col for col in TASK_COLUMNS if col not in df.columns]
+    if missing:
+        raise SchemaError(f"Eksik sütunlar: {', '.join(missing)}")
+
+    ids = df["ID"] if df["ID"].dtype == "int64" else pd.to_numeric(df["ID"], errors="coerce")
+    if ids.isna().any():
+        raise SchemaError("Geçersiz görev ID'si içeren satırlar var.")
+    if ids.duplicated().any():
+        raise SchemaError("Aynı ID'ye sahip birden fazla görev var.")
+
+    status = df["Status"].astype(str)
+    unknown = set(status.unique()) - set(STATUSES)
+    if unknown:
+        raise SchemaError(f"Bilinmeyen görev durumu: {', '.join(sorted(unknown))}")
+
+    return pd.DataFrame({
+        "ID": ids.astype("int64"),
+        "Job Name": pd.Categorical(df["Job Name"].fillna("").astype(str)),
+        "Description": df["Description"].fillna("").astype(str),
+        "Start Date": parse_dates(df["Start Date"]),
+        "End Date": parse_dates(df["End Date"]),
+        "Estimated Cost": parse_costs(df["Estimated Cost"]).fillna(0.0),
+        "Actual Cost": parse_costs(df["Actual Cost"]).fillna(0.0),
+        "Status": pd.Categorical(status, categories=STATUSES),
+        "Version": df["Version"],
+    }, index=df.index, copy=False)
+
+
+def add_categories(df, task):
+    """Return df with the categorical values of task added to its categories."""
+    for col in CATEGORICAL_COLUMNS:
+        if task[col] not in df[col].cat.categories:
+            df = df.copy(deep=False)
+            df[col] = df[col].cat.add_categories([task[col]])
+    return df
+
+
+def append_rows(df, rows):
+    """Concatenate typed frames without losing the categorical dtypes."""
+    rows = rows.copy(deep=False)
+    for col in CATEGORICAL_COLUMNS:
+        new = rows[col].cat.categories.difference(df[col].cat.categories)
+        if len(new):
+            df = df.copy(deep=False)
+            df[col] = df[col].cat.add_categories(new)
+        rows[col] = rows[col].cat.set_categories(df[col].cat.categories)
+    return pd.concat([df, rows])
+
+
+def format_date(value):
+    """Format a date cell as YYYY-MM-DD for display ('' when missing)."""
+    if isinstance(value, str):
+        return value
+    if value is None or pd.isna(value):
+        return ""
+    return value.strftime("%Y-%m-%d")
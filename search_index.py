@@ -0,0 +1,185 @@
+import re
+import threading
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+COST_FIELDS = ("Estimated Cost", "Actual Cost")
+
+# str.lower() maps "I" to "i" and "İ" to "i" plus a combining dot
+_TURKISH_LOWER = str.maketrans({"I": "ı", "İ": "i"})
+# So that "ilaclama", typed without Turkish letters, still finds "İlaçlama"
+_ASCII = str.maketrans("çğıöşüâîû", "cgiosuaiu")
+_WORD = re.compile(r"\w+")
+
+
+def fold(text):
+    """Lower-case text by Turkish rules, then drop the Turkish diacritics."""
+    return text.translate(_TURKISH_LOWER).lower().translate(_ASCII)
+
+
+def tokenize(text):
+    """Return the folded words of text (nothing for missing values)."""
+    if not isinstance(text, str):
+        return []
+    return _WORD.findall(fold(text))
+
+
+def text_mask(df, text):
+    """Rows of a frame matching text as SearchIndex.search matches it, without an index.
+
+    For small frames, e.g. the archived tasks left after pruning.
+    """
+    mask = np.ones(len(df), dtype=bool)
+    query = list(dict.fromkeys(tokenize(text)))
+    if not query:
+        return mask
+    # Each distinct job name or description is tokenized once
+    columns = []
+    for col in ("Job Name", "Description"):
+        codes, uniques = pd.factorize(df[col])
+        columns.append((codes, [tokenize(value) for value in uniques]))
+    for prefix in query:
+        found = np.zeros(len(df), dtype=bool)
+        for codes, words in columns:
+            hits = np.array([any(word.startswith(prefix) for word in value) for value in words] + [False])
+            found |= hits[codes]
+        mask &= found
+    return mask
+
+
+class SearchIndex:
+    """Store listener indexing task text, status and costs for search().
+
+    Words of Job Name and Description are folded (see fold) into an
+    inverted index whose vocabulary is kept sorted, so each query word is
+    matched as a prefix with a bisect; this is what lets results follow
+    the user while a word is still being typed. Status keeps one ID set
+    per value and each cost column a sorted (cost, ID) list for ranges.
+    A query intersects the candidate sets smallest first.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset(None)
+
+    def reset(self, df):
+        with self._lock:
+            self.postings = defaultdict(set)
+            self.by_status = defaultdict(set)
+            self.costs = {}
+            self.by_cost = [[] for _ in COST_FIELDS]
+            if df is not None and len(df):
+                ids = df["ID"].to_numpy()
+                # Grouping by text tokenizes each distinct job name or description once
+                for col in ("Job Name", "Description"):
+                    for text, positions in df.groupby(col, observed=True, sort=False).indices.items():
+                        group = ids[positions].tolist()
+                        for word in tokenize(text):
+                            self.postings[word].update(group)
+                for status, positions in df.groupby("Status", observed=True, sort=False).indices.items():
+                    self.by_status[status] = set(ids[positions].tolist())
+                costs = [df[col].to_numpy(dtype=float) for col in COST_FIELDS]
+                self.costs = dict(zip(ids.tolist(), zip(*(values.tolist() for values in costs))))
+                for i, values in enumerate(costs):
+                    # NaN costs never match a range
+                    known = ~np.isnan(values)
+                    order = np.lexsort((ids[known], values[known]))
+                    self.by_cost[i] = list(zip(values[known][order].tolist(), ids[known][order].tolist()))
+            self.vocabulary = sorted(self.postings)
+
+    def inserted(self, task):
+        with self._lock:
+            self._add(task)
+
+    def updated(self, old, new):
+        with self._lock:
+            self._remove(old)
+            self._add(new)
+
+    def deleted(self, task):
+        with self._lock:
+            self._remove(task)
+
+    @staticmethod
+    def _words(task):
+        return set(tokenize(task["Job Name"])) | set(tokenize(task["Description"]))
+
+    def _add(self, task):
+        task_id = int(task["ID"])
+        for word in self._words(task):
+            if word not in self.postings:
+                insort(self.vocabulary, word)
+            self.postings[word].add(task_id)
+        self.by_status[task["Status"]].add(task_id)
+        self.costs[task_id] = tuple(float(task[col]) for col in COST_FIELDS)
+        for i, cost in enumerate(self.costs[task_id]):
+            if cost == cost:
+                insort(self.by_cost[i], (cost, task_id))
+
+    def _remove(self, task):
+        # task holds the values the task was indexed with
+        task_id = int(task["ID"])
+        if task_id not in self.costs:
+            return
+        for word in self._words(task):
+            postings = self.postings.get(word)
+            if postings is None:
+                continue
+            postings.discard(task_id)
+            if not postings:
+                del self.postings[word]
+                del self.vocabulary[bisect_left(self.vocabulary, word)]
+        self.by_status[task["Status"]].discard(task_id)
+        for i, cost in enumerate(self.costs.pop(task_id)):
+            if cost == cost:
+                del self.by_cost[i][bisect_left(self.by_cost[i], (cost, task_id))]
+
+    def _prefixed(self, prefix):
+        """IDs of tasks with a word starting with prefix."""
+        ids = set()
+        pos = bisect_left(self.vocabulary, prefix)
+        while pos < len(self.vocabulary) and self.vocabulary[pos].startswith(prefix):
+            ids |= self.postings[self.vocabulary[pos]]
+            pos += 1
+        return ids
+
+    def search(self, text="", status=None, min_cost=None, max_cost=None, cost_field=COST_FIELDS[0], candidates=None):
+        """Return the sorted IDs of tasks matching every given criterion.
+
+        Each word of text must begin a word of the job name or description;
+        costs are compared on cost_field, bounds included. candidates, if
+        given, limits the result to those IDs (e.g. a date range query).
+        """
+        if cost_field not in COST_FIELDS:
+            raise ValueError(f"Maliyet alanı {' veya '.join(COST_FIELDS)} olmalı.")
+        with self._lock:
+            sets = [self._prefixed(word) for word in dict.fromkeys(tokenize(text))]
+            if status:
+                sets.append(self.by_status.get(status, set()))
+            if candidates is not None:
+                sets.append(set(candidates))
+
+            cost_check = None
+            if min_cost is not None or max_cost is not None:
+                low = float("-inf") if min_cost is None else float(min_cost)
+                high = float("inf") if max_cost is None else float(max_cost)
+                column = COST_FIELDS.index(cost_field)
+                by_cost = self.by_cost[column]
+                lo = bisect_left(by_cost, (low, -1))
+                hi = bisect_right(by_cost, (high, float("inf")))
+                # Check the costs of the other candidates instead, if there are fewer of them
+                if sets and min(map(len, sets)) < hi - lo:
+                    cost_check = lambda task_id: low <= self.costs[task_id][column] <= high
+                else:
+                    sets.append({task_id for _, task_id in by_cost[lo:hi]})
+
+            if not sets:
+                return sorted(self.costs)
+            sets.sort(key=len)
+            result = sets[0].intersection(*sets[1:])
+            if cost_check is not None:
+                result = filter(cost_check, result)
+            return sorted(result)
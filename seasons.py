@@ -0,0 +1,266 @@
+"""Orchard seasons, and closed seasons archived as read-only partitions.
+
+A season is the year starting on the first day of SEASON_START_MONTH
+(FARMTASKS_SEASON_START; 1, the default, means calendar years, 11 a
+November to October season). A task belongs to the season its Start
+Date falls in.
+
+Freezing a closed season moves its tasks out of the task store into a
+columnar file (see columnar.py) under seasons/. The manifest,
+seasons.json, records each partition's date, cost and ID ranges plus the
+totals the statistics need. Date-filtered reads check the manifest first
+and only open partitions that can hold a match, and statistics use the
+recorded totals without opening any.
+"""
+import json
+import os
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from columnar import read_columns, write_columns
+from date_index import CONTAINED
+from locking import FileLock
+from recurrence import add_months
+from schema import COST_COLUMNS
+from storage import TASK_COLUMNS, fsync_file
+
+SEASON_START_MONTH = int(os.environ.get("FARMTASKS_SEASON_START", "1"))
+
+
+class FrozenSeasonError(ValueError):
+    """Raised when a change would touch an archived season."""
+
+
+def season_of(day, start_month=SEASON_START_MONTH):
+    """The season containing day, named by the year it starts in."""
+    return day.year if day.month >= start_month else day.year - 1
+
+
+def season_bounds(season, start_month=SEASON_START_MONTH):
+    """First and last day of a season."""
+    first = date(season, start_month, 1)
+    return first, add_months(first, 12) - timedelta(days=1)
+
+
+def season_label(season, start_month=SEASON_START_MONTH):
+    """"2024" for calendar-year seasons, "2024/25" otherwise."""
+    if start_month == 1:
+        return str(season)
+    return f"{season}/{(season + 1) % 100:02d}"
+
+
+def task_seasons(df, start_month=SEASON_START_MONTH):
+    """Season of every task of a typed frame, as floats (NaN without a start date)."""
+    start = df["Start Date"]
+    return (start.dt.year - (start.dt.month < start_month)).to_numpy(dtype=float)
+
+
+def _day(value):
+    return None if pd.isna(value) else value.date().isoformat()
+
+
+def summarize(df):
+    """Date, cost and ID ranges of a partition plus its statistics totals."""
+    start, end = df["Start Date"], df["End Date"]
+    dated = start.notna() & end.notna()
+    months = (start.dt.year * 12 + start.dt.month - 1).dropna().astype("int64").value_counts()
+    return {
+        "rows": len(df),
+        "id_min": int(df["ID"].min()),
+        "id_max": int(df["ID"].max()),
+        "start_min": _day(start.min()),
+        "start_max": _day(start.max()),
+        "end_min": _day(end.min()),
+        "end_max": _day(end.max()),
+        "costs": {col: [float(df[col].min()), float(df[col].max())] for col in COST_COLUMNS},
+        # The same totals TaskAggregates keeps for the tasks in the store
+        "statuses": {str(status): int(count) for status, count in df["Status"].value_counts().items() if count},
+        "actual": float(df.loc[df["Status"] == "Done", "Actual Cost"].sum()),
+        "estimated": float(df.loc[df["Status"] == "Waiting", "Estimated Cost"].sum()),
+        "months": {str(month): int(count) for month, count in sorted(months.items())},
+        "duration_sum": int((end[dated] - start[dated]).dt.days.sum()),
+        "duration_count": int(dated.sum()),
+    }
+
+
+def _may_match(entry, start, end, mode, cost_field, min_cost, max_cost):
+    """Whether a partition can hold a task matching the filters, judged by its manifest entry."""
+    if start is not None:
+        # For contained tasks the latest start must reach the range, otherwise the latest end must
+        latest = entry["start_max"] if mode == CONTAINED else (entry["end_max"] or entry["start_max"])
+        if latest < start:
+            return False
+    if end is not None:
+        earliest = (entry["end_min"] or entry["start_min"]) if mode == CONTAINED else entry["start_min"]
+        if earliest > end:
+            return False
+    low, high = entry["costs"][cost_field]
+    return not ((min_cost is not None and high < min_cost) or (max_cost is not None and low > max_cost))
+
+
+class SeasonArchive:
+    """The manifest of frozen seasons and their partition files.
+
+    Like RecurrenceStore, the manifest is re-read whenever another process
+    changed it, and version grows with every change seen. Once a season
+    is frozen, the season boundary recorded in the manifest wins over
+    FARMTASKS_SEASON_START, so existing partitions stay consistent.
+    """
+
+    def __init__(self, path, start_month=SEASON_START_MONTH):
+        self.path = Path(path)
+        self.directory = self.path.with_suffix("")
+        self.lock = FileLock(self.path.with_name(self.path.name + ".lock"))
+        self.start_month = start_month
+        self.partitions = {}
+        self.version = 0
+        self._signature = None
+        self._frames = {}
+
+    def _file_signature(self):
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _refresh(self):
+        signature = self._file_signature()
+        if signature == self._signature:
+            return
+        data = {"start_month": self.start_month, "partitions": []}
+        if signature is not None:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        self.start_month = data["start_month"]
+        self.partitions = {entry["season"]: entry for entry in data["partitions"]}
+        self._frames = {season: df for season, df in self._frames.items() if season in self.partitions}
+        self._signature = signature
+        self.version += 1
+
+    def _save(self):
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"start_month": self.start_month,
+                       "partitions": [self.partitions[season] for season in sorted(self.partitions)]},
+                      f, ensure_ascii=False, indent=2)
+        fsync_file(tmp)
+        os.replace(tmp, self.path)
+        self._signature = self._file_signature()
+        self.version += 1
+
+    def current_version(self):
+        """Return version after picking up changes other processes made to the file."""
+        with self.lock:
+            self._refresh()
+            return self.version
+
+    def list(self):
+        """Return the manifest entries of the frozen seasons, oldest first."""
+        with self.lock:
+            self._refresh()
+            return [self.partitions[season] for season in sorted(self.partitions)]
+
+    def frozen(self, season):
+        with self.lock:
+            self._refresh()
+            return season in self.partitions
+
+    def _frame(self, entry):
+        """The typed tasks of a partition, memory-mapped on first use."""
+        df = self._frames.get(entry["season"])
+        if df is None:
+            cached = read_columns(self.directory / entry["file"], [entry["season"], entry["rows"]])
+            if cached is None:
+                raise ValueError(f"Arşivlenmiş sezon dosyası okunamadı: {entry['file']}")
+            df = cached[0]
+            df.index = pd.Index(df["ID"].to_numpy())
+            self._frames[entry["season"]] = df
+        return df
+
+    def select(self, start=None, end=None, mode=CONTAINED, min_cost=None, max_cost=None,
+               cost_field=COST_COLUMNS[0]):
+        """Return the archived tasks matching a date and cost range (bounds optional, included).
+
+        Only partitions whose manifest ranges can match are read.
+        """
+        start = None if start is None else pd.Timestamp(start)
+        end = None if end is None else pd.Timestamp(end)
+        with self.lock:
+            self._refresh()
+            frames = []
+            for season in sorted(self.partitions):
+                entry = self.partitions[season]
+                if not _may_match(entry, start and start.date().isoformat(), end and end.date().isoformat(),
+                                  mode, cost_field, min_cost, max_cost):
+                    continue
+                df = self._frame(entry)
+                mask = np.ones(len(df), dtype=bool)
+                if start is not None:
+                    mask &= (df["Start Date"] if mode == CONTAINED else df["End Date"]).to_numpy() >= start
+                if end is not None:
+                    mask &= (df["End Date"] if mode == CONTAINED else df["Start Date"]).to_numpy() <= end
+                if min_cost is not None:
+                    mask &= df[cost_field].to_numpy() >= min_cost
+                if max_cost is not None:
+                    mask &= df[cost_field].to_numpy() <= max_cost
+                frames.append(df[mask])
+        if not frames:
+            return None
+        return pd.concat(frames) if len(frames) > 1 else frames[0]
+
+    def _entry_of(self, task_id):
+        for entry in self.partitions.values():
+            if entry["id_min"] <= task_id <= entry["id_max"] and task_id in self._frame(entry).index:
+                return entry
+        return None
+
+    def contains(self, task_id):
+        """Whether the task is archived."""
+        with self.lock:
+            self._refresh()
+            return self._entry_of(task_id) is not None
+
+    def get(self, task_id):
+        """Return an archived task as a dict of typed values."""
+        with self.lock:
+            self._refresh()
+            entry = self._entry_of(task_id)
+            if entry is None:
+                raise KeyError(f"Görev bulunamadı: {task_id}")
+            return self._frame(entry).loc[task_id].to_dict()
+
+    def freeze(self, season, df):
+        """Write a season's typed tasks as a partition and add it to the manifest.
+
+        The entry is marked incomplete until complete() is called, once
+        the tasks are gone from the store.
+        """
+        with self.lock:
+            self._refresh()
+            if season in self.partitions:
+                raise FrozenSeasonError(f"{season_label(season, self.start_month)} sezonu zaten arşivlenmiş.")
+            self.directory.mkdir(exist_ok=True)
+            entry = dict(summarize(df), season=season, label=season_label(season, self.start_month),
+                         file=f"{season}.columns", frozen_at=datetime.now().isoformat(timespec="seconds"),
+                         complete=False)
+            if not write_columns(self.directory / entry["file"], df[TASK_COLUMNS].reset_index(drop=True),
+                                 [season, entry["rows"]]):
+                raise ValueError("Sezon görevleri arşiv dosyasına yazılamadı.")
+            self.partitions[season] = entry
+            self._save()
+            return entry
+
+    def complete(self, season):
+        with self.lock:
+            self._refresh()
+            self.partitions[season]["complete"] = True
+            self._save()
+
+    def archived_ids(self, season):
+        with self.lock:
+            self._refresh()
+            return self._frame(self.partitions[season])["ID"].tolist()
@@ -0,0 +1,407 @@
+"""Asynchronous HTTP/1.1 JSON API over the task store, standard library only.
+
+    python cli.py serve --port 8765
+
+    GET    /tasks?status=Waiting&start=2025-01-01&end=2025-12-31&mode=overlapping&offset=0&limit=100
+    GET    /tasks?q=budama&min_cost=100&max_cost=500&cost_field=Actual%20Cost
+    GET    /tasks/<id>
+    POST   /tasks                 body: {"Job Name": ..., "Start Date": ..., ...}
+    PUT    /tasks/<id>            body: the fields to change
+    DELETE /tasks/<id>
+    GET    /statistics
+    GET    /expenses?start=2025-01-01&end=2025-03-31&mode=contained
+
+Pending occurrences of recurring tasks have negative IDs. Listings include
+those within the requested dates (the next days, if left open); a PUT to
+one turns it into a task, answered with 201 and the new task's Location,
+and a DELETE drops that one occurrence.
+
+Responses to GET carry an ETag. Collections are tagged with the store's
+data version, so a poller sending If-None-Match gets an empty 304 until
+something changes. Single tasks are tagged with their Version, and a PUT
+sent with that ETag in If-Match fails with 412 rather than overwriting a
+newer edit. Connections are kept alive between requests. Store calls run
+in worker threads, so a slow disk or a lock wait doesn't stall other
+clients. The server listens on localhost only unless told otherwise, and
+has no authentication.
+"""
+import asyncio
+import json
+import re
+import secrets
+from datetime import datetime
+from http import HTTPStatus
+from urllib.parse import urlsplit, parse_qs
+
+import pandas as pd
+
+from core import build_task, ConflictError, LockTimeout, TaskValidationError
+from date_index import CONTAINED, OVERLAPPING
+from schema import STATUSES, DATE_COLUMNS, format_date
+from search_index import COST_FIELDS
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+MAX_BODY = 1024 * 1024
+MAX_HEADERS = 100
+# Seconds an idle kept-alive connection stays open
+IDLE_TIMEOUT = 30
+
+TASK_ETAG = re.compile(r'^(?:W/)?"(-?\d+)-(\d+)"$')
+
+
+class HTTPError(Exception):
+    """An error answered with the given status and a JSON error message."""
+
+    def __init__(self, status, message=None, headers=None):
+        super().__init__(message or HTTPStatus(status).phrase)
+        self.status = status
+        self.headers = headers or {}
+
+
+class Request:
+    def __init__(self, method, target, version, headers, body):
+        url = urlsplit(target)
+        self.method = method
+        self.path = url.path
+        self.query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        self.version = version
+        self.headers = headers
+        self.body = body
+
+    @property
+    def keep_alive(self):
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+    def json(self):
+        try:
+            data = json.loads(self.body or b"{}")
+        except ValueError:
+            raise HTTPError(400, "Geçersiz JSON gövdesi.") from None
+        if not isinstance(data, dict):
+            raise HTTPError(400, "JSON gövdesi bir nesne olmalı.")
+        return data
+
+
+class Response:
+    def __init__(self, status=200, payload=None, headers=None):
+        self.status = status
+        self.body = b"" if payload is None else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.headers = headers or {}
+
+    def encode(self, keep_alive):
+        headers = {"Content-Length": str(len(self.body)), "Connection": "keep-alive" if keep_alive else "close"}
+        if self.body:
+            headers["Content-Type"] = "application/json; charset=utf-8"
+        headers.update(self.headers)
+        head = f"HTTP/1.1 {self.status} {HTTPStatus(self.status).phrase}\r\n"
+        head += "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+        return (head + "\r\n").encode("latin-1") + self.body
+
+
+async def read_request(reader):
+    """Read one request from the stream; None when the client closed it."""
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, version = line.decode("latin-1").split()
+    except ValueError:
+        raise HTTPError(400, "Geçersiz istek satırı.") from None
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        if len(headers) >= MAX_HEADERS:
+            raise HTTPError(431)
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if "transfer-encoding" in headers:
+        raise HTTPError(501, "Parçalı (chunked) istek gövdesi desteklenmiyor.")
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise HTTPError(400, "Geçersiz Content-Length.") from None
+    if length > MAX_BODY:
+        raise HTTPError(413)
+    body = await reader.readexactly(length) if length else b""
+    return Request(method.upper(), target, version, headers, body)
+
+
+def task_records(df):
+    """Convert typed task rows to JSON-ready dicts with YYYY-MM-DD dates."""
+    out = df.copy(deep=False)
+    for col in DATE_COLUMNS:
+        out[col] = out[col].map(format_date)
+    out = out.astype(object)
+    return out.where(out.notna(), None).to_dict("records")
+
+
+def statistics_payload(stats):
+    return {
+        "total_tasks": int(stats["total_tasks"]),
+        "done_tasks": int(stats["done_tasks"]),
+        "waiting_tasks": int(stats["waiting_tasks"]),
+        "total_actual_cost": round(float(stats["total_actual_cost"]), 2),
+        "total_estimated_cost": round(float(stats["total_estimated_cost"]), 2),
+        "avg_duration": round(float(stats["avg_duration"]), 1) if stats["total_tasks"] else None,
+        "status_counts": {str(status): int(count) for status, count in stats["status_counts"].items()},
+        "monthly_tasks": {str(month): int(count) for month, count in stats["monthly_tasks"].items()},
+    }
+
+
+def _date_param(query, name):
+    value = query.get(name)
+    if value is None:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").strftime("%Y-%m-%d")
+    except ValueError:
+        raise HTTPError(400, f"{name}: Tarih formatı YYYY-MM-DD olmalı!") from None
+
+
+def _int_param(query, name, default, maximum=None):
+    try:
+        value = int(query.get(name, default))
+    except ValueError:
+        raise HTTPError(400, f"{name} bir tam sayı olmalı.") from None
+    if value < 0 or (maximum is not None and value > maximum):
+        raise HTTPError(400, f"{name} 0 ile {maximum} arasında olmalı." if maximum else f"{name} negatif olamaz.")
+    return value
+
+
+def _cost_param(query, name):
+    value = query.get(name)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        raise HTTPError(400, f"{name} bir sayı olmalı.") from None
+
+
+def _range_params(query, required=False):
+    start, end = _date_param(query, "start"), _date_param(query, "end")
+    if (start is None) != (end is None) or (required and start is None):
+        raise HTTPError(400, "start ve end birlikte verilmeli.")
+    if start is not None and start > end:
+        raise HTTPError(400, "Başlangıç tarihi bitiş tarihinden sonra olamaz!")
+    mode = query.get("mode", CONTAINED)
+    if mode not in (CONTAINED, OVERLAPPING):
+        raise HTTPError(400, f"mode {CONTAINED} veya {OVERLAPPING} olmalı.")
+    return start, end, mode
+
+
+def task_from_json(data, current=None):
+    """Build a validated task from JSON fields, defaulting missing ones to current."""
+    def field(name, default):
+        if name in data:
+            return data[name]
+        if current is None:
+            return default
+        return format_date(current[name]) if name in DATE_COLUMNS else current[name]
+
+    status = field("Status", "Waiting")
+    if status not in STATUSES:
+        raise TaskValidationError(f"Status {' veya '.join(STATUSES)} olmalı!")
+    return build_task(
+        str(field("Job Name", "")),
+        str(field("Description", "")),
+        field("Start Date", ""),
+        field("End Date", ""),
+        field("Estimated Cost", None),
+        field("Actual Cost", 0),
+        status == "Done",
+    )
+
+
+class TaskAPI:
+    """Routes HTTP requests to a FarmTasks instance."""
+
+    def __init__(self, core):
+        self.core = core
+        # Store versions restart at 0 with every process; the token keeps
+        # ETags from one server run from matching those of another
+        self.instance = secrets.token_hex(4)
+
+    def _collection_etag(self, version):
+        return f'"{self.instance}.{version}"'
+
+    @staticmethod
+    def _task_etag(task):
+        return f'"{task["ID"]}-{task["Version"]}"'
+
+    async def handle(self, request):
+        try:
+            return await self._route(request)
+        except HTTPError as e:
+            return Response(e.status, {"error": str(e)}, e.headers)
+        except KeyError:
+            return Response(404, {"error": "Görev bulunamadı."})
+        except ConflictError as e:
+            return Response(412 if "if-match" in request.headers else 409, {"error": str(e), "version": e.current})
+        except LockTimeout as e:
+            return Response(503, {"error": str(e)}, {"Retry-After": "1"})
+        except ValueError as e:
+            return Response(400, {"error": str(e)})
+        except Exception as e:
+            return Response(500, {"error": f"Bir hata oluştu: {e}"})
+
+    async def _route(self, request):
+        parts = [part for part in request.path.split("/") if part]
+        if parts == ["tasks"]:
+            if request.method == "GET":
+                return await self._conditional(request, self._list_tasks, request.query)
+            if request.method == "POST":
+                return await self._create_task(request)
+            raise HTTPError(405, headers={"Allow": "GET, POST"})
+        if len(parts) == 2 and parts[0] == "tasks":
+            try:
+                task_id = int(parts[1])
+            except ValueError:
+                raise HTTPError(404) from None
+            if request.method == "GET":
+                return await self._get_task(request, task_id)
+            if request.method == "PUT":
+                return await self._update_task(request, task_id)
+            if request.method == "DELETE":
+                await asyncio.to_thread(self.core.delete, task_id)
+                return Response(204)
+            raise HTTPError(405, headers={"Allow": "GET, PUT, DELETE"})
+        if parts == ["statistics"]:
+            if request.method != "GET":
+                raise HTTPError(405, headers={"Allow": "GET"})
+            return await self._conditional(request, lambda: statistics_payload(self.core.statistics()))
+        if parts == ["expenses"]:
+            if request.method != "GET":
+                raise HTTPError(405, headers={"Allow": "GET"})
+            return await self._conditional(request, self._expenses, request.query)
+        raise HTTPError(404)
+
+    async def _conditional(self, request, build, *args):
+        """Answer 304 if the client's ETag is current, else build(*args) under one data version."""
+        version, _ = await asyncio.to_thread(self.core.versioned, lambda: None)
+        etag = self._collection_etag(version)
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(304, headers={"ETag": etag})
+        version, payload = await asyncio.to_thread(self.core.versioned, build, *args)
+        return Response(200, payload, {"ETag": self._collection_etag(version), "Cache-Control": "no-cache"})
+
+    def _list_tasks(self, query):
+        start, end, mode = _range_params(query)
+        status = query.get("status")
+        if status is not None and status not in STATUSES:
+            raise HTTPError(400, f"status {' veya '.join(STATUSES)} olmalı.")
+        offset = _int_param(query, "offset", 0)
+        limit = _int_param(query, "limit", DEFAULT_LIMIT, MAX_LIMIT)
+        cost_field = query.get("cost_field", COST_FIELDS[0])
+        if cost_field not in COST_FIELDS:
+            raise HTTPError(400, f"cost_field {' veya '.join(COST_FIELDS)} olmalı.")
+        df = self.core.search(query.get("q", ""), status, _cost_param(query, "min_cost"), _cost_param(query, "max_cost"),
+                              start, end, mode, cost_field, occurrences=True)
+        return {
+            "total": len(df),
+            "offset": offset,
+            "limit": limit,
+            "tasks": task_records(df.iloc[offset:offset + limit]),
+        }
+
+    def _expenses(self, query):
+        start, end, mode = _range_params(query, required=True)
+        df, total_actual, total_estimated = self.core.expenses(start, end, mode)
+        return {
+            "start": start,
+            "end": end,
+            "mode": mode,
+            "task_count": len(df),
+            "task_ids": [int(task_id) for task_id in df["ID"]],
+            "total_actual_cost": round(float(total_actual), 2),
+            "total_estimated_cost": round(float(total_estimated), 2),
+        }
+
+    def _task(self, task_id):
+        _, df = self.core.versioned(self.core.tasks)
+        if task_id not in df.index:
+            # Tasks of archived seasons are readable, though not in the store
+            return task_records(pd.DataFrame([self.core.get(task_id)]))[0]
+        return task_records(df.loc[[task_id]])[0]
+
+    async def _get_task(self, request, task_id):
+        task = await asyncio.to_thread(self._task, task_id)
+        etag = self._task_etag(task)
+        if etag in request.headers.get("if-none-match", ""):
+            return Response(304, headers={"ETag": etag})
+        return Response(200, task, {"ETag": etag, "Cache-Control": "no-cache"})
+
+    async def _create_task(self, request):
+        task = task_from_json(request.json())
+        task_id = await asyncio.to_thread(self.core.add, task)
+        created = await asyncio.to_thread(self._task, task_id)
+        return Response(201, created, {"Location": f"/tasks/{task_id}", "ETag": self._task_etag(created)})
+
+    async def _update_task(self, request, task_id):
+        data = request.json()
+        expected_version = data.get("Version")
+        if_match = request.headers.get("if-match")
+        if if_match and if_match != "*":
+            match = TASK_ETAG.match(if_match)
+            if not match or int(match.group(1)) != task_id:
+                raise HTTPError(412, "If-Match bu göreve ait değil.")
+            expected_version = int(match.group(2))
+
+        def update():
+            task = task_from_json(data, self.core.get(task_id))
+            if task_id < 0:
+                # An occurrence has no stored row to update; editing turns it into a task
+                return self._task(self.core.materialize(task_id, task))
+            self.core.update(task_id, task, expected_version)
+            return self._task(task_id)
+
+        updated = await asyncio.to_thread(update)
+        if task_id < 0:
+            return Response(201, updated, {"Location": f"/tasks/{updated['ID']}", "ETag": self._task_etag(updated)})
+        return Response(200, updated, {"ETag": self._task_etag(updated)})
+
+    async def serve_connection(self, reader, writer):
+        """Answer requests on one connection until the client closes it or goes idle."""
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(read_request(reader), IDLE_TIMEOUT)
+                except HTTPError as e:
+                    writer.write(Response(e.status, {"error": str(e)}, e.headers).encode(keep_alive=False))
+                    await writer.drain()
+                    break
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                if request is None:
+                    break
+                response = await self.handle(request)
+                writer.write(response.encode(request.keep_alive))
+                await writer.drain()
+                if not request.keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+async def serve(core, host=DEFAULT_HOST, port=DEFAULT_PORT, on_ready=None):
+    """Serve the API until cancelled; on_ready(server) is called once listening."""
+    api = TaskAPI(core)
+    server = await asyncio.start_server(api.serve_connection, host, port)
+    if on_ready is not None:
+        on_ready(server)
+    async with server:
+        await server.serve_forever()
@@ -0,0 +1,435 @@
+import os
+import sqlite3
+from contextlib import nullcontext
+from pathlib import Path
+
+import pandas as pd
+
+from locking import FileLock
+from columnar import read_columns, write_columns
+
+TASK_COLUMNS = [
+    "ID", "Job Name", "Description", "Start Date", "End Date",
+    "Estimated Cost", "Actual Cost", "Status", "Version"
+]
+# The fields a task is edited through; ID and Version are managed by the store
+FIELD_COLUMNS = TASK_COLUMNS[1:-1]
+
+# Column names used inside the SQLite table, in TASK_COLUMNS order
+SQL_COLUMNS = [
+    "id", "job_name", "description", "start_date", "end_date",
+    "estimated_cost", "actual_cost", "status", "version"
+]
+COLUMN_MAP = dict(zip(TASK_COLUMNS, SQL_COLUMNS))
+
+
+class ConflictError(RuntimeError):
+    """Raised when a task changed after the version an update was based on."""
+
+    def __init__(self, task_id, expected, current):
+        super().__init__(
+            f"Görev {task_id} siz düzenlerken başka bir kullanıcı tarafından değiştirildi "
+            f"(sürüm {expected} → {current})."
+        )
+        self.task_id = task_id
+        self.expected = expected
+        self.current = current
+
+
+class StorageBackend:
+    """Base class for the engines that persist farm tasks."""
+
+    def setup(self):
+        """Create the underlying store if it doesn't exist."""
+        raise NotImplementedError
+
+    def load(self):
+        """Return all tasks as a DataFrame with TASK_COLUMNS."""
+        raise NotImplementedError
+
+    def insert(self, task):
+        """Insert a task (dict keyed by column name) and return its ID."""
+        raise NotImplementedError
+
+    def insert_batch(self, tasks):
+        """Insert several tasks in one write and return their new IDs in order."""
+        raise NotImplementedError
+
+    def update(self, task_id, task, expected_version=None):
+        """Overwrite the fields of a task and return its new version.
+
+        Raises KeyError if the task doesn't exist and ConflictError if
+        expected_version is given and no longer current.
+        """
+        raise NotImplementedError
+
+    def delete(self, task_id):
+        """Delete a task."""
+        raise NotImplementedError
+
+    def delete_many(self, task_ids):
+        """Delete several tasks in one write; their IDs are not reused."""
+        for task_id in task_ids:
+            self.delete(task_id)
+
+    def replace_all(self, df, meta=None):
+        """Atomically replace every task (and optional meta values) with df."""
+        raise NotImplementedError
+
+    def get_meta(self, key, default=None):
+        """Return a stored meta value as text, or default."""
+        return default
+
+    def locked(self):
+        """Context manager excluding writers in other processes."""
+        return nullcontext()
+
+    def close(self):
+        """Release files and connections held by the engine."""
+
+    def signature(self):
+        """Return (mtime, size) pairs of the files backing the store."""
+        return tuple(
+            (stat.st_mtime_ns, stat.st_size)
+            for stat in (path.stat() for path in self.files() if path.exists())
+        )
+
+    def files(self):
+        """Return the paths whose changes invalidate cached tasks."""
+        return [self.path]
+
+
+class ExcelBackend(StorageBackend):
+    """Legacy engine that keeps every task in a single workbook.
+
+    Parsing the workbook is slow, so its contents are also kept in a
+    memory-mapped columnar file next to it (see columnar.py), written
+    along with every workbook we write and tagged with the workbook's
+    signature. Reads use that copy while the signature matches and parse
+    the workbook (refreshing the copy) only after it changed elsewhere,
+    e.g. when edited in Excel. The ID, cost and version columns stay views
+    of the map; the text columns, dates included, are decoded. The task
+    store still passes over every row once at startup to build its
+    indexes, so the copy saves the parsing, not that pass.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.columns_path = self.path.with_suffix(".columns")
+
+    def setup(self):
+        if not self.path.exists():
+            pd.DataFrame(columns=TASK_COLUMNS).to_excel(self.path, index=False)
+
+    def load(self):
+        return self._read()[0]
+
+    def _read(self):
+        """Return the task sheet and the meta values, parsing the workbook only if it changed."""
+        key = self.signature()
+        cached = read_columns(self.columns_path, key)
+        if cached is not None:
+            df, meta = cached
+            return with_versions(df), meta
+        sheets = pd.read_excel(self.path, sheet_name=None)
+        df = next(iter(sheets.values()))
+        meta = sheets.get("Meta")
+        meta = {} if meta is None else dict(zip(meta["Key"].astype(str), meta["Value"].astype(str)))
+        self._write_columns(df, meta, key)
+        return with_versions(df), meta
+
+    def _write_columns(self, df, meta, key):
+        try:
+            written = write_columns(self.columns_path, df, key, meta)
+        except OSError:
+            # Only a cache: e.g. Windows refuses to replace a file still mapped by a reader
+            written = False
+        if not written:
+            self.columns_path.unlink(missing_ok=True)
+
+    def insert(self, task):
+        return self.insert_batch([task])[0]
+
+    def insert_batch(self, tasks):
+        df, meta = self._read()
+        first_id = next_task_id(df, meta.get("next_id"))
+        ids = list(range(first_id, first_id + len(tasks)))
+        rows = pd.DataFrame(
+            [[task_id] + [task[col] for col in FIELD_COLUMNS] + [1] for task_id, task in zip(ids, tasks)],
+            columns=TASK_COLUMNS
+        )
+        df = pd.concat([df, rows], ignore_index=True)
+        self.replace_all(df, dict(meta, next_id=first_id + len(tasks)))
+        return ids
+
+    def update(self, task_id, task, expected_version=None):
+        df, meta = self._read()
+        matches = df.index[df["ID"] == task_id]
+        if not len(matches):
+            raise KeyError(f"Görev bulunamadı: {task_id}")
+        idx = matches[0]
+        version = int(df.at[idx, "Version"])
+        if expected_version is not None and version != expected_version:
+            raise ConflictError(task_id, expected_version, version)
+        for col in FIELD_COLUMNS:
+            df.at[idx, col] = task[col]
+        df.at[idx, "Version"] = version + 1
+        self.replace_all(df, meta)
+        return version + 1
+
+    def delete(self, task_id):
+        df, meta = self._read()
+        meta = dict(meta, next_id=next_task_id(df, meta.get("next_id")))
+        self.replace_all(df[df["ID"] != task_id], meta)
+
+    def delete_many(self, task_ids):
+        df, meta = self._read()
+        meta = dict(meta, next_id=next_task_id(df, meta.get("next_id")))
+        self.replace_all(df[~df["ID"].isin(list(task_ids))], meta)
+
+    def replace_all(self, df, meta=None):
+        # Write a temporary workbook and swap it in, so a crash mid-write
+        # never leaves a half-written file behind.
+        tmp = self.path.with_name(f"{self.path.stem}.tmp{self.path.suffix}")
+        with pd.ExcelWriter(tmp, engine="openpyxl") as writer:
+            df.to_excel(writer, index=False, sheet_name="Sheet1")
+            if meta:
+                pd.DataFrame({"Key": list(meta), "Value": [str(v) for v in meta.values()]}).to_excel(
+                    writer, index=False, sheet_name="Meta")
+        fsync_file(tmp)
+        os.replace(tmp, self.path)
+        self._write_columns(df, {key: str(value) for key, value in (meta or {}).items()}, self.signature())
+
+    def get_meta(self, key, default=None):
+        if not self.path.exists():
+            return default
+        return self._read()[1].get(key, default)
+
+
+class SQLiteBackend(StorageBackend):
+    """SQLite engine doing single-row writes against an indexed table."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.conn = None
+        self.lock = FileLock(self.path.with_name(self.path.name + ".lock"))
+
+    def locked(self):
+        return self.lock
+
+    def connect(self):
+        if self.conn is None:
+            # Shared with worker threads; TaskStore serializes access
+            self.conn = sqlite3.connect(self.path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        return self.conn
+
+    def files(self):
+        # In WAL mode commits land in the -wal file until a checkpoint
+        return [self.path, self.path.with_name(self.path.name + "-wal")]
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def setup(self):
+        conn = self.connect()
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id INTEGER PRIMARY KEY,
+                    job_name TEXT NOT NULL,
+                    description TEXT,
+                    start_date TEXT,
+                    end_date TEXT,
+                    estimated_cost REAL,
+                    actual_cost REAL,
+                    status TEXT,
+                    version INTEGER NOT NULL DEFAULT 1
+                )
+            """)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(tasks)")}
+            if "version" not in columns:
+                conn.execute("ALTER TABLE tasks ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_start ON tasks(start_date)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_end ON tasks(end_date)")
+
+    def load(self):
+        df = pd.read_sql_query(f"SELECT {', '.join(SQL_COLUMNS)} FROM tasks ORDER BY id", self.connect())
+        df.columns = TASK_COLUMNS
+        return df
+
+    def get_meta(self, key, default=None):
+        row = self.connect().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        conn = self.connect()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def insert(self, task):
+        return self.insert_batch([task])[0]
+
+    def insert_batch(self, tasks):
+        conn = self.connect()
+        with self.lock, conn:
+            # IDs are never reused: next_id survives deleting the newest task
+            first_id = conn.execute("""
+                SELECT MAX(COALESCE((SELECT CAST(value AS INTEGER) FROM meta WHERE key = 'next_id'), 1),
+                           COALESCE((SELECT MAX(id) FROM tasks), 0) + 1)
+            """).fetchone()[0]
+            ids = list(range(first_id, first_id + len(tasks)))
+            self._insert_rows(conn, (
+                [task_id] + [task[col] for col in FIELD_COLUMNS] + [1] for task_id, task in zip(ids, tasks)
+            ))
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('next_id', ?)",
+                         (str(first_id + len(tasks)),))
+        return ids
+
+    def insert_many(self, tasks):
+        """Insert several tasks keeping their IDs, in one transaction."""
+        conn = self.connect()
+        with self.lock, conn:
+            self._insert_rows(conn, [[task[col] for col in TASK_COLUMNS] for task in tasks])
+            self._keep_next_id(conn)
+
+    @staticmethod
+    def _keep_next_id(conn):
+        """Store next_id as at least the highest stored ID + 1, so deleting the newest task can't free its ID."""
+        conn.execute("""
+            INSERT OR REPLACE INTO meta (key, value)
+            SELECT 'next_id', MAX(COALESCE((SELECT CAST(value AS INTEGER) FROM meta WHERE key = 'next_id'), 1),
+                                  COALESCE((SELECT MAX(id) FROM tasks), 0) + 1)
+        """)
+
+    def _insert_rows(self, conn, rows):
+        conn.executemany(
+            f"INSERT INTO tasks ({', '.join(SQL_COLUMNS)}) VALUES ({', '.join('?' * len(SQL_COLUMNS))})",
+            rows
+        )
+
+    def replace_all(self, df, meta=None):
+        conn = self.connect()
+        with self.lock, conn:
+            conn.execute("DELETE FROM tasks")
+            self._insert_rows(conn, df[TASK_COLUMNS].itertuples(index=False, name=None))
+            for key, value in (meta or {}).items():
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def update(self, task_id, task, expected_version=None):
+        assignments = ", ".join(f"{COLUMN_MAP[col]} = ?" for col in FIELD_COLUMNS)
+        conn = self.connect()
+        with self.lock, conn:
+            row = conn.execute("SELECT version FROM tasks WHERE id = ?", (task_id,)).fetchone()
+            if row is None:
+                raise KeyError(f"Görev bulunamadı: {task_id}")
+            if expected_version is not None and row[0] != expected_version:
+                raise ConflictError(task_id, expected_version, row[0])
+            conn.execute(
+                f"UPDATE tasks SET {assignments}, version = version + 1 WHERE id = ?",
+                [task[col] for col in FIELD_COLUMNS] + [task_id]
+            )
+        return row[0] + 1
+
+    def delete(self, task_id):
+        conn = self.connect()
+        with self.lock, conn:
+            # Keep next_id above the deleted ID, which may be the newest
+            self._keep_next_id(conn)
+            conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+
+    def delete_many(self, task_ids):
+        conn = self.connect()
+        with self.lock, conn:
+            self._keep_next_id(conn)
+            conn.executemany("DELETE FROM tasks WHERE id = ?", ((int(task_id),) for task_id in task_ids))
+
+
+def next_task_id(df, stored=None):
+    """Return the next unused task ID given the tasks and the persisted counter."""
+    highest = int(df["ID"].max()) if len(df) else 0
+    return max(int(stored or 1), highest + 1)
+
+
+def with_versions(df):
+    """Give rows stored before tasks were versioned version 1."""
+    if "Version" not in df.columns:
+        return df.assign(Version=1)
+    if df["Version"].dtype == "int64":
+        # Already clean, e.g. read from the columnar cache; keep it a view
+        return df
+    return df.assign(Version=pd.to_numeric(df["Version"], errors="coerce").fillna(1).astype("int64"))
+
+
+def fsync_file(path):
+    """Flush a written file to disk."""
+    with open(path, "rb+") as f:
+        os.fsync(f.fileno())
+
+
+def _date_text(value):
+    """Normalize a date cell coming from Excel to YYYY-MM-DD text."""
+    if pd.isna(value):
+        return None
+    parsed = pd.to_datetime(value, errors="coerce")
+    if pd.isna(parsed):
+        return str(value)
+    return parsed.strftime("%Y-%m-%d")
+
+
+def _cost_value(value):
+    if pd.isna(value):
+        return 0.0
+    return float(value)
+
+
+def import_excel(excel_file, backend):
+    """Copy every task from a legacy workbook into the given backend."""
+    df = pd.read_excel(excel_file)
+    tasks = []
+    for row in df.itertuples(index=False):
+        task = dict(zip(df.columns, row))
+        tasks.append({
+            "ID": int(task["ID"]),
+            "Job Name": str(task["Job Name"]),
+            "Description": "" if pd.isna(task["Description"]) else str(task["Description"]),
+            "Start Date": _date_text(task["Start Date"]),
+            "End Date": _date_text(task["End Date"]),
+            "Estimated Cost": _cost_value(task["Estimated Cost"]),
+            "Actual Cost": _cost_value(task["Actual Cost"]),
+            "Status": str(task["Status"]),
+            "Version": 1,
+        })
+    backend.insert_many(tasks)
+    return len(tasks)
+
+
+def open_storage(data_dir, engine="sqlite"):
+    """Open the task store in data_dir.
+
+    The default "sqlite" engine imports the legacy workbook once; the "excel"
+    engine keeps farm_tasks.xlsx as a snapshot behind an append-only journal.
+    """
+    data_dir = Path(data_dir)
+    if engine == "excel":
+        from journal import JournaledBackend
+        backend = JournaledBackend(ExcelBackend(data_dir / "farm_tasks.xlsx"), data_dir / "farm_tasks.journal")
+        backend.setup()
+        return backend
+    if engine != "sqlite":
+        raise ValueError(f"Bilinmeyen depolama motoru: {engine}")
+    backend = SQLiteBackend(data_dir / "farm_tasks.db")
+    excel_file = data_dir / "farm_tasks.xlsx"
+    # Locked so that two instances starting together import the workbook once
+    with backend.locked():
+        backend.setup()
+        if backend.get_meta("excel_imported") is None:
+            if excel_file.exists():
+                import_excel(excel_file, backend)
+            backend.set_meta("excel_imported", 1)
+    return backend
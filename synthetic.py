@@ -0,0 +1,98 @@
+"""Synthetic orchard task data for benchmarks and demos.
+
+    python synthetic.py --rows 100000 --jobs 200 --data-dir /tmp/farm-bench
+
+Generated tasks look like what the backends load: text dates, float costs,
+IDs 1..rows. All randomness comes from one seeded generator, so the same
+options always give the same data.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from storage import TASK_COLUMNS, open_storage
+
+JOB_NAMES = [
+    "Budama", "Sulama", "Gübreleme", "İlaçlama", "Hasat", "Çapalama",
+    "Aşılama", "Seyreltme", "Toprak Analizi", "Dikim",
+]
+
+
+def job_names(count):
+    """Return count distinct job names, numbering parcels once the base names run out."""
+    return [
+        JOB_NAMES[i % len(JOB_NAMES)] if i < len(JOB_NAMES)
+        else f"{JOB_NAMES[i % len(JOB_NAMES)]} - Parsel {i // len(JOB_NAMES) + 1}"
+        for i in range(count)
+    ]
+
+
+def generate_tasks(rows, jobs=50, start="2024-01-01", days=730, max_span=30, done_ratio=0.5, seed=0):
+    """Return a raw task frame with TASK_COLUMNS.
+
+    jobs sets the number of distinct job names, tasks start on one of
+    days days from start and last 0..max_span days, and about done_ratio of
+    them are Done, with an actual cost within about 15% of the estimate.
+    """
+    rng = np.random.default_rng(seed)
+    names = np.array(job_names(jobs), dtype=object)
+    first = pd.Timestamp(start)
+    start_dates = first + pd.to_timedelta(rng.integers(0, days, rows), unit="D")
+    end_dates = start_dates + pd.to_timedelta(rng.integers(0, max_span + 1, rows), unit="D")
+    estimated = rng.uniform(50, 2000, rows).round(2)
+    done = rng.random(rows) < done_ratio
+    actual = np.where(done, (estimated * rng.normal(1.0, 0.15, rows)).clip(0).round(2), 0.0)
+    return pd.DataFrame({
+        "ID": np.arange(1, rows + 1),
+        "Job Name": names[rng.integers(0, jobs, rows)],
+        "Description": "",
+        "Start Date": start_dates.strftime("%Y-%m-%d"),
+        "End Date": end_dates.strftime("%Y-%m-%d"),
+        "Estimated Cost": estimated,
+        "Actual Cost": actual,
+        "Status": np.where(done, "Done", "Waiting"),
+        "Version": 1,
+    }, columns=TASK_COLUMNS)
+
+
+def write_dataset(data_dir, rows, engine="sqlite", **options):
+    """Fill data_dir with a generated task set and return the frame written."""
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    df = generate_tasks(rows, **options)
+    backend = open_storage(data_dir, engine)
+    try:
+        backend.replace_all(df, {"next_id": rows + 1})
+    finally:
+        backend.close()
+    return df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sentetik görev verisi üret")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--jobs", type=int, default=50, help="Farklı görev adı sayısı")
+    parser.add_argument("--start", default="2024-01-01", help="En erken başlangıç tarihi")
+    parser.add_argument("--days", type=int, default=730, help="Başlangıç tarihlerinin yayıldığı gün sayısı")
+    parser.add_argument("--max-span", type=int, default=30, help="En uzun görev süresi (gün)")
+    parser.add_argument("--done-ratio", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--engine", choices=("sqlite", "excel"), default="sqlite")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--data-dir", type=Path, help="Veriyi bu klasörün görev deposuna yaz")
+    target.add_argument("--csv", type=Path, help="Veriyi toplu içe aktarılabilir CSV olarak yaz")
+    args = parser.parse_args(argv)
+    options = dict(jobs=args.jobs, start=args.start, days=args.days, max_span=args.max_span,
+                   done_ratio=args.done_ratio, seed=args.seed)
+    if args.csv:
+        generate_tasks(args.rows, **options).drop(columns=["ID", "Version"]).to_csv(args.csv, index=False)
+    else:
+        write_dataset(args.data_dir, args.rows, args.engine, **options)
+    print(f"{args.rows} görev yazıldı.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
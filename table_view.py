@@ -0,0 +1,171 @@
+from bisect import bisect_left
+
+from instrumentation import timed
+
+
+class VirtualTable:
+    """Treeview wrapper that only materializes the rows currently in view.
+
+    Rows live in a columnar model (one list per column, ordered by ID); the
+    Treeview only ever holds the visible window plus a small buffer, using
+    the task ID as item id. Scrolling is driven by the vertical scrollbar
+    and the mouse wheel instead of the Treeview's own yview.
+    """
+
+    def __init__(self, tree, scrollbar, columns, formatters=None, buffer=10, row_height=20, row_tags=None):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.column_names = list(columns)
+        self.formatters = formatters or {}
+        # Called with a task ID when its row is materialized; returns Treeview tags
+        self.row_tags = row_tags or (lambda task_id: ())
+        self.buffer = buffer
+        self.row_height = row_height
+        self.columns = {col: [] for col in self.column_names}
+        self.offset = 0
+        self.selected = set()
+        self._window = []
+
+        self.scrollbar.configure(command=self.yview)
+        self.tree.bind("<Configure>", lambda e: self.render())
+        self.tree.bind("<MouseWheel>", self._on_wheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(3))
+        self.tree.bind("<Down>", lambda e: self._on_arrow(1))
+        self.tree.bind("<Up>", lambda e: self._on_arrow(-1))
+
+    def __len__(self):
+        return len(self.columns["ID"])
+
+    @property
+    def ids(self):
+        return self.columns["ID"]
+
+    def visible_rows(self):
+        """Number of rows that fit in the widget (header excluded)."""
+        height = self.tree.winfo_height()
+        if height <= 1:
+            height = int(self.tree.cget("height")) * self.row_height
+        return max(1, height // self.row_height - 1)
+
+    @timed("table.set_rows")
+    def set_rows(self, df):
+        """Replace the model with the rows of df and jump to the top."""
+        self.columns = {col: df[col].tolist() for col in self.column_names}
+        self.offset = 0
+        self.selected.clear()
+        self.render()
+
+    def _position(self, task_id):
+        pos = bisect_left(self.ids, task_id)
+        if pos < len(self.ids) and self.ids[pos] == task_id:
+            return pos
+        return None
+
+    def _row(self, pos):
+        """Display values of the row at pos, formatted only when materialized."""
+        return [
+            self.formatters[col](self.columns[col][pos]) if col in self.formatters else self.columns[col][pos]
+            for col in self.column_names
+        ]
+
+    def insert_row(self, row):
+        """Insert a row (dict keyed by column) in ID order."""
+        pos = bisect_left(self.ids, row["ID"])
+        for col in self.column_names:
+            self.columns[col].insert(pos, row[col])
+        if pos < self.offset:
+            self.offset += 1
+        self.render()
+
+    def update_row(self, row):
+        """Replace the values of an existing row."""
+        pos = self._position(row["ID"])
+        if pos is None:
+            self.insert_row(row)
+            return
+        for col in self.column_names:
+            self.columns[col][pos] = row[col]
+        iid = str(row["ID"])
+        if self.tree.exists(iid):
+            self.tree.item(iid, values=self._row(pos))
+
+    def delete_row(self, task_id):
+        """Remove a row."""
+        pos = self._position(task_id)
+        if pos is None:
+            return
+        for col in self.column_names:
+            del self.columns[col][pos]
+        self.selected.discard(task_id)
+        if pos < self.offset:
+            self.offset -= 1
+        self.render()
+
+    def yview(self, *args):
+        """Scrollbar command: handles 'moveto' and 'scroll' requests."""
+        if not args:
+            return
+        if args[0] == "moveto":
+            self.offset = int(float(args[1]) * len(self))
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if args[2] == "pages":
+                step *= self.visible_rows()
+            self.offset += step
+        self.render()
+
+    def scroll(self, rows):
+        self.offset += rows
+        self.render()
+
+    def _on_wheel(self, event):
+        self.scroll(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def _on_arrow(self, direction):
+        focus = self.tree.focus()
+        if not focus or not self._window:
+            return None
+        edge = self._window[0] if direction < 0 else self._window[min(self.visible_rows(), len(self._window)) - 1]
+        if focus != edge:
+            return None
+        pos = self._position(int(focus)) + direction
+        if not 0 <= pos < len(self):
+            return "break"
+        self.scroll(direction)
+        iid = str(self.ids[pos])
+        if self.tree.exists(iid):
+            self.tree.selection_set(iid)
+            self.tree.focus(iid)
+        return "break"
+
+    @timed("table.render")
+    def render(self):
+        """Materialize the rows of the current window in the Treeview."""
+        visible = self.visible_rows()
+        self.offset = max(0, min(self.offset, len(self) - visible))
+
+        # Remember the selection of rows that are about to leave the view
+        current = {int(iid) for iid in self.tree.selection()}
+        self.selected = (self.selected - {int(iid) for iid in self._window}) | current
+
+        end = min(len(self), self.offset + visible + self.buffer)
+        window = [str(task_id) for task_id in self.ids[self.offset:end]]
+        if window != self._window:
+            stale = set(self._window) - set(window)
+            if stale:
+                self.tree.delete(*stale)
+            for index, pos in enumerate(range(self.offset, end)):
+                iid = window[index]
+                if self.tree.exists(iid):
+                    self.tree.move(iid, "", index)
+                else:
+                    self.tree.insert("", index, iid=iid, values=self._row(pos), tags=self.row_tags(self.ids[pos]))
+            self._window = window
+            self.tree.selection_set([iid for iid in window if int(iid) in self.selected])
+
+        if len(self):
+            self.scrollbar.set(self.offset / len(self), min(1.0, (self.offset + visible) / len(self)))
+        else:
+            self.scrollbar.set(0.0, 1.0)
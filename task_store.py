@@ -0,0 +1,192 @@
+import threading
+from collections import namedtuple
+
+import pandas as pd
+
+from storage import TASK_COLUMNS, FIELD_COLUMNS
+from schema import to_typed, add_categories, append_rows
+from instrumentation import timed
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses"])
+
+
+class TaskStore:
+    """Keeps the task table resident in memory and writes changes through to a backend.
+
+    All access is serialized with a lock so worker threads can share the store.
+    Mutations replace the resident DataFrame instead of editing it in place,
+    so a frame returned by tasks() stays valid while a worker reads it.
+
+    Listeners (indexes, aggregates) registered with subscribe() receive
+    reset(df) after every full load and inserted(task), updated(old, new)
+    and deleted(task) after each write, with tasks as dicts keyed by column.
+
+    Writes hold the backend's inter-process lock and re-read the backend
+    first if another process changed it, so the resident table never
+    misses someone else's write.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.version = 0
+        self._df = None
+        self._signature = None
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.RLock()
+        self.listeners = []
+
+    def subscribe(self, listener):
+        """Register a listener for table resets and single-task changes."""
+        with self._lock:
+            self.listeners.append(listener)
+            if self._df is not None:
+                listener.reset(self._df)
+
+    def _notify(self, event, *args):
+        for listener in self.listeners:
+            getattr(listener, event)(*args)
+
+    def tasks(self):
+        """Return all tasks, re-reading the backend only when its files changed."""
+        with self._lock:
+            signature = self.backend.signature()
+            if self._df is not None and signature == self._signature:
+                self._hits += 1
+                return self._df
+            self._misses += 1
+            with timed("load.backend"):
+                df = self.backend.load()
+            with timed("load.typed"):
+                self._df = self._indexed(to_typed(df))
+            self._signature = signature
+            self.version += 1
+            with timed("load.indexes"):
+                self._notify("reset", self._df)
+            return self._df
+
+    def read(self, fn):
+        """Call fn(tasks) with writes blocked and return (version, result).
+
+        The version identifies the data fn saw, e.g. for caching results.
+        """
+        with self._lock:
+            df = self.tasks()
+            return self.version, fn(df)
+
+    @staticmethod
+    def _indexed(df):
+        # The frame's index mirrors the ID column; pandas keeps a hash table
+        # for it, so .loc[task_id] is a constant-time lookup.
+        df.index = pd.Index(df["ID"].to_numpy(), name=None)
+        return df
+
+    def cache_info(self):
+        """Report cache hits and misses of tasks()."""
+        return CacheInfo(self._hits, self._misses)
+
+    def invalidate(self):
+        """Drop the resident table so the next read goes to the backend."""
+        self._df = None
+
+    def _written(self, df):
+        """Adopt df as the resident table after a write-through."""
+        self._df = df
+        self._signature = self.backend.signature()
+        self.version += 1
+
+    def _typed_row(self, task_id, task, version=1):
+        """Validate task and return it as a one-row typed frame."""
+        return self._typed_rows([task_id], [task], version)
+
+    def _typed_rows(self, task_ids, tasks, version=1):
+        """Validate tasks and return them as a typed frame indexed by task_ids."""
+        rows = pd.DataFrame(
+            [[task_id] + [task[col] for col in FIELD_COLUMNS] + [version] for task_id, task in zip(task_ids, tasks)],
+            columns=TASK_COLUMNS
+        )
+        return self._indexed(to_typed(rows))
+
+    def get(self, task_id):
+        """Return one task as a dict of typed values keyed by column name."""
+        with self._lock:
+            return self.tasks().loc[task_id].to_dict()
+
+    def add(self, task):
+        """Insert a task and return its newly allocated, never reused ID."""
+        with self._lock, self.backend.locked():
+            df = self.tasks()
+            row = self._typed_row(0, task)
+            with timed("persist.insert"):
+                new_id = self.backend.insert(task)
+            row["ID"] = new_id
+            row = self._indexed(row)
+            self._written(append_rows(df, row))
+            self._notify("inserted", row.iloc[0].to_dict())
+            return new_id
+
+    def add_many(self, tasks):
+        """Insert a batch of tasks in one backend write and return their new IDs."""
+        tasks = list(tasks)
+        if not tasks:
+            return []
+        with self._lock, self.backend.locked():
+            df = self.tasks()
+            rows = self._typed_rows(range(len(tasks)), tasks)
+            with timed("persist.insert_batch"):
+                new_ids = self.backend.insert_batch(tasks)
+            rows["ID"] = new_ids
+            rows = self._indexed(rows)
+            self._written(append_rows(df, rows))
+            for task in rows.to_dict("records"):
+                self._notify("inserted", task)
+            return new_ids
+
+    def update(self, task_id, task, expected_version=None):
+        """Overwrite the fields of an existing task and return its new version.
+
+        With expected_version (the Version the edit started from), raises
+        ConflictError instead of overwriting a change made in the meantime.
+        """
+        with self._lock, self.backend.locked():
+            df = self.tasks()
+            if task_id not in df.index:
+                raise KeyError(f"Görev bulunamadı: {task_id}")
+            new = self._typed_row(task_id, task).iloc[0].to_dict()
+            with timed("persist.update"):
+                new["Version"] = self.backend.update(task_id, task, expected_version)
+            old = df.loc[task_id].to_dict()
+            # Readers keep the old frame: the new one shares its index and gets
+            # copies of the columns written to, whatever the copy-on-write mode
+            df = add_categories(df.copy(deep=False), new)
+            for col in TASK_COLUMNS[1:]:
+                df[col] = df[col].copy()
+            df.loc[task_id, TASK_COLUMNS[1:]] = [new[col] for col in TASK_COLUMNS[1:]]
+            self._written(df)
+            self._notify("updated", old, df.loc[task_id].to_dict())
+            return new["Version"]
+
+    def delete(self, task_id):
+        """Delete a task; other tasks keep their IDs."""
+        with self._lock, self.backend.locked():
+            df = self.tasks()
+            if task_id not in df.index:
+                raise KeyError(f"Görev bulunamadı: {task_id}")
+            with timed("persist.delete"):
+                self.backend.delete(task_id)
+            old = df.loc[task_id].to_dict()
+            self._written(df.drop(index=task_id))
+            self._notify("deleted", old)
+
+    def delete_many(self, task_ids):
+        """Delete several tasks in one backend write; listeners get a reset."""
+        with self._lock, self.backend.locked():
+            df = self.tasks()
+            task_ids = [task_id for task_id in task_ids if task_id in df.index]
+            if not task_ids:
+                return
+            with timed("persist.delete_batch"):
+                self.backend.delete_many(task_ids)
+            self._written(df.drop(index=task_ids))
+            with timed("load.indexes"):
+                self._notify("reset", self._df)
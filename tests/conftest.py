@@ -0,0 +1,21 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# The application modules live at the top of the repository
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core import FarmTasks, build_task  # noqa: E402
+
+
+@pytest.fixture(params=["sqlite", "excel"])
+def core(request, tmp_path):
+    """A FarmTasks on an empty data folder, once per storage engine."""
+    tasks = FarmTasks(tmp_path, request.param)
+    yield tasks
+    tasks.close()
+
+
+def make_task(name="Budama", start="2025-03-01", end="2025-03-05", estimated=100, actual=0, done=False, desc=""):
+    return build_task(name, desc, start, end, estimated, actual, done)
@@ -0,0 +1,21 @@
+from conftest import make_task
+
+
+def test_statistics_of_empty_store(core):
+    stats = core.statistics()
+    assert stats["total_tasks"] == 0
+    assert stats["monthly_tasks"].empty
+
+
+def test_statistics_follow_update_and_delete(core):
+    first = core.add(make_task(estimated=100))
+    core.add(make_task(start="2025-04-01", end="2025-04-02", estimated=50, actual=40, done=True))
+    core.update(first, make_task(estimated=100, actual=120, done=True))
+    stats = core.statistics()
+    assert (stats["done_tasks"], stats["waiting_tasks"]) == (2, 0)
+    assert stats["total_actual_cost"] == 160
+    core.delete(first)
+    stats = core.statistics()
+    assert stats["total_tasks"] == 1
+    assert stats["total_actual_cost"] == 40
+    assert [str(month) for month in stats["monthly_tasks"].index] == ["2025-04"]
@@ -0,0 +1,39 @@
+import importlib.util
+import json
+
+import pandas as pd
+
+import benchmark
+from synthetic import generate_tasks, job_names
+
+
+def test_every_scenario_writes_one_json_line(tmp_path):
+    output = tmp_path / "results.jsonl"
+    benchmark.main(["--rows", "200", "--repeat", "1", "--no-memory", "--output", str(output)])
+    records = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    expected = list(benchmark.SCENARIOS)
+    if importlib.util.find_spec("pyarrow") is None:
+        expected.remove("export_parquet")
+    assert [record["scenario"] for record in records] == expected
+    assert all(record["rows"] == 200 and record["median_s"] >= 0 for record in records)
+
+
+def test_generated_tasks_are_deterministic():
+    pd.testing.assert_frame_equal(generate_tasks(500, seed=3), generate_tasks(500, seed=3))
+    assert not generate_tasks(500, seed=3).equals(generate_tasks(500, seed=4))
+
+
+def test_generated_tasks_follow_the_options():
+    df = generate_tasks(2000, jobs=12, max_span=5, done_ratio=0.25, seed=1)
+    assert df["ID"].tolist() == list(range(1, 2001))
+    spans = pd.to_datetime(df["End Date"]) - pd.to_datetime(df["Start Date"])
+    assert spans.dt.days.between(0, 5).all()
+    assert set(df["Job Name"]) <= set(job_names(12)) and df["Job Name"].nunique() == 12
+    assert abs((df["Status"] == "Done").mean() - 0.25) < 0.05
+    assert (df.loc[df["Status"] == "Waiting", "Actual Cost"] == 0).all()
+
+
+def test_job_names_number_parcels_past_the_base_names():
+    names = job_names(25)
+    assert len(set(names)) == 25
+    assert names[10] == "Budama - Parsel 2"
@@ -0,0 +1,113 @@
+import pandas as pd
+import pytest
+
+from bulk_import import CHUNK_SIZE, FIRST_ROW, format_errors, read_tasks
+from conftest import make_task
+
+HEADER = ["Job Name", "Description", "Start Date", "End Date", "Estimated Cost", "Actual Cost", "Status"]
+
+
+def rows(count, name="Budama"):
+    return [[f"{name} {i}", "", "2025-03-01", "2025-03-05", "100", "0", "Waiting"] for i in range(count)]
+
+
+def write_csv(path, data):
+    pd.DataFrame(data, columns=HEADER).to_csv(path, index=False, encoding="utf-8-sig")
+    return path
+
+
+@pytest.fixture
+def batches(core, monkeypatch):
+    """Sizes of the insert_batch calls reaching the backend."""
+    calls = []
+    original = core.store.backend.insert_batch
+
+    def counting(tasks):
+        calls.append(len(tasks))
+        return original(tasks)
+
+    monkeypatch.setattr(core.store.backend, "insert_batch", counting)
+    return calls
+
+
+def test_valid_csv_imports_in_one_batch(core, batches, tmp_path):
+    path = write_csv(tmp_path / "plan.csv", rows(3) + [["Hasat", "Elma", "2025-09-01", "2025-09-03", "1250.50", "1300", "done"]])
+    ids, errors = core.import_file(path)
+    assert errors == [] and batches == [4]
+    df = core.tasks()
+    assert df["ID"].tolist() == ids == [1, 2, 3, 4]
+    harvest = df.iloc[-1]
+    assert (harvest["Status"], harvest["Estimated Cost"], harvest["Actual Cost"]) == ("Done", 1250.5, 1300)
+
+
+def test_valid_xlsx_imports_in_one_batch(core, batches, tmp_path):
+    path = tmp_path / "plan.xlsx"
+    data = pd.DataFrame(rows(3), columns=HEADER)
+    # Date cells typed by Excel are accepted as well as text
+    data["Start Date"] = pd.Timestamp("2025-03-01")
+    data.to_excel(path, index=False)
+    ids, errors = core.import_file(path)
+    assert errors == [] and batches == [3] and len(ids) == 3
+    assert core.tasks()["Start Date"].dt.strftime("%Y-%m-%d").tolist() == ["2025-03-01"] * 3
+
+
+def test_invalid_rows_are_reported_by_row_number(core, batches, tmp_path):
+    data = rows(2) + [
+        ["Sulama", "", "2025-02-30", "2025-03-01", "10", "", "Waiting"],
+        ["Gübre", "", "2025-03-01", "2025-03-02", "-5", "", "Waiting"],
+        ["", "", "", "", "", "", ""],
+        ["Hasat", "", "2025-03-01", "2025-03-02", "10", "", "Later"],
+        ["İlaçlama", "", "2025-03-01", "2025-03-02", "10", "-1", "Done"],
+    ]
+    path = write_csv(tmp_path / "plan.csv", data)
+    ids, errors = core.import_file(path)
+    # Row 1 is the header; the blank row 6 is skipped, not reported
+    assert errors == [
+        (FIRST_ROW + 2, "Tarih formatı YYYY-MM-DD olmalı!"),
+        (FIRST_ROW + 3, "Tahmini maliyet geçerli bir sayı olmalı!"),
+        (FIRST_ROW + 5, "Durum Done veya Waiting olmalı!"),
+        (FIRST_ROW + 6, "Gerçekleşen maliyet geçerli bir sayı olmalı!"),
+    ]
+    # Any invalid row and nothing is written
+    assert ids == [] and batches == [] and core.tasks().empty
+    assert format_errors(errors, limit=2).splitlines()[-1] == "... ve 2 hata daha"
+
+    ids, errors = core.import_file(path, skip_invalid=True)
+    assert len(ids) == 2 and len(errors) == 4 and batches == [2]
+
+
+def test_missing_required_column_is_rejected(core, tmp_path):
+    path = tmp_path / "plan.csv"
+    pd.DataFrame({"Job Name": ["Budama"], "Start Date": ["2025-03-01"]}).to_csv(path, index=False)
+    with pytest.raises(ValueError, match="Eksik sütunlar"):
+        core.import_file(path)
+
+
+def test_file_larger_than_a_chunk(core, batches, tmp_path):
+    data = rows(CHUNK_SIZE + 3)
+    data[CHUNK_SIZE + 1][2] = "01.03.2025"
+    path = write_csv(tmp_path / "plan.csv", data)
+    seen = []
+    ids, errors = core.import_file(path, skip_invalid=True, progress=seen.append)
+    assert seen == [CHUNK_SIZE, CHUNK_SIZE + 3]
+    # Row numbers keep counting across chunks
+    assert errors == [(CHUNK_SIZE + 1 + FIRST_ROW, "Tarih formatı YYYY-MM-DD olmalı!")]
+    assert batches == [CHUNK_SIZE + 2] and len(core.tasks()) == CHUNK_SIZE + 2
+
+
+def test_small_chunks_give_the_same_result(tmp_path):
+    data = rows(10)
+    data[7][4] = "abc"
+    path = write_csv(tmp_path / "plan.csv", data)
+    whole, chunked = read_tasks(path), read_tasks(path, chunksize=3)
+    pd.testing.assert_frame_equal(whole.tasks, chunked.tasks)
+    assert whole.errors == chunked.errors == [(9, "Tahmini maliyet geçerli bir sayı olmalı!")]
+    assert whole.rows == chunked.rows == 10
+
+
+def test_imported_tasks_match_form_entries(core, tmp_path):
+    path = write_csv(tmp_path / "plan.csv", [["Budama", "Elma", "2025-03-01", "2025-03-05", "100", "0", "Waiting"]])
+    core.import_file(path)
+    core.add(make_task("Budama", desc="Elma"))
+    imported, entered = core.tasks().drop(columns=["ID"]).to_dict("records")
+    assert imported == entered
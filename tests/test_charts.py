@@ -0,0 +1,67 @@
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from charts import LABEL_LIMIT, FigureCache, build_calendar_figure, build_cost_figure, build_statistics_figure
+from conftest import make_task
+
+
+def draw(fig):
+    FigureCanvasAgg(fig).draw()
+
+
+def calendar(core, cache):
+    version, df = core.versioned(core.calendar_tasks)
+    return cache.get(("calendar", version, None), lambda: build_calendar_figure(df))
+
+
+def test_cache_hit_returns_the_same_figure(core):
+    core.add(make_task())
+    cache = FigureCache()
+    built = []
+    first = cache.get(("calendar", 1, None), lambda: built.append(1) or build_calendar_figure(core.tasks()))
+    assert cache.get(("calendar", 1, None), lambda: built.append(2)) is first
+    assert built == [1]
+    assert calendar(core, cache) is calendar(core, cache)
+
+
+def test_write_invalidates_cached_figures(core):
+    task_id = core.add(make_task())
+    cache = FigureCache()
+    before = calendar(core, cache)
+    core.update(task_id, make_task(actual=80, done=True))
+    after = calendar(core, cache)
+    assert after is not before
+    # Figures of the older version are released
+    assert before.axes == [] and len(cache._figures) == 1
+
+
+def test_shown_figures_survive_invalidation(core):
+    cache = FigureCache()
+    core.add(make_task())
+    shown = calendar(core, cache)
+    cache.show(shown, window="pencere")
+    core.add(make_task())
+    calendar(core, cache)
+    assert shown.axes and cache.window_for(shown) == "pencere"
+    cache.hide(shown)
+    assert shown.axes == []
+
+
+def test_calendar_labels_at_most_label_limit_rows(core):
+    core.add_many([make_task(f"İş {i:03d}", actual=10, done=True) for i in range(LABEL_LIMIT * 3 + 7)])
+    ax = build_calendar_figure(core.tasks()).axes[0]
+    assert len(ax.get_yticklabels()) <= LABEL_LIMIT
+    # One cost label per labelled row plus the totals line
+    assert len(ax.texts) <= LABEL_LIMIT + 1
+
+
+def test_empty_and_single_task_frames_render(core):
+    df = core.tasks()
+    draw(build_calendar_figure(df))
+    draw(build_cost_figure(df, df["Job Name"], "Boş"))
+    draw(build_statistics_figure(core.statistics(), core.forecast("2025-03-01", "2025-03-31")))
+    core.add(make_task(start="2025-03-01", end="2025-03-01"))
+    df = core.tasks()
+    draw(build_calendar_figure(df))
+    draw(build_cost_figure(df, df["Start Date"].dt.strftime("%Y-%m"), "Tek görev"))
+    draw(build_statistics_figure(core.statistics(), core.forecast("2025-03-01", "2025-03-31")))
+    draw(build_statistics_figure(core.statistics()))
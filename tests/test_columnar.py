@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+
+from columnar import read_columns, write_columns
+
+
+def _mapped(values):
+    while values is not None:
+        if isinstance(values, np.memmap):
+            return True
+        values = values.base
+    return False
+
+
+def test_round_trip_keeps_values_and_maps_numbers(tmp_path):
+    df = pd.DataFrame({
+        "ID": np.arange(1, 4, dtype="int64"),
+        "Job Name": pd.Series(["Budama", None, "Budama"], dtype="str"),
+        "Start Date": pd.to_datetime(["2025-01-01", None, "2025-03-01"]),
+        "Estimated Cost": [1.5, 2.0, np.nan],
+    })
+    assert write_columns(tmp_path / "t.columns", df, ["key", 1], {"next_id": "4"})
+    loaded, meta = read_columns(tmp_path / "t.columns", ["key", 1])
+    pd.testing.assert_frame_equal(loaded, df)
+    assert meta == {"next_id": "4"}
+    assert all(_mapped(loaded[col].to_numpy()) for col in ("ID", "Start Date", "Estimated Cost"))
+
+
+def test_stale_or_missing_file_is_ignored(tmp_path):
+    df = pd.DataFrame({"ID": [1, 2]})
+    write_columns(tmp_path / "t.columns", df, ["old"])
+    assert read_columns(tmp_path / "t.columns", ["new"]) is None
+    assert read_columns(tmp_path / "missing.columns", ["old"]) is None
+    (tmp_path / "t.columns").write_bytes(b"not a columns file")
+    assert read_columns(tmp_path / "t.columns", ["old"]) is None
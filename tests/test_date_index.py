@@ -0,0 +1,102 @@
+import random
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+import date_index
+from conftest import make_task
+from date_index import CONTAINED, OVERLAPPING, DateIndex, SortedRuns
+
+
+def test_queries_follow_update_and_delete(core):
+    march = core.add(make_task(start="2025-03-01", end="2025-03-10"))
+    april = core.add(make_task(start="2025-04-01", end="2025-04-05"))
+    assert core.query("2025-03-01", "2025-03-31", CONTAINED)["ID"].tolist() == [march]
+
+    core.update(march, make_task(start="2025-03-25", end="2025-04-02"))
+    assert core.query("2025-03-01", "2025-03-31", CONTAINED).empty
+    assert core.query("2025-03-01", "2025-03-31", OVERLAPPING)["ID"].tolist() == [march]
+    assert core.query("2025-04-01", "2025-04-01", OVERLAPPING)["ID"].tolist() == [march, april]
+
+    core.delete(march)
+    assert core.query("2025-03-01", "2025-04-30", OVERLAPPING)["ID"].tolist() == [april]
+
+
+def test_expense_totals_match_query(core):
+    core.add(make_task(start="2025-01-10", end="2025-01-20", estimated=100))
+    core.add(make_task(start="2025-01-25", end="2025-02-03", estimated=40, actual=50, done=True))
+    core.add(make_task(start="2025-02-20", end="2025-03-02", estimated=70))
+    df, actual, estimated = core.expenses("2025-01-01", "2025-02-28")
+    assert len(df) == 2
+    assert (actual, estimated) == (50, 100)
+
+
+@pytest.mark.parametrize("start, end", [("2025-13-01", "2025-12-31"), ("bad", "2025-01-01"), ("2025-01-01", "")])
+def test_invalid_query_dates_raise_value_error(core, start, end):
+    with pytest.raises(ValueError):
+        core.query(start, end, OVERLAPPING)
+    with pytest.raises(ValueError):
+        core.expenses(start, end)
+
+
+def brute_force(ranges, start, end, mode):
+    start, end = date.fromisoformat(start).toordinal(), date.fromisoformat(end).toordinal()
+    if mode == CONTAINED:
+        return sorted(i for i, (s, e) in ranges.items() if s >= start and e <= end)
+    return sorted(i for i, (s, e) in ranges.items() if s <= end and e >= start)
+
+
+def test_long_task_does_not_widen_the_scan(monkeypatch):
+    short = [{"ID": i, "Start Date": date(2025, 1, 1) + timedelta(days=i % 365),
+              "End Date": date(2025, 1, 1) + timedelta(days=i % 365 + i % 3)} for i in range(1, 3001)]
+    season = {"ID": 9999, "Start Date": date(2020, 1, 1), "End Date": date(2025, 12, 31)}
+    index = DateIndex()
+    index.reset(pd.DataFrame(short))
+    index.inserted(season)
+
+    scanned = []
+    original = SortedRuns.starting_between
+
+    def counting(self, first, last):
+        for item in original(self, first, last):
+            scanned.append(item)
+            yield item
+
+    monkeypatch.setattr(SortedRuns, "starting_between", counting)
+    ids = index.overlapping("2025-06-01", "2025-06-01")
+    assert 9999 in ids and len(ids) == 1 + sum(
+        1 for task in short if task["Start Date"] <= date(2025, 6, 1) <= task["End Date"])
+    # The short tasks of two days around the query day, not all 3000
+    assert len(scanned) < 60
+    ranges = {task["ID"]: (task["Start Date"].toordinal(), task["End Date"].toordinal())
+              for task in short + [season]}
+    for start, end in (("2025-03-01", "2025-03-20"), ("2019-01-01", "2026-01-01"), ("2025-12-30", "2026-02-01")):
+        for mode in (CONTAINED, OVERLAPPING):
+            assert index.query(mode, start, end) == brute_force(ranges, start, end, mode)
+
+
+def test_incremental_updates_match_a_fresh_index(monkeypatch):
+    # Small runs, so that splitting and emptying runs is exercised
+    monkeypatch.setattr(date_index, "RUN_SIZE", 4)
+    rng = random.Random(1)
+    tasks = {}
+    index = DateIndex()
+    for task_id in range(1, 400):
+        first = date(2025, 1, 1) + timedelta(days=rng.randrange(200))
+        task = {"ID": task_id, "Start Date": first, "End Date": first + timedelta(days=rng.choice([0, 1, 5, 40, 300]))}
+        index.inserted(task)
+        tasks[task_id] = task
+    for task_id in rng.sample(sorted(tasks), 150):
+        index.deleted(tasks.pop(task_id))
+    for task_id in rng.sample(sorted(tasks), 50):
+        new = dict(tasks[task_id], **{"End Date": tasks[task_id]["Start Date"] + timedelta(days=2)})
+        index.updated(tasks[task_id], new)
+        tasks[task_id] = new
+    fresh = DateIndex()
+    fresh.reset(pd.DataFrame(list(tasks.values())))
+    ranges = {i: (t["Start Date"].toordinal(), t["End Date"].toordinal()) for i, t in tasks.items()}
+    for start, end in (("2025-02-01", "2025-02-10"), ("2025-01-01", "2026-12-31"), ("2025-05-01", "2025-05-01")):
+        for mode in (CONTAINED, OVERLAPPING):
+            expected = brute_force(ranges, start, end, mode)
+            assert index.query(mode, start, end) == expected == fresh.query(mode, start, end)
@@ -0,0 +1,59 @@
+import pandas as pd
+import pytest
+
+from conftest import make_task
+from export import export_tasks
+
+
+@pytest.fixture
+def tasks(core):
+    core.add(make_task("Budama", "2025-03-01", "2025-03-05", 100, 120, done=True, desc="Elma"))
+    core.add(make_task("İlaçlama", "2025-04-01", "2025-04-02", 80))
+    core.add(make_task("Sulama", "2025-05-01", "2025-05-01", 30))
+    return core.tasks()
+
+
+def test_xlsx_streams_every_chunk_and_the_totals(core, tasks, tmp_path):
+    path = tmp_path / "out.xlsx"
+    seen = []
+    summary = export_tasks(tasks, path, chunksize=2, progress=lambda rows, total: seen.append((rows, total)))
+    assert seen == [(2, 3), (3, 3)]
+    sheets = pd.read_excel(path, sheet_name=None)
+    assert list(sheets)[:2] == ["Tüm Görevler", "Özet"]
+    assert sheets["Tüm Görevler"]["Job Name"].tolist() == ["Budama", "İlaçlama", "Sulama"]
+    assert summary["Toplam Gerçekleşen Maliyet"] == 120 and summary["Toplam Beklenen Maliyet"] == 110
+    assert sheets["Özet"]["Toplam Görev Sayısı"].tolist() == [3]
+
+
+def test_core_export_adds_the_forecast_sheets(core, tasks, tmp_path):
+    path = core.export_tasks(tmp_path / "out.xlsx")
+    assert {"Sapma - İşler", "Sapma - Aylar", "Nakit Akışı"} <= set(pd.read_excel(path, sheet_name=None))
+
+
+def test_csv_round_trip(tasks, tmp_path):
+    path = tmp_path / "out.csv"
+    export_tasks(tasks, path, chunksize=1)
+    df = pd.read_csv(path, encoding="utf-8-sig")
+    assert df["Job Name"].tolist() == ["Budama", "İlaçlama", "Sulama"]
+    assert df["Start Date"].tolist() == ["2025-03-01", "2025-04-01", "2025-05-01"]
+
+
+def test_parquet_keeps_the_dtypes(tasks, tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "out.parquet"
+    export_tasks(tasks, path, chunksize=2)
+    df = pd.read_parquet(path)
+    assert len(df) == 3
+    assert pd.api.types.is_datetime64_any_dtype(df["Start Date"])
+
+
+def test_empty_export(core, tmp_path):
+    assert export_tasks(core.tasks(), tmp_path / "out.xlsx")["Toplam Görev Sayısı"] == 0
+    export_tasks(core.tasks(), tmp_path / "out.csv")
+    assert list(pd.read_csv(tmp_path / "out.csv", encoding="utf-8-sig").columns)[0] == "ID"
+
+
+def test_unknown_format_writes_nothing(tasks, tmp_path):
+    with pytest.raises(ValueError):
+        export_tasks(tasks, tmp_path / "out.txt")
+    assert list(tmp_path.glob("out*")) == []
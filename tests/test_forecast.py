@@ -0,0 +1,51 @@
+from datetime import date
+
+import pytest
+
+from conftest import make_task
+from core import TaskValidationError
+from forecast import export_sheets, top_overruns
+
+
+def test_forecast_of_an_empty_store(core):
+    result = core.forecast("2025-03-01", "2025-03-31")
+    assert result["ratio"] == 1.0
+    assert result["by_job"].empty and result["by_month"].empty
+    assert len(result["cash_flow"]) == 31
+    assert result["cash_flow"]["projected"].sum() == 0
+    assert (result["remaining"], result["remaining_projected"], result["window_projected"]) == (0, 0, 0)
+    assert top_overruns(result) == []
+    assert all(sheet.empty or name == "Nakit Akışı" for name, sheet in export_sheets(result).items())
+
+
+def test_waiting_costs_scale_with_their_jobs_overrun(core):
+    core.add(make_task("Budama", "2020-03-01", "2020-03-02", 100, 150, done=True))
+    core.add(make_task("Sulama", "2020-03-01", "2020-03-02", 100, 50, done=True))
+    core.add(make_task("Budama", "2100-03-01", "2100-03-10", 200))
+    core.add(make_task("Hasat", "2100-03-01", "2100-03-01", 100))
+    result = core.forecast("2100-03-01", "2100-03-31")
+    assert result["ratio"] == 1.0
+    # Budama runs 50% over; Hasat has no history and takes the overall ratio
+    assert result["by_job"].loc["Budama", "projected"] == 300
+    assert result["by_job"].loc["Hasat", "projected"] == 100
+    assert result["remaining"] == 300 and result["remaining_projected"] == 400
+    assert top_overruns(result) == [("Budama", 1.5)]
+
+
+def test_cash_flow_spreads_costs_over_the_days_ahead(core):
+    core.add(make_task("Budama", "2100-03-01", "2100-03-10", 100))
+    flow = core.forecast("2100-03-01", "2100-03-05")["cash_flow"]
+    assert flow["planned"].tolist() == [10.0] * 5
+    assert flow["cumulative"].iloc[-1] == 50
+
+
+def test_overdue_tasks_count_in_full_today(core):
+    core.add(make_task("Budama", "2020-03-01", "2020-03-10", 100))
+    today = date.today().isoformat()
+    flow = core.forecast(today, today)["cash_flow"]
+    assert flow["planned"].tolist() == [100.0]
+
+
+def test_reversed_window_is_rejected(core):
+    with pytest.raises(TaskValidationError):
+        core.forecast("2025-03-31", "2025-03-01")
@@ -0,0 +1,38 @@
+import threading
+
+import instrumentation
+from instrumentation import Metrics
+
+
+def test_concurrent_blocks_are_timed_with_one_profiler():
+    metrics = Metrics()
+    metrics.set_profiling(True)
+    inside = threading.Barrier(2)
+
+    def work():
+        with metrics.timed("work"):
+            inside.wait(timeout=5)
+
+    threads = [threading.Thread(target=work) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert metrics.snapshot()["metrics"]["work"]["count"] == 2
+    assert metrics.profile_report()
+
+
+def test_profiling_falls_back_to_timing_when_another_profiler_runs(monkeypatch):
+    class BusyProfile:
+        def enable(self):
+            raise ValueError("Another profiling tool is already active")
+
+    monkeypatch.setattr(instrumentation.cProfile, "Profile", BusyProfile)
+    metrics = Metrics()
+    metrics.set_profiling(True)
+    with metrics.timed("work"):
+        pass
+    with metrics.timed("work"):
+        pass
+    assert metrics.snapshot()["metrics"]["work"]["count"] == 2
+    assert metrics.profile_report() == ""
@@ -0,0 +1,89 @@
+import threading
+
+from jobs import JobRunner
+
+
+class FakeRoot:
+    """Collects root.after callbacks so that tests run them by hand."""
+
+    def __init__(self):
+        self.pending = []
+        self.cursor = ""
+
+    def after(self, ms, callback):
+        self.pending.append(callback)
+
+    def configure(self, cursor=""):
+        self.cursor = cursor
+
+
+class FakeLabel:
+    def __init__(self, text="Hazır"):
+        self.text = text
+
+    def cget(self, option):
+        return self.text
+
+    def configure(self, text):
+        self.text = text
+
+
+def run_until_idle(runner, root):
+    for future in [job.future for job in runner.jobs]:
+        try:
+            future.result(timeout=5)
+        except BaseException:
+            pass
+    while root.pending:
+        root.pending.pop(0)()
+
+
+def make_runner():
+    root, label = FakeRoot(), FakeLabel()
+    return JobRunner(root, label), root, label
+
+
+def test_cancel_all_spares_writes():
+    runner, root, label = make_runner()
+    release = threading.Event()
+    results = []
+    runner.submit(release.wait, 5, on_done=lambda _: results.append("read"))
+    runner.submit(lambda: "saved", on_done=results.append, cancellable=False)
+    runner.cancel_all()
+    assert label.text == "İşlem iptal edildi."
+    release.set()
+    run_until_idle(runner, root)
+    assert results == ["saved"]
+    runner.shutdown()
+
+
+def test_cancel_all_with_only_writes_changes_nothing():
+    runner, root, label = make_runner()
+    done = []
+    runner.submit(lambda: 1, on_done=done.append, busy_text="Kaydediliyor...", cancellable=False)
+    runner.cancel_all()
+    assert label.text == "⏳ Kaydediliyor..."
+    run_until_idle(runner, root)
+    assert done == [1]
+    runner.shutdown()
+
+
+def test_errors_without_a_handler_reach_the_status_label():
+    runner, root, label = make_runner()
+
+    def fail():
+        raise OSError("disk dolu")
+
+    runner.submit(fail)
+    run_until_idle(runner, root)
+    assert label.text == "Hata: disk dolu"
+    runner.shutdown()
+
+
+def test_errors_go_to_their_handler():
+    runner, root, label = make_runner()
+    errors = []
+    runner.submit(int, "x", on_error=errors.append)
+    run_until_idle(runner, root)
+    assert isinstance(errors[0], ValueError) and label.text == "Hazır"
+    runner.shutdown()
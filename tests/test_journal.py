@@ -0,0 +1,118 @@
+import threading
+
+from conftest import make_task
+from journal import JournaledBackend
+from storage import ExcelBackend, FIELD_COLUMNS
+
+
+def open_backend(path, threshold=1024 * 1024):
+    backend = JournaledBackend(ExcelBackend(path / "farm_tasks.xlsx"), path / "farm_tasks.journal", threshold)
+    backend.setup()
+    return backend
+
+
+def tasks_of(backend):
+    df = backend.load().sort_values("ID")
+    return [(row["ID"], row["Job Name"], float(row["Estimated Cost"]), int(row["Version"]))
+            for _, row in df.iterrows()]
+
+
+def test_replay_drops_torn_record(tmp_path):
+    backend = open_backend(tmp_path)
+    first, second = backend.insert_batch([make_task("A"), make_task("B")])
+    backend.update(first, make_task("A", estimated=150))
+    expected = tasks_of(backend)
+    backend.close()
+    size = (tmp_path / "farm_tasks.journal").stat().st_size
+    # A crash in the middle of appending the next record
+    with open(tmp_path / "farm_tasks.journal", "ab") as f:
+        f.write(b'{"op": "delete", "id": 2, "se')
+
+    backend = open_backend(tmp_path)
+    assert tasks_of(backend) == expected
+    assert (tmp_path / "farm_tasks.journal").stat().st_size == size
+    # Appending after the cut works as usual
+    backend.delete(second)
+    assert [task[0] for task in tasks_of(backend)] == [first]
+    backend.close()
+
+
+def test_snapshot_and_journal_overlay(tmp_path):
+    backend = open_backend(tmp_path)
+    ids = backend.insert_batch([make_task(name) for name in "ABCD"])
+    # Fold everything into the workbook, then change it through the journal only
+    backend.replace_all(backend.load())
+    backend.update(ids[0], make_task("A2", estimated=10))
+    backend.delete(ids[1])
+    new_id = backend.insert(make_task("E"))
+    expected = tasks_of(backend)
+    backend.close()
+
+    backend = open_backend(tmp_path)
+    assert tasks_of(backend) == expected
+    assert [task[1] for task in expected] == ["A2", "C", "D", "E"]
+    assert expected[0][3] == 2
+    assert new_id == ids[-1] + 1
+    backend.close()
+
+
+def test_compaction_racing_appends_loses_nothing(tmp_path):
+    # Every append goes past the threshold and starts a background compaction
+    backend = open_backend(tmp_path, threshold=1)
+    ids = []
+
+    def writer(name):
+        for i in range(15):
+            ids.append(backend.insert(make_task(f"{name}{i}", estimated=i)))
+
+    threads = [threading.Thread(target=writer, args=(name,)) for name in "XY"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    backend.update(ids[0], make_task("changed"))
+    expected = tasks_of(backend)
+    backend.close()
+
+    assert sorted(ids) == list(range(1, 31))
+    backend = open_backend(tmp_path)
+    assert tasks_of(backend) == expected
+    assert len(expected) == 30
+    backend.close()
+
+
+def test_fields_survive_a_reload(tmp_path):
+    backend = open_backend(tmp_path)
+    task = make_task("Hasat", desc="Kuzey parsel", estimated=12.5, actual=11, done=True)
+    task_id = backend.insert(task)
+    backend.close()
+    backend = open_backend(tmp_path)
+    row = backend.load().set_index("ID").loc[task_id]
+    assert {col: row[col] for col in ("Job Name", "Description", "Status")} == \
+        {col: task[col] for col in ("Job Name", "Description", "Status")}
+    assert [float(row[col]) for col in ("Estimated Cost", "Actual Cost")] == [12.5, 11.0]
+    assert set(FIELD_COLUMNS) <= set(row.index)
+    backend.close()
+
+
+def test_replace_all_waits_for_a_background_compaction(tmp_path):
+    backend = open_backend(tmp_path, threshold=1)
+    replaced = []
+
+    def write():
+        for name in "ABCDE":
+            backend.insert(make_task(name))
+            # Usually lands while the compaction of the insert is still running
+            backend.replace_all(backend.load(), {"next_id": backend.next_id})
+        replaced.append(True)
+
+    thread = threading.Thread(target=write, daemon=True)
+    thread.start()
+    thread.join(timeout=10)
+    assert replaced, "replace_all deadlocked with the compaction thread"
+    backend.wait_for_compaction()
+    assert [task[1] for task in tasks_of(backend)] == list("ABCDE")
+    backend.close()
+    reopened = open_backend(tmp_path)
+    assert [task[1] for task in tasks_of(reopened)] == list("ABCDE")
+    reopened.close()
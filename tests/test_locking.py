@@ -0,0 +1,43 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import locking
+from locking import FileLock, LockTimeout
+
+HOLD = """
+import sys
+sys.path.insert(0, sys.argv[1])
+from locking import FileLock
+lock = FileLock(sys.argv[2])
+lock.acquire()
+print("locked", flush=True)
+sys.stdin.readline()
+"""
+
+
+def test_lock_held_by_another_process_times_out(tmp_path):
+    path = tmp_path / "tasks.lock"
+    holder = subprocess.Popen([sys.executable, "-c", HOLD, str(Path(locking.__file__).parent), str(path)],
+                              stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+    try:
+        assert holder.stdout.readline().strip() == "locked"
+        lock = FileLock(path, timeout=0.2, poll_interval=0.01)
+        with pytest.raises(LockTimeout):
+            lock.acquire()
+        assert not lock.try_acquire()
+    finally:
+        holder.communicate("\n", timeout=5)
+    with FileLock(path, timeout=1):
+        pass
+
+
+def test_lock_is_reentrant_within_a_process(tmp_path):
+    lock = FileLock(tmp_path / "tasks.lock")
+    with lock:
+        with lock:
+            pass
+        assert lock._depth == 1
+    assert lock._fd is None
@@ -0,0 +1,54 @@
+from datetime import date
+
+import pytest
+
+from conftest import make_task
+from date_index import CONTAINED
+from recurrence import Recurrence, add_months, occurrence_id, split_occurrence_id
+
+
+def starts(core, first, last, mode="overlapping"):
+    df = core.occurrences(first, last) if mode == "overlapping" else core.occurrences(first, last, CONTAINED)
+    return df["Start Date"].dt.strftime("%Y-%m-%d").tolist()
+
+
+def test_window_holds_only_the_occurrences_it_touches(core):
+    # Weekly, three days long: 2025-03-03..06, 03-10..13, 03-17..20, ...
+    core.add_recurring(make_task("Sulama", "2025-03-03", "2025-03-06"), 1, "week")
+    assert starts(core, "2025-03-12", "2025-03-17") == ["2025-03-10", "2025-03-17"]
+    assert starts(core, "2025-03-12", "2025-03-17", CONTAINED) == []
+    assert starts(core, "2025-03-07", "2025-03-09") == []
+    # Far ahead, without walking the series from its start
+    assert starts(core, "2100-01-01", "2100-01-07") == ["2100-01-04"]
+
+
+def test_series_ends_at_until_or_count(core):
+    core.add_recurring(make_task("Sulama", "2025-03-03", "2025-03-03"), 2, "day", until="2025-03-08")
+    core.add_recurring(make_task("Gübre", "2025-03-01", "2025-03-01"), 1, "month", count=2)
+    # Occurrences of the later rule have lower IDs and come first
+    assert starts(core, "2025-01-01", "2025-12-31") == ["2025-03-01", "2025-04-01",
+                                                        "2025-03-03", "2025-03-05", "2025-03-07"]
+
+
+def test_monthly_occurrences_clamp_to_month_end():
+    rule = Recurrence(1, "Gübre", "", date(2025, 1, 31), 0, 10.0, unit="month")
+    assert [rule.occurrence_start(index) for index in range(3)] == [
+        date(2025, 1, 31), date(2025, 2, 28), date(2025, 3, 31)]
+    assert list(rule.indexes(date(2025, 2, 1), date(2025, 2, 28))) == [1]
+    assert add_months(date(2024, 2, 29), 12) == date(2025, 2, 28)
+
+
+def test_resolved_occurrences_leave_the_window(core):
+    core.add_recurring(make_task("Sulama", "2025-03-03", "2025-03-03"), 1, "week", count=3)
+    first, second, third = core.occurrences("2025-03-01", "2025-03-31")["ID"].tolist()
+    core.delete(first)
+    task_id = core.materialize(second, make_task("Sulama", "2025-03-10", "2025-03-10", actual=20, done=True))
+    assert core.occurrences("2025-03-01", "2025-03-31")["ID"].tolist() == [third]
+    assert core.query("2025-03-01", "2025-03-31")["ID"].tolist() == [third, task_id]
+    with pytest.raises(KeyError):
+        core.delete(first)
+
+
+def test_occurrence_ids_round_trip():
+    assert split_occurrence_id(occurrence_id(7, 12)) == (7, 12)
+    assert occurrence_id(1, 0) < occurrence_id(1, 1) < 0
@@ -0,0 +1,33 @@
+import pandas as pd
+
+from conftest import make_task
+from reports import SUMMARY_COLUMNS, _write_summary, plan_reports, slug
+
+
+def test_plan_has_one_report_per_job_and_month(core):
+    core.add(make_task("İlaçlama (Parsel 3)", "2025-03-01", "2025-03-02"))
+    core.add(make_task("Budama", "2025-04-01", "2025-04-02"))
+    core.add(make_task("Budama", "2024-04-01", "2024-04-02"))
+    paths = [report[0] for report in plan_reports(core.tasks(), seasons={2025})]
+    assert paths == ["2025/jobs/budama.pdf", "2025/jobs/ilaclama-parsel-3.pdf",
+                     "2025/months/2025-03.pdf", "2025/months/2025-04.pdf", "2025/summary.xlsx"]
+
+
+def test_summary_shows_its_title_above_each_table(core, tmp_path):
+    core.add(make_task("Budama", "2025-03-01", "2025-03-02", 100, 120, done=True))
+    core.add(make_task("Sulama", "2025-03-05", "2025-03-06", 50))
+    path = tmp_path / "summary.xlsx"
+    _write_summary(path, "2025 Sezonu Özeti", core.tasks())
+    for sheet_name, header in (("İşler", "İş"), ("Aylar", "Ay")):
+        raw = pd.read_excel(path, sheet_name=sheet_name, header=None)
+        assert raw.iloc[0, 0] == "2025 Sezonu Özeti"
+        table = pd.read_excel(path, sheet_name=sheet_name, skiprows=2)
+        assert list(table.columns) == [header] + SUMMARY_COLUMNS
+    jobs = pd.read_excel(path, sheet_name="İşler", skiprows=2)
+    assert jobs["İş"].tolist() == ["Budama", "Sulama"]
+    assert jobs["Gerçekleşen Maliyet"].tolist() == [120, 0]
+
+
+def test_slug_is_file_name_safe():
+    assert slug("Ağaç Dikimi / Kuzey") == "agac-dikimi-kuzey"
+    assert slug("***") == "is"
@@ -0,0 +1,41 @@
+import pytest
+
+from conftest import make_task
+from search_index import SearchIndex, fold
+
+
+def ids(df):
+    return df["ID"].tolist()
+
+
+def test_search_follows_update_and_delete(core):
+    pruning = core.add(make_task("Budama", desc="Elma bahçesi", estimated=100))
+    spraying = core.add(make_task("İlaçlama", desc="Armut", estimated=300))
+    assert ids(core.search("elm")) == [pruning]
+
+    core.update(pruning, make_task("Budama", desc="Kiraz bahçesi", estimated=200, actual=250, done=True))
+    assert core.search("elma").empty
+    assert ids(core.search("kir", status="Done")) == [pruning]
+    assert core.search(status="Waiting")["ID"].tolist() == [spraying]
+    assert ids(core.search(min_cost=150, max_cost=250)) == [pruning]
+    assert ids(core.search(min_cost=240, cost_field="Actual Cost")) == [pruning]
+
+    core.delete(spraying)
+    assert core.search("ilac").empty
+    assert core.search(min_cost=300).empty
+    assert ids(core.search()) == [pruning]
+
+
+def test_search_combines_text_and_dates(core):
+    march = core.add(make_task("Sulama", start="2025-03-01", end="2025-03-03"))
+    core.add(make_task("Sulama", start="2025-05-01", end="2025-05-03"))
+    assert ids(core.search("sul", start="2025-03-01", end="2025-03-31")) == [march]
+
+
+def test_turkish_letters_fold_to_ascii():
+    assert fold("İLAÇLAMA Işık") == "ilaclama isik"
+
+
+def test_unknown_cost_field_is_rejected():
+    with pytest.raises(ValueError):
+        SearchIndex().search(min_cost=1, cost_field="Cost")
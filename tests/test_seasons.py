@@ -0,0 +1,34 @@
+import pytest
+
+from conftest import make_task
+from seasons import FrozenSeasonError
+
+
+def freeze_2020(core):
+    old = core.add(make_task("Hasat", "2020-09-01", "2020-09-10", 100, 120, done=True))
+    new = core.add(make_task())
+    assert core.freeze_season(2020) == 1
+    return old, new
+
+
+def test_archived_tasks_stay_listed(core):
+    old, new = freeze_2020(core)
+    assert core.tasks()["ID"].tolist() == [old, new]
+    assert core.listing()["ID"].tolist()[:2] == [old, new]
+    assert old in core.calendar_tasks()["ID"].tolist()
+    assert core.is_archived(old) and not core.is_archived(new)
+
+
+def test_archived_tasks_can_be_hidden(core):
+    old, new = freeze_2020(core)
+    assert core.tasks(archived=False)["ID"].tolist() == [new]
+    assert core.tasks("Done", archived=False).empty
+
+
+def test_archived_tasks_are_read_only(core):
+    old, _ = freeze_2020(core)
+    with pytest.raises(FrozenSeasonError):
+        core.update(old, make_task("Hasat", "2020-09-01", "2020-09-10", 100, 150, done=True))
+    with pytest.raises(FrozenSeasonError):
+        core.delete(old)
+    assert core.tasks()["Actual Cost"].tolist()[0] == 120
@@ -0,0 +1,63 @@
+import asyncio
+import json
+
+import pytest
+
+from conftest import make_task
+from server import Request, TaskAPI
+
+
+@pytest.fixture
+def api(core):
+    return TaskAPI(core)
+
+
+def call(api, method, target, body=None, headers=None):
+    data = json.dumps(body).encode() if body is not None else b""
+    response = asyncio.run(api.handle(Request(method, target, "HTTP/1.1", headers or {}, data)))
+    return response.status, json.loads(response.body) if response.body else None, response.headers
+
+
+@pytest.fixture
+def occurrence_id(core):
+    core.add(make_task("Budama", "2025-03-01", "2025-03-02"))
+    core.add_recurring(make_task("Sulama", "2025-03-03", "2025-03-03", estimated=50), 1, "week", count=4)
+    return int(core.occurrences("2025-03-01", "2025-03-31")["ID"].iloc[1])
+
+
+def test_get_occurrence(api, occurrence_id):
+    status, task, headers = call(api, "GET", f"/tasks/{occurrence_id}")
+    assert status == 200
+    assert (task["ID"], task["Job Name"], task["Start Date"]) == (occurrence_id, "Sulama", "2025-03-10")
+    assert headers["ETag"] == f'"{occurrence_id}-0"'
+
+
+def test_put_materializes_occurrence(api, core, occurrence_id):
+    status, task, headers = call(api, "PUT", f"/tasks/{occurrence_id}", {"Actual Cost": 45, "Status": "Done"},
+                                 {"if-match": f'"{occurrence_id}-0"'})
+    assert status == 201 and task["ID"] > 0
+    assert headers["Location"] == f"/tasks/{task['ID']}"
+    assert (task["Job Name"], task["Start Date"], task["Actual Cost"], task["Status"]) == ("Sulama", "2025-03-10", 45, "Done")
+    assert occurrence_id not in core.occurrences("2025-03-01", "2025-03-31")["ID"].tolist()
+    assert call(api, "PUT", f"/tasks/{occurrence_id}", {"Actual Cost": 1})[0] == 404
+
+
+def test_delete_occurrence(api, core, occurrence_id):
+    assert call(api, "DELETE", f"/tasks/{occurrence_id}")[0] == 204
+    assert occurrence_id not in core.occurrences("2025-03-01", "2025-03-31")["ID"].tolist()
+    assert call(api, "GET", f"/tasks/{occurrence_id}")[0] == 404
+
+
+def test_listing_includes_occurrences(api, occurrence_id):
+    _, listing, _ = call(api, "GET", "/tasks?start=2025-03-01&end=2025-03-31")
+    assert [(task["Job Name"], task["Start Date"]) for task in listing["tasks"]] == [
+        ("Sulama", "2025-03-03"), ("Sulama", "2025-03-10"), ("Sulama", "2025-03-17"), ("Sulama", "2025-03-24"),
+        ("Budama", "2025-03-01"),
+    ]
+    assert listing["total"] == 5
+    _, listing, _ = call(api, "GET", "/tasks?start=2025-03-01&end=2025-03-31&q=sul&max_cost=60")
+    assert listing["total"] == 4
+    _, listing, _ = call(api, "GET", "/tasks?start=2025-03-01&end=2025-03-31&status=Done")
+    assert listing["total"] == 0
+    _, listing, _ = call(api, "GET", "/tasks?start=2025-03-01&end=2025-03-31&min_cost=60")
+    assert [task["Job Name"] for task in listing["tasks"]] == ["Budama"]
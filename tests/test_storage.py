@@ -0,0 +1,56 @@
+import pandas as pd
+import pytest
+
+from conftest import make_task
+from core import FarmTasks, ConflictError
+
+
+def test_deleting_newest_task_does_not_free_its_id(core):
+    ids = [core.add(make_task()) for _ in range(3)]
+    core.delete(ids[-1])
+    assert core.add(make_task()) == ids[-1] + 1
+
+
+def test_deleting_newest_imported_task_does_not_free_its_id(tmp_path):
+    pd.DataFrame({
+        "ID": [1, 2, 3],
+        "Job Name": ["Budama", "Sulama", "Hasat"],
+        "Description": ["", "", ""],
+        "Start Date": ["2025-03-01"] * 3,
+        "End Date": ["2025-03-02"] * 3,
+        "Estimated Cost": [10.0, 20.0, 30.0],
+        "Actual Cost": [0.0, 0.0, 0.0],
+        "Status": ["Waiting"] * 3,
+    }).to_excel(tmp_path / "farm_tasks.xlsx", index=False)
+    core = FarmTasks(tmp_path, "sqlite")
+    try:
+        assert core.tasks()["ID"].tolist() == [1, 2, 3]
+        core.delete(3)
+        assert core.add(make_task()) == 4
+    finally:
+        core.close()
+    # The counter is persisted, not just kept in memory
+    core = FarmTasks(tmp_path, "sqlite")
+    try:
+        core.delete(4)
+        assert core.add(make_task()) == 5
+    finally:
+        core.close()
+
+
+def test_update_conflict_keeps_stored_task(core):
+    task_id = core.add(make_task(estimated=100))
+    version = core.get(task_id)["Version"]
+    core.update(task_id, make_task(estimated=150), version)
+    with pytest.raises(ConflictError):
+        core.update(task_id, make_task(estimated=200), version)
+    assert core.get(task_id)["Estimated Cost"] == 150
+
+
+def test_update_leaves_frames_held_by_readers_alone(core):
+    task_id = core.add(make_task(estimated=100))
+    held = core.tasks()
+    core.update(task_id, make_task(estimated=250, actual=300, done=True))
+    assert held.loc[held["ID"] == task_id, "Estimated Cost"].tolist() == [100]
+    assert held["Status"].tolist() == ["Waiting"]
+    assert core.tasks()["Estimated Cost"].tolist() == [250]
@@ -0,0 +1,85 @@
+import pandas as pd
+import pytest
+
+from benchmark import HeadlessScrollbar, HeadlessTree
+from table_view import VirtualTable
+
+COLUMNS = ["ID", "Job Name", "Estimated Cost"]
+
+
+class CountingTree(HeadlessTree):
+    """HeadlessTree that counts the items it creates."""
+
+    def __init__(self, height=10):
+        super().__init__(height)
+        self.inserted = 0
+
+    def insert(self, parent, index, iid, values, tags=()):
+        self.inserted += 1
+        super().insert(parent, index, iid, values, tags)
+
+
+def rows(count):
+    return pd.DataFrame({"ID": range(1, count + 1), "Job Name": ["Budama"] * count,
+                         "Estimated Cost": [float(i) for i in range(1, count + 1)]})
+
+
+@pytest.fixture
+def table():
+    # 10 rows tall: 9 visible under the header, plus a buffer of 5
+    view = VirtualTable(CountingTree(10), HeadlessScrollbar(), COLUMNS, buffer=5)
+    view.set_rows(rows(1000))
+    return view
+
+
+def test_only_the_window_is_materialized(table):
+    assert len(table) == 1000
+    assert table.tree.order == [str(i) for i in range(1, 15)]
+    assert table.scrollbar.position == (0.0, 9 / 1000)
+
+
+def test_scroll_moves_the_window(table):
+    table.scroll(100)
+    assert table.tree.order == [str(i) for i in range(101, 115)]
+    table.scroll(-3)
+    assert table.tree.order[0] == "98" and len(table.tree.order) == 14
+    # Only the 3 rows entering at the top were created
+    assert table.tree.inserted == 14 + 14 + 3
+    table.scroll(10_000)
+    assert table.tree.order[-1] == "1000" and table.offset == 1000 - 9
+    table.yview("moveto", "0.5")
+    assert table.tree.order[0] == "501"
+
+
+def test_update_and_delete_touch_single_rows(table):
+    created = table.tree.inserted
+    table.update_row({"ID": 3, "Job Name": "Sulama", "Estimated Cost": 7.5})
+    assert table.tree.item("3")["values"] == [3, "Sulama", 7.5]
+    assert table.tree.inserted == created
+    table.delete_row(2)
+    # Row 15 scrolls in; nothing else is recreated
+    assert table.tree.order == [str(i) for i in [1] + list(range(3, 16))]
+    assert table.tree.inserted == created + 1
+    table.update_row({"ID": 5000, "Job Name": "Hasat", "Estimated Cost": 1.0})
+    assert table.ids[-1] == 5000 and len(table) == 1000
+
+
+def test_selection_and_focus_survive_a_diff(table):
+    table.tree.selection_set(["4", "6"])
+    table.tree.focus("6")
+    table.delete_row(1)
+    assert table.tree.selection() == ("4", "6")
+    assert table.tree.focus() == "6"
+    # A selected row scrolled out of view is selected again when it comes back
+    table.scroll(100)
+    assert table.tree.selection() == ()
+    table.scroll(-100)
+    assert table.tree.selection() == ("4", "6")
+
+
+def test_row_tags_are_applied_when_rows_are_created():
+    view = VirtualTable(HeadlessTree(10), HeadlessScrollbar(), COLUMNS,
+                        row_tags=lambda task_id: ("archived",) if task_id % 2 else ())
+    view.set_rows(rows(20))
+    assert view.tree.item("1")["tags"] == ("archived",)
+    assert view.tree.item("2")["tags"] == ()
@@ -0,0 +1,68 @@
+import threading
+
+import pytest
+
+from conftest import make_task
+from core import ConflictError, FarmTasks
+
+
+@pytest.fixture
+def two_processes(tmp_path):
+    """Two FarmTasks on one data folder, standing in for two processes."""
+    first, second = FarmTasks(tmp_path), FarmTasks(tmp_path)
+    yield first, second
+    first.close()
+    second.close()
+
+
+def test_versions_only_grow_under_concurrent_edits(core):
+    seen = [core.versioned(lambda: None)[0]]
+    task_id = core.add(make_task())
+    seen.append(core.versioned(lambda: None)[0])
+    core.update(task_id, make_task(actual=50, done=True), expected_version=1)
+    seen.append(core.versioned(lambda: None)[0])
+    core.delete(task_id)
+    seen.append(core.versioned(lambda: None)[0])
+    assert seen == sorted(set(seen))
+
+
+def test_stale_edit_from_another_process_conflicts(two_processes):
+    core, other = two_processes
+    task_id = core.add(make_task())
+    version = other.store.get(task_id)["Version"]
+    core.update(task_id, make_task(actual=10, done=True), expected_version=version)
+    with pytest.raises(ConflictError):
+        other.update(task_id, make_task(actual=20, done=True), expected_version=version)
+    assert other.tasks()["Actual Cost"].tolist() == [10]
+
+
+def test_adds_from_two_processes_get_distinct_ids(two_processes):
+    results = [[], []]
+
+    def add(core, ids):
+        for _ in range(20):
+            ids.append(core.add(make_task()))
+
+    threads = [threading.Thread(target=add, args=pair) for pair in zip(two_processes, results)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    ids = results[0] + results[1]
+    assert sorted(ids) == list(range(1, 41))
+    assert two_processes[0].tasks()["ID"].tolist() == sorted(ids)
+
+
+def test_version_sees_rules_added_elsewhere(two_processes):
+    core, other = two_processes
+    before, _ = core.versioned(lambda: None)
+    other.add_recurring(make_task(), 1, "week")
+    assert core.versioned(lambda: None)[0] > before
+
+
+def test_version_sees_seasons_archived_elsewhere(two_processes):
+    core, other = two_processes
+    other.add(make_task("Hasat", "2020-09-01", "2020-09-10", 100, 120, done=True))
+    before, _ = core.versioned(lambda: None)
+    other.freeze_season(2020)
+    assert core.versioned(lambda: None)[0] > before